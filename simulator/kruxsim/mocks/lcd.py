@@ -49,6 +49,22 @@ landscape = False
 
 count_call_fill_rectangle = 0
 
+# Pixels sent to the display, to compare how much each screen update costs
+pixels_drawn = 0
+
+
+def _count_pixels(amount):
+    global pixels_drawn
+    pixels_drawn += amount
+
+
+def pop_pixels_drawn():
+    """Returns pixels drawn since last call and resets the counter"""
+    global pixels_drawn
+    amount = pixels_drawn
+    pixels_drawn = 0
+    return amount
+
 
 def rgb565torgb888(color):
     """convert from gggbbbbbrrrrrggg to tuple"""
@@ -75,6 +91,7 @@ def clear(color):
             screen.fill(color)
 
     color = rgb565torgb888(color)
+    _count_pixels(WIDTH * HEIGHT)
     pg.event.post(pg.event.Event(events.LCD_CLEAR_EVENT, {"f": run}))
 
 
@@ -336,6 +353,7 @@ def draw_string(x, y, s, color, bgcolor=COLOR_BLACK):
 
     color = rgb565torgb888(color)
     bgcolor = rgb565torgb888(bgcolor)
+    _count_pixels(string_width_px(s) * BOARD_CONFIG["krux"]["display"]["font"][1])
     pg.event.post(pg.event.Event(events.LCD_DRAW_STRING_EVENT, {"f": run}))
 
 
@@ -413,6 +431,7 @@ def fill_rectangle(x, y, w, h, color, radius=0):
     if _is_x_flipped():
         x = width() - w - x
     radius = min(radius, min(w, h) // 2)
+    _count_pixels(w * h)
     pg.event.post(pg.event.Event(events.LCD_FILL_RECTANGLE_EVENT, {"f": run}))
 
     global count_call_fill_rectangle
@@ -447,6 +466,7 @@ def draw_line(x_0, y_0, x_1, y_1, color):
         pg.draw.line(screen, color, start_pos, end_pos, 1)
 
     color = rgb565torgb888(color)
+    _count_pixels(max(abs(x_1 - x_0), abs(y_1 - y_0)) + 1)
     pg.event.post(pg.event.Event(events.LCD_DRAW_LINE_EVENT, {"f": run}))
 
 
@@ -489,6 +509,7 @@ if "lcd" not in sys.modules:
         draw_line=draw_line,
         draw_outline=draw_outline,
         string_has_wide_glyph=string_has_wide_glyph,
+        pop_pixels_drawn=pop_pixels_drawn,
         BLACK=COLOR_BLACK,
         WHITE=COLOR_WHITE,
     )
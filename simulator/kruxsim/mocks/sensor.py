@@ -66,12 +66,16 @@ class MockStatistics:
 
 
 class Mockqrcode:
-    def __init__(self, data):
+    def __init__(self, data, rect):
         self.data = data
+        self._rect = rect
 
     def payload(self):
         return self.data
 
+    def rect(self):
+        return self._rect
+
 
 capturer = None
 
@@ -92,14 +96,34 @@ def run(on):
             capturer.release()
 
 
-def find_qrcodes(img):
+def find_qrcodes(img, roi=None):
+    """Decodes the QR codes of a frame, or of its roi (x, y, w, h) region,
+    with rects relative to the whole frame like openMV"""
+    offset_x = offset_y = 0
+    if roi is not None:
+        offset_x, offset_y, w, h = roi
+        if isinstance(img, Image.Image):
+            img = img.crop((offset_x, offset_y, offset_x + w, offset_y + h))
+        else:
+            img = img[offset_y : offset_y + h, offset_x : offset_x + w]
     codes = []
-    data = decode(img)
-    if data:
-        codes.append(Mockqrcode(data[0].data.decode()))
+    for code in decode(img):
+        x, y, w, h = code.rect
+        codes.append(Mockqrcode(code.data.decode(), (x + offset_x, y + offset_y, w, h)))
     return codes
 
 
+def find_qrcodes_mock(img, codes):
+    """Returns a find_qrcodes method for a frame whose codes were decoded"""
+
+    def find(roi=None):
+        if roi is None:
+            return codes
+        return find_qrcodes(img, roi)
+
+    return find
+
+
 def snapshot():
     # Temporarily yield execution to allow other threads to run
     time.sleep(THREAD_DROP_PERIOD)
@@ -114,13 +138,14 @@ def snapshot():
             rgb_frame = cvtColor(img, COLOR_BGR2RGB)
             lab_frame = cvtColor(rgb_frame, COLOR_BGR2LAB)
             m.get_frame.return_value = frame
-            m.find_qrcodes.return_value = find_qrcodes(img)
+            codes = find_qrcodes(img)
+            m.find_qrcodes.side_effect = find_qrcodes_mock(img, codes)
             m.to_bytes.return_value = frame.tobytes()
             m.get_statistics.return_value = MockStatistics(lab_frame)
             m.width.return_value = frame.shape[1]
             m.height.return_value = frame.shape[0]
             m.lens_corr.return_value = m
-            if m.find_qrcodes.return_value:
+            if codes:
                 # Clear the camera image if a QR code is found
                 # Otherwise keep the camera image if it's to create entropy
                 sequence_executor.camera_image = None
@@ -131,7 +156,7 @@ def snapshot():
         img = Image.fromarray(rgb_frame)
 
         m.get_frame.return_value = rgb_frame
-        m.find_qrcodes.return_value = find_qrcodes(img)
+        m.find_qrcodes.side_effect = find_qrcodes_mock(img, find_qrcodes(img))
         m.to_bytes.return_value = frame.tobytes()
         m.get_statistics.return_value = MockStatistics(lab_frame)
         m.width.return_value = frame.shape[1]
@@ -24,6 +24,7 @@ import os
 old_listdir = os.listdir
 old_remove = os.remove
 old_stat = os.stat
+old_rename = os.rename
 
 
 def new_listdir(path, *args, **kwargs):
@@ -31,16 +32,32 @@ def new_listdir(path, *args, **kwargs):
     return old_listdir(path, *args, **kwargs)
 
 
-def new_remove(path, *args, **kwargs):
+def new_ilistdir(path):
     path = path.lstrip("/") if path.startswith("/sd") else path
+    for entry in os.scandir(path):
+        yield (entry.name, 0x4000 if entry.is_dir() else 0x8000, 0)
+
+
+def new_remove(path, *args, **kwargs):
+    path = path.lstrip("/") if path.startswith(("/sd", "/flash")) else path
     return old_remove(path, *args, **kwargs)
 
 
 def new_stat(path, *args, **kwargs):
-    path = path.lstrip("/") if path.startswith("/sd") else path
+    path = path.lstrip("/") if path.startswith(("/sd", "/flash")) else path
     return old_stat(path, *args, **kwargs)
 
 
+def new_rename(old_path, new_path):
+    if old_path.startswith(("/sd", "/flash")):
+        old_path = old_path.lstrip("/")
+    if new_path.startswith(("/sd", "/flash")):
+        new_path = new_path.lstrip("/")
+    return old_rename(old_path, new_path)
+
+
 setattr(os, "listdir", new_listdir)
+setattr(os, "ilistdir", new_ilistdir)
 setattr(os, "remove", new_remove)
 setattr(os, "stat", new_stat)
+setattr(os, "rename", new_rename)
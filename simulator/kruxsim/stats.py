@@ -0,0 +1,162 @@
+# The MIT License (MIT)
+
+# Copyright (c) 2021-2025 Krux contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Prints diagnostics krux keeps about its own performance, enabled with --stats
+"""
+
+
+def register():
+    """Wraps krux code so its diagnostics are printed once each task is over"""
+    report_qr_capture()
+    report_qr_animation()
+    report_psbt_stream_signing()
+
+
+def report_qr_capture():
+    """Prints frame and payload counts and the ROI hit rate of every QR capture"""
+    from krux import qr
+    from krux.pages import qr_capture
+
+    parsers = []
+
+    class QRPartParser(qr.QRPartParser):
+        def __init__(self):
+            super().__init__()
+            parsers.append(self)
+
+    qr_capture.QRPartParser = QRPartParser
+    capture_loop = qr_capture.QRCodeCapture.qr_capture_loop
+
+    def qr_capture_loop(self):
+        parsers.clear()
+        result = capture_loop(self)
+        print(
+            "QR capture: %d frames with new payloads, %d duplicate frames"
+            % (self.unique_frames, self.duplicate_frames)
+        )
+        if parsers:
+            print(
+                "QR capture: %d unique payloads, %d duplicate payloads"
+                % (parsers[-1].unique_count, parsers[-1].duplicate_count)
+            )
+        print(
+            "QR capture: ROI hit rate %d%% (%d hits, %d misses)"
+            % (self.roi_hit_rate() * 100, self.roi_hits, self.roi_misses)
+        )
+        return result
+
+    qr_capture.QRCodeCapture.qr_capture_loop = qr_capture_loop
+
+
+def report_qr_animation():
+    """Prints the frame rate of animated QR codes, split between frames
+    encoded on the first cycle and frames blitted from the cache later on
+    """
+    import time
+    from krux import pages, qr
+
+    # Frames and seconds spent on them, for encoded (True) and cached frames
+    timings = {True: [0, 0], False: [0, 0]}
+    last = []
+
+    class QRFrames(qr.QRFrames):
+        def __next__(self):
+            now = time.perf_counter()
+            if last:
+                # A frame lasts until the next one is requested, drawing
+                # and waiting for buttons included
+                timing = timings[last[0]]
+                timing[0] += 1
+                timing[1] += now - last[1]
+            encoded = self.encoded
+            frame = super().__next__()
+            last[:] = [self.encoded > encoded, now]
+            return frame
+
+    pages.QRFrames = QRFrames
+    display_qr_codes = pages.Page.display_qr_codes
+
+    def fps(timing):
+        return timing[0] / timing[1] if timing[1] else 0
+
+    def display_qr_codes_reported(self, *args, **kwargs):
+        for timing in timings.values():
+            timing[:] = [0, 0]
+        last.clear()
+        result = display_qr_codes(self, *args, **kwargs)
+        print(
+            "QR animation: %d encoded frames at %.1f fps, %d cached frames at %.1f fps"
+            % (
+                timings[True][0],
+                fps(timings[True]),
+                timings[False][0],
+                fps(timings[False]),
+            )
+        )
+        return result
+
+    pages.Page.display_qr_codes = display_qr_codes_reported
+
+
+def report_psbt_stream_signing():
+    """Prints time and peak memory spent on each input of a PSBT signed
+    while streamed from SD card
+    """
+    import time
+    import tracemalloc
+    from krux import psbt
+
+    sign_to_file = psbt.PSBTSigner.sign_to_file
+    sign_input = psbt.StreamSigningView.sign_input
+    started = []
+
+    def sign_input_reported(self, i, *args, **kwargs):
+        result = sign_input(self, i, *args, **kwargs)
+        if started:
+            # Covers reading the input scope from SD card and signing it
+            print(
+                "PSBT input %d: %.1f ms, peak %d KB"
+                % (
+                    i,
+                    (time.perf_counter() - started[0]) * 1000,
+                    tracemalloc.get_traced_memory()[1] // 1024,
+                )
+            )
+            tracemalloc.reset_peak()
+            started[0] = time.perf_counter()
+        return result
+
+    def sign_to_file_reported(self, out_path):
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        started.append(time.perf_counter())
+        try:
+            return sign_to_file(self, out_path)
+        finally:
+            started.clear()
+            if not tracing:
+                tracemalloc.stop()
+
+    psbt.StreamSigningView.sign_input = sign_input_reported
+    psbt.PSBTSigner.sign_to_file = sign_to_file_reported
@@ -67,6 +67,13 @@ parser.add_argument(
     required=False,
     action=argparse.BooleanOptionalAction,
 )
+parser.add_argument(
+    "--stats",
+    type=bool,
+    default=False,
+    required=False,
+    action=argparse.BooleanOptionalAction,
+)
 parser.add_argument(
     "--screenshot-scale",
     type=bool,
@@ -141,6 +148,11 @@ if args.sd:
         os.makedirs(SD_PATH)
     from kruxsim.mocks import sd_card
 
+# print diagnostics krux keeps about its performance
+if args.stats:
+    from kruxsim import stats
+    stats.register()
+
 t = threading.Thread(target=run_krux)
 t.daemon = True
 
@@ -0,0 +1,90 @@
+# The MIT License (MIT)
+
+# Copyright (c) 2021-2024 Krux contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Files are never rewritten in place: new contents go to a temporary file,
+# the current file is kept as a journal while the temporary one is renamed
+# over it, and the journal is only removed once the rename succeeded. If a
+# write is interrupted, the last complete version is recovered on next access.
+
+import os
+
+TEMP_SUFFIX = ".tmp"
+JOURNAL_SUFFIX = ".bak"
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def recover(path):
+    """Restores path from an interrupted write, if any"""
+    journal = path + JOURNAL_SUFFIX
+    if not _exists(journal):
+        return
+    if _exists(path):
+        # Interrupted after the new file was in place
+        os.remove(journal)
+        return
+    temp = path + TEMP_SUFFIX
+    # Journal is only created once the temporary file is complete
+    os.rename(temp if _exists(temp) else journal, path)
+    if _exists(journal):
+        os.remove(journal)
+
+
+def read(path):
+    """Returns the contents of a text file written with write()"""
+    recover(path)
+    with open(path, "r") as f:
+        return f.read()
+
+
+def write(path, contents, current=None):
+    """Atomically replaces the contents of a text file. Nothing is written,
+    and False is returned, if contents match current (read from path if not
+    given)
+    """
+    if current is None:
+        try:
+            current = read(path)
+        except OSError:
+            pass
+    else:
+        recover(path)
+    if contents == current:
+        return False
+
+    temp = path + TEMP_SUFFIX
+    journal = path + JOURNAL_SUFFIX
+    with open(temp, "w") as f:
+        f.write(contents)
+    replacing = _exists(path)
+    if replacing:
+        os.rename(path, journal)
+    os.rename(temp, path)
+    if replacing:
+        os.remove(journal)
+    return True
@@ -135,58 +135,90 @@ B43CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ$*+-./:"
 B58CHARS = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 
 
+# Digits converted per big integer operation, base**LIMB_DIGITS still fits a
+# small int for both bases
+LIMB_DIGITS = 5
+
+_decode_tables = {}
+
+
+def _decode_table(base):
+    """Returns a lookup table from char code to digit value, 0xFF if invalid"""
+    table = _decode_tables.get(base)
+    if table is None:
+        chars = B58CHARS if base == 58 else B43CHARS
+        table = bytearray(b"\xff" * 128)
+        for i, char in enumerate(chars):
+            table[ord(char)] = i
+        _decode_tables[base] = table
+    return table
+
+
 def pure_python_base_decode(v, base):
     """decode str v from base encoding; returns bytes"""
     chars = B58CHARS if base == 58 else B43CHARS
-    long_value = 0
-    power_of_base = 1
-    for char in reversed(v):
-        digit = chars.find(char)
-        if digit == -1:
-            raise ValueError("forbidden character {} for base {}".format(char, base))
-        long_value += digit * power_of_base
-        power_of_base *= base
-    result = bytearray()
-    while long_value >= 256:
-        div, mod = divmod(long_value, 256)
-        result.append(mod)
-        long_value = div
-    if long_value > 0:
-        result.append(long_value)
-    n_pad = 0
+    table = _decode_table(base)
+    # Read digits into limbs of LIMB_DIGITS each, the first one taking
+    # the remainder so the others are full
+    limbs = []
+    limb = 0
+    count = len(v) % LIMB_DIGITS or LIMB_DIGITS
     for char in v:
-        if char == chars[0]:
-            n_pad += 1
-        else:
-            break
-    if n_pad > 0:
-        result.extend(b"\x00" * n_pad)
-    return bytes(reversed(result))
+        code = ord(char)
+        digit = table[code] if code < 128 else 0xFF
+        if digit == 0xFF:
+            raise ValueError("forbidden character {} for base {}".format(char, base))
+        limb = limb * base + digit
+        count -= 1
+        if not count:
+            limbs.append(limb)
+            limb = 0
+            count = LIMB_DIGITS
+    # Merge pairs of limbs, doubling their size each round, so most big
+    # integer multiplications are between small numbers
+    power = base**LIMB_DIGITS
+    while len(limbs) > 1:
+        if len(limbs) & 1:
+            limbs.insert(0, 0)
+        limbs = [limbs[i] * power + limbs[i + 1] for i in range(0, len(limbs), 2)]
+        power *= power
+    long_value = limbs[0] if limbs else 0
+    # Each base 43 or 58 digit holds less than 6 bits
+    result = long_value.to_bytes(len(v) * 3 // 4 + 1, "big").lstrip(b"\x00")
+    # Leading zero digits stand for leading 0-bytes
+    n_pad = len(v) - len(v.lstrip(chars[0]))
+    return b"\x00" * n_pad + result
+
+
+def _encode_limbs(result, value, powers, level, chars):
+    """Appends the digits of value, zero padded to fill 2**(level + 1) limbs"""
+    if level < 0:
+        base = len(chars)
+        digits = bytearray(LIMB_DIGITS)
+        for i in range(LIMB_DIGITS - 1, -1, -1):
+            value, digit = divmod(value, base)
+            digits[i] = chars[digit]
+        result.extend(digits)
+        return
+    high, low = divmod(value, powers[level])
+    _encode_limbs(result, high, powers, level - 1, chars)
+    _encode_limbs(result, low, powers, level - 1, chars)
 
 
 def pure_python_base_encode(v, base):
     """decode bytes v from base encoding; returns str"""
-    chars = B58CHARS if base == 58 else B43CHARS
-    long_value = 0
-    power_of_base = 1
-    for char in reversed(v):
-        long_value += power_of_base * char
-        power_of_base <<= 8
+    chars = (B58CHARS if base == 58 else B43CHARS).encode()
+    long_value = int.from_bytes(v, "big")
+    # Split the value in halves on powers of base**LIMB_DIGITS, so big integer
+    # divisions mostly happen between numbers of similar size
+    powers = [base**LIMB_DIGITS]
+    while powers[-1] * powers[-1] <= long_value:
+        powers.append(powers[-1] * powers[-1])
     result = bytearray()
-    while long_value >= base:
-        div, mod = divmod(long_value, base)
-        result.extend(chars[mod].encode())
-        long_value = div
-    if long_value > 0:
-        result.extend(chars[long_value].encode())
+    _encode_limbs(result, long_value, powers, len(powers) - 1, chars)
+    # Drop the zero digits padding the most significant limbs
+    result = bytes(result).lstrip(chars[:1])
     # Bitcoin does a little leading-zero-compression:
     # leading 0-bytes in the input become leading-1s
-    n_pad = 0
-    for char in v:
-        if char == 0x00:
-            n_pad += 1
-        else:
-            break
-    if n_pad > 0:
-        result.extend((chars[0] * n_pad).encode())
-    return bytes(reversed(result)).decode()
+    n_pad = len(v) - len(v.lstrip(b"\x00"))
+    return (chars[:1] * n_pad + result).decode()
@@ -105,29 +105,37 @@ def deflate_decompress(data):
         raise ValueError("Error decompressing BBQR")
 
 
-def decode_bbqr(parts, encoding, file_type):
-    """Decodes the given data as BBQR, returning the decoded data"""
-
+def decode_bbqr_part(part, encoding):
+    """Decodes a single BBQR part's base32 or hex content into bytes"""
     if encoding == "H":
         from binascii import unhexlify
 
-        data_bytes = bytearray()
-        for _, part in sorted(parts.items()):
-            data_bytes.extend(unhexlify(part))
-        return bytes(data_bytes)
+        return unhexlify(part)
 
     import base32
 
-    binary_data = b""
-    for _, part in sorted(parts.items()):
-        padding = (8 - (len(part) % 8)) % 8
-        padded_part = part + (padding * "=")
-        binary_data += base32.decode(padded_part)
+    padding = (8 - (len(part) % 8)) % 8
+    return base32.decode(part + (padding * "="))
+
 
+def join_bbqr(decoded_parts, encoding, file_type):
+    """Joins already decoded BBQR parts into a preallocated buffer, returning
+    the final (decompressed) data
+    """
+    binary_data = bytearray(sum(len(part) for part in decoded_parts.values()))
+    view = memoryview(binary_data)
+    offset = 0
+    for _, part in sorted(decoded_parts.items()):
+        view[offset : offset + len(part)] = part
+        offset += len(part)
+    del view
+
+    if encoding == "H":
+        return bytes(binary_data)
     if encoding == "Z":
-        if file_type in "JU":
-            return deflate_decompress(binary_data).decode("utf-8")
-        return deflate_decompress(binary_data)
+        binary_data = deflate_decompress(binary_data)
+    else:
+        binary_data = bytes(binary_data)
     if file_type in "JU":
         return binary_data.decode("utf-8")
     return binary_data
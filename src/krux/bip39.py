@@ -6,6 +6,78 @@ from embit.wordlists.bip39 import WORDLIST
 
 WORDINDEX = {word: i for i, word in enumerate(WORDLIST)}
 
+# Sorts after any lowercase letter, to find where a prefix range ends
+PREFIX_END = "{"
+
+
+class PrefixIndex:
+    """Prefix lookups on an alphabetically sorted wordlist using binary search,
+    without storing anything but the list itself
+    """
+
+    def __init__(self, wordlist=WORDLIST):
+        self.wordlist = wordlist
+        self.first_letters = None
+
+    def _lower_bound(self, key, start=0):
+        """Returns the index of the first word not lower than key"""
+        stop = len(self.wordlist)
+        while start < stop:
+            middle = (start + stop) >> 1
+            if self.wordlist[middle] < key:
+                start = middle + 1
+            else:
+                stop = middle
+        return start
+
+    def prefix_range(self, prefix):
+        """Returns the (start, stop) range of words starting with prefix"""
+        start = self._lower_bound(prefix)
+        return start, self._lower_bound(prefix + PREFIX_END, start)
+
+    def next_letters(self, prefix):
+        """Returns the set of letters that may follow prefix"""
+        if not prefix and self.first_letters is not None:
+            return self.first_letters
+        letters = set()
+        position = len(prefix)
+        index, stop = self.prefix_range(prefix)
+        while index < stop:
+            word = self.wordlist[index]
+            if len(word) == position:
+                index += 1
+                continue
+            letter = word[position]
+            letters.add(letter)
+            # Jump over the remaining words sharing this letter
+            index = self._lower_bound(prefix + letter + PREFIX_END, index)
+        if not prefix:
+            self.first_letters = letters
+        return letters
+
+    def completion(self, prefix):
+        """Returns the only word starting with prefix, or None"""
+        if not prefix:
+            return None
+        start, stop = self.prefix_range(prefix)
+        if stop - start == 1:
+            return self.wordlist[start]
+        return None
+
+    def index(self, word):
+        """Returns the index of word, raising ValueError if it isn't listed"""
+        if self.wordlist is WORDLIST:
+            if word in WORDINDEX:
+                return WORDINDEX[word]
+        else:
+            index = self._lower_bound(word)
+            if index < len(self.wordlist) and self.wordlist[index] == word:
+                return index
+        raise ValueError("Word '%s' is not in the dictionary" % word)
+
+
+WORDLIST_PREFIXES = PrefixIndex(WORDLIST)
+
 
 def entropy_checksum(entropy: bytes, checksum_length_bits: int = 4):
     """
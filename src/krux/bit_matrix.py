@@ -0,0 +1,130 @@
+# The MIT License (MIT)
+
+# Copyright (c) 2021-2024 Krux contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# QR codes are packed row-major, one bit per module, least significant bit
+# first, with rows not aligned to byte boundaries. These helpers work a row
+# (as an int, bit n being the module at column n) or a byte at a time.
+
+
+def _reversed_bytes():
+    """Returns a lookup table of bit-reversed bytes"""
+    table = bytearray(256)
+    for i in range(256):
+        reversed_byte = 0
+        for bit in range(8):
+            if i & (1 << bit):
+                reversed_byte |= 0x80 >> bit
+        table[i] = reversed_byte
+    return bytes(table)
+
+
+REVERSED_BYTES = _reversed_bytes()
+
+
+def scale_table(scale):
+    """Returns a lookup table of bytes with each bit repeated scale times,
+    built once by callers scaling many rows, see scale_row()
+    """
+    unit = (1 << scale) - 1
+    table = []
+    for i in range(256):
+        scaled = 0
+        for bit in range(8):
+            if i & (1 << bit):
+                scaled |= unit << (bit * scale)
+        table.append(scaled)
+    return table
+
+
+def get_row(code, size, row):
+    """Returns a row of a packed QR code as an int"""
+    start = row * size
+    row_bytes = code[start >> 3 : (start + size + 7) >> 3]
+    return (int.from_bytes(row_bytes, "little") >> (start & 7)) & ((1 << size) - 1)
+
+
+def _or_bits(buf, start, value, width):
+    """ORs width bits of value into a packed bitmap, starting at bit start"""
+    shift = start & 7
+    first = start >> 3
+    chunk = (value << shift).to_bytes((shift + width + 7) >> 3, "little")
+    for i, byte in enumerate(chunk):
+        if byte:
+            buf[first + i] |= byte
+
+
+def frame(code, size, border=1):
+    """Returns a copy of a packed QR code surrounded by a light border"""
+    new_size = size + 2 * border
+    framed = bytearray((new_size * new_size + 7) >> 3)
+    for row in range(size):
+        value = get_row(code, size, row)
+        if value:
+            _or_bits(framed, (row + border) * new_size + border, value, size)
+    return framed, new_size
+
+
+def scale_row(value, width, scale, table=None):
+    """Repeats each module of a row scale times, table being scale_table(scale)"""
+    if scale == 1:
+        return value
+    if table is None:
+        table = scale_table(scale)
+    scaled = 0
+    shift = 0
+    step = 8 * scale
+    for byte in value.to_bytes((width + 7) >> 3, "little"):
+        if byte:
+            scaled |= table[byte] << shift
+        shift += step
+    return scaled
+
+
+def row_msb_bytes(value, width, buf=None):
+    """Packs a row into bytes, first module on the most significant bit.
+    Bytes are written to buf when given, so one buffer serves every row
+    """
+    row_bytes = value.to_bytes((width + 7) >> 3, "little")
+    if buf is None:
+        buf = bytearray(len(row_bytes))
+    for i, byte in enumerate(row_bytes):
+        buf[i] = REVERSED_BYTES[byte]
+    return buf
+
+
+def row_runs(value):
+    """Yields (column, length) of each run of dark modules in a row"""
+    col = 0
+    while value:
+        if not value & 0xFF:
+            # Skip 8 light modules at once
+            value >>= 8
+            col += 8
+        elif value & 1:
+            start = col
+            while value & 1:
+                value >>= 1
+                col += 1
+            yield start, col - start
+        else:
+            value >>= 1
+            col += 1
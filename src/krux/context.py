@@ -41,9 +41,21 @@ class Context:
         self.wallet = None
         self.tc_code_enabled = False
 
+        from .krux_settings import Settings
+
+        if Settings().encryption.key_cache:
+            from krux import kef
+
+            kef.key_cache.enable()
+
     def clear(self):
         """Clears all sensitive data from the context, resetting it"""
+        from krux import kef
+
         self.wallet = None
+        kef.key_cache.clear()
+        # Wrapped texts drawn on screen may include words and passphrases
+        self.display.clear_lines_cache()
         gc.collect()
 
     def is_logged_in(self):
@@ -22,6 +22,7 @@
 import lcd
 import board
 import time
+from collections import OrderedDict
 from .themes import theme
 from .krux_settings import Settings
 from .settings import THIN_SPACE, ELLIPSIS
@@ -51,6 +52,11 @@ FLASH_MSG_TIME = 2000
 M5STICKV_WIDTH = 135
 
 ASIAN_MIN_CODEPOINT = 12288
+WIDE_GLYPH_LOCALES = ("ko-KR", "zh-CN", "ja-JP")
+
+# Text wrapping results kept by to_lines_endpos(), longer texts are not cached
+LINES_CACHE_SIZE = 32
+LINES_CACHE_MAX_TEXT = 512
 
 # Splash will use horizontally-centered text plots. Uses Thin spaces to help with alignment
 SPLASH = [
@@ -80,6 +86,7 @@ class Display:
         else:
             self.flipped_x_coordinates = False
         self.blk_ctrl = None
+        self._lines_cache = OrderedDict()
         if kboard.has_backlight:
             self.gpio_backlight_ctrl(Settings().hardware.display.brightness)
 
@@ -240,6 +247,7 @@ class Display:
                 else LANDSCAPE
             )
             self.portrait = False
+            self._lines_cache = OrderedDict()
 
     def to_portrait(self):
         """Changes the rotation of the display to portrait"""
@@ -251,6 +259,11 @@ class Display:
                 else PORTRAIT
             )
             self.portrait = True
+            self._lines_cache = OrderedDict()
+
+    def clear_lines_cache(self):
+        """Drops wrapped texts kept by to_lines_endpos(), which may be secrets"""
+        self._lines_cache = OrderedDict()
 
     def _usable_pixels_in_line(self):
         """Returns qtd of usable pixels in a line"""
@@ -266,10 +279,6 @@ class Display:
         """Returns the qtd of non wide chars that fit on one line (columns)"""
         return self._usable_pixels_in_line() // FONT_WIDTH
 
-    def _asian_chars_per_line(self):
-        """Returns the qtd of wide chars that fit on one line (columns)"""
-        return self._usable_pixels_in_line() // FONT_WIDTH_WIDE
-
     def to_lines_endpos(self, text, max_lines=TOTAL_LINES):
         """Takes a string of text and returns tuple(lines, end) to display on
         the screen and know how far into text it read; next page starts there.
@@ -277,19 +286,33 @@ class Display:
         if isinstance(text, list):
             return (text, sum((len(x) for x in text)))
 
-        columns = self.ascii_chars_per_line()
-        if Settings().i18n.locale in [
-            "ko-KR",
-            "zh-CN",
-            "ja-JP",
-        ] and lcd.string_has_wide_glyph(text):
-            columns = self._asian_chars_per_line()
+        usable_pixels = self._usable_pixels_in_line()
+        locale = Settings().i18n.locale
+        if len(text) > LINES_CACHE_MAX_TEXT:
+            return self._wrap_text(text, max_lines, usable_pixels, locale)
+
+        # Wrapping depends on locale and line width, so both are part of the key
+        cache_key = (text, max_lines, usable_pixels, locale)
+        cached = self._lines_cache.pop(cache_key, None)
+        if cached is None:
+            lines, end = self._wrap_text(text, max_lines, usable_pixels, locale)
+            # Lines are kept as a tuple, callers may edit the list they get
+            cached = (tuple(lines), end)
+            if len(self._lines_cache) >= LINES_CACHE_SIZE:
+                del self._lines_cache[next(iter(self._lines_cache))]
+        self._lines_cache[cache_key] = cached
+        return list(cached[0]), cached[1]
+
+    def _wrap_text(self, text, max_lines, usable_pixels, locale):
+        """Splits text into lines that fit usable_pixels, see to_lines_endpos()"""
+        columns = usable_pixels // FONT_WIDTH
+        if locale in WIDE_GLYPH_LOCALES and lcd.string_has_wide_glyph(text):
+            columns = usable_pixels // FONT_WIDTH_WIDE
 
         # Quick return if content fits in one line
         if len(text) <= columns and "\n" not in text:
             return ([text], len(text))
 
-        usable_pixels = self._usable_pixels_in_line()
         total_chars = len(text)
 
         lines = []
@@ -22,33 +22,154 @@
 
 import ujson as json
 import hashlib
+import os
+import time
 from krux import kef
 from .baseconv import base_encode, base_decode
 from .sd_card import SDHandler
+from krux import flash_occupancy
+from krux import atomic_file
 from embit import bip39
-from .settings import FLASH_PATH, MNEMONICS_FILE
+from .settings import FLASH_PATH, MNEMONICS_FILE, MNEMONICS_LOG_FILE
 
 FLASH_PATH_STR = "/" + FLASH_PATH + "/%s"
 
 QR_CODE_ITER_MULTIPLE = 10000
 
+# Additions and removals are appended to MNEMONICS_LOG_FILE, one JSON record
+# per line: [id, b64_kef] adds an envelope, [id] is a tombstone removing it.
+# The log is replayed over MNEMONICS_FILE and folded back into it on compaction
+MNEMONICS_LOG_HEADER = "#krux-seeds-log 1\n"
+LOG_COMPACT_RECORDS = 16
+
 
 class MnemonicStorage:
     """Handler of stored encrypted seeds"""
 
     def __init__(self) -> None:
-        self.stored = {}
-        self.stored_sd = {}
-        try:
+        # Stored mnemonics of flash (False) and SD card (True), only read when
+        # first needed
+        self._stored = {False: None, True: None}
+        # Records on each log, None if there is no valid log yet
+        self._log_records = {False: None, True: None}
+
+    @property
+    def stored(self):
+        """Mnemonics stored on flash"""
+        return self._load(sd_card=False)
+
+    @property
+    def stored_sd(self):
+        """Mnemonics stored on SD card"""
+        return self._load(sd_card=True)
+
+    def _read(self, filename, sd_card):
+        """Returns the contents of a storage file from flash or SD card"""
+        if sd_card:
             with SDHandler() as sd:
-                self.stored_sd = json.loads(sd.read(MNEMONICS_FILE))
+                return sd.read(filename)
+        if filename == MNEMONICS_FILE:
+            return atomic_file.read(FLASH_PATH_STR % filename)
+        with open(FLASH_PATH_STR % filename, "r") as f:
+            return f.read()
+
+    def _load(self, sd_card):
+        """Returns the stored mnemonics, replaying the log over the file"""
+        stored = self._stored[sd_card]
+        if stored is not None:
+            return stored
+        stored = {}
+        try:
+            stored = json.loads(self._read(MNEMONICS_FILE, sd_card))
         except:
             pass
+        records = None
         try:
-            with open(FLASH_PATH_STR % MNEMONICS_FILE, "r") as f:
-                self.stored = json.loads(f.read())
+            log = self._read(MNEMONICS_LOG_FILE, sd_card)
         except:
-            pass
+            log = ""
+        if log.startswith(MNEMONICS_LOG_HEADER):
+            records = 0
+            for line in log[len(MNEMONICS_LOG_HEADER) :].split("\n"):
+                try:
+                    record = json.loads(line)
+                except:
+                    # Blank or partially written line
+                    continue
+                records += 1
+                if len(record) > 1:
+                    stored[record[0]] = {"b64_kef": record[1]}
+                else:
+                    stored.pop(record[0], None)
+        self._stored[sd_card] = stored
+        self._log_records[sd_card] = records
+        return stored
+
+    def _append(self, record, sd_card):
+        """Appends a record to the log, compacting it once it grows long"""
+        line = json.dumps(record)
+        records = self._log_records[sd_card]
+        mode = "a"
+        if records is None:
+            # Start a new log
+            mode = "w"
+            line = MNEMONICS_LOG_HEADER + line
+            records = 0
+        else:
+            # A leading newline ends any partially written last line, so
+            # this record is never glued to it
+            line = "\n" + line
+        if sd_card:
+            with SDHandler() as sd:
+                if mode == "a":
+                    sd.append(MNEMONICS_LOG_FILE, line)
+                else:
+                    sd.write(MNEMONICS_LOG_FILE, line)
+        else:
+            with open(FLASH_PATH_STR % MNEMONICS_LOG_FILE, mode) as f:
+                f.write(line)
+            flash_occupancy.invalidate()
+        self._log_records[sd_card] = records + 1
+        if records + 1 >= LOG_COMPACT_RECORDS:
+            self.compact(sd_card)
+            return True
+        return False
+
+    def _write_sd_file(self):
+        """Writes the stored mnemonics to MNEMONICS_FILE on SD card"""
+        contents = json.dumps(self._load(sd_card=True))
+        with SDHandler() as sd:
+            try:
+                old_contents = sd.read(MNEMONICS_FILE)
+            except:
+                old_contents = ""
+            # pad contents to old length to avoid abandoned bytes on sdcard
+            if len(contents) < len(old_contents):
+                contents += " " * (len(old_contents) - len(contents))
+            if contents != old_contents:
+                sd.write(MNEMONICS_FILE, contents)
+
+    def compact(self, sd_card=False):
+        """Folds the log into MNEMONICS_FILE and removes it"""
+        if sd_card:
+            self._write_sd_file()
+            with SDHandler() as sd:
+                try:
+                    # overwrite the log before removing it, for the same reason
+                    log = sd.read(MNEMONICS_LOG_FILE)
+                    sd.write(MNEMONICS_LOG_FILE, " " * len(log))
+                    sd.delete(MNEMONICS_LOG_FILE)
+                except OSError:
+                    pass
+        else:
+            contents = json.dumps(self._load(sd_card))
+            atomic_file.write(FLASH_PATH_STR % MNEMONICS_FILE, contents)
+            try:
+                os.remove(FLASH_PATH_STR % MNEMONICS_LOG_FILE)
+            except OSError:
+                pass
+            flash_occupancy.invalidate()
+        self._log_records[sd_card] = None
 
     def _deprecated_decrypt(self, key, salt, iterations, mode, payload):
         """in-the-wild, some `seeds.json` may have encrypted mnemonic words"""
@@ -108,59 +229,89 @@ class MnemonicStorage:
             return self._deprecated_decrypt(key, mnemonic_id, iterations, mode, data)
         return None
 
-    def store_encrypted_kef(self, mnemonic_id, kef_envelope, sd_card=False):
-        """Saves a KEF envelope directly to storage, returns True if successful"""
-        b64_kef = base_encode(kef_envelope, 64)
-        mnemonics = {}
-        if sd_card:
-            # load current MNEMONICS_FILE
-            try:
-                with SDHandler() as sd:
-                    contents = sd.read(MNEMONICS_FILE)
-                    orig_len = len(contents)
-                    mnemonics = json.loads(contents)
-            except:
-                orig_len = 0
+    def decrypt_all(self, key):
+        """Tries one key against every mnemonic stored on flash and SD card,
+        stretching it once per (id, iterations); returns matches and stats
+        """
+        start = time.ticks_ms()
+        groups = {}
+        legacy = []
+        envelopes = 0
+        for sd_card, source in ((False, self.stored), (True, self.stored_sd)):
+            for mnemonic_id, stored_value in source.items():
+                envelopes += 1
+                if not stored_value.get("b64_kef"):
+                    legacy.append((mnemonic_id, sd_card))
+                    continue
+                try:
+                    envelope = base_decode(stored_value["b64_kef"], 64)
+                    id_, version, iterations, data = kef.unwrap(envelope)
+                except:
+                    continue
+                groups.setdefault((id_, iterations), []).append(
+                    (mnemonic_id, sd_card, version, data)
+                )
 
-            # save the new MNEMONICS_FILE
-            try:
-                with SDHandler() as sd:
-                    mnemonics[mnemonic_id] = {"b64_kef": b64_kef}
-                    contents = json.dumps(mnemonics)
-                    # pad contents to orig_len to avoid abandoned bytes on sdcard
-                    if len(contents) < orig_len:
-                        contents += " " * (orig_len - len(contents))
-                    sd.write(MNEMONICS_FILE, contents)
-            except:
-                return False
-        else:
-            try:
-                # load current MNEMONICS_FILE
-                with open(FLASH_PATH_STR % MNEMONICS_FILE, "r") as f:
-                    mnemonics = json.loads(f.read())
-            except:
-                pass
+        matches = []
+        for (id_, iterations), group in groups.items():
+            decryptor = kef.Cipher(key, id_, iterations)
+            for mnemonic_id, sd_card, version, data in group:
+                try:
+                    decrypted = decryptor.decrypt(data, version)
+                    if not decrypted:
+                        continue
+                    words = bip39.mnemonic_from_bytes(decrypted)
+                except:
+                    # Not a mnemonic under this key, keep trying the others
+                    continue
+                matches.append((mnemonic_id, sd_card, words))
+        for mnemonic_id, sd_card in legacy:
             try:
-                # save the new MNEMONICS_FILE
-                with open(FLASH_PATH_STR % MNEMONICS_FILE, "w") as f:
-                    mnemonics[mnemonic_id] = {"b64_kef": b64_kef}
-                    f.write(json.dumps(mnemonics))
+                words = self.decrypt(key, mnemonic_id, sd_card)
             except:
-                return False
+                words = None
+            if words:
+                matches.append((mnemonic_id, sd_card, words))
+
+        stats = {
+            "envelopes": envelopes,
+            "key_derivations": len(groups) + len(legacy),
+            "matches": len(matches),
+            "ms": time.ticks_ms() - start,
+        }
+        return matches, stats
+
+    def store_encrypted_kef(self, mnemonic_id, kef_envelope, sd_card=False):
+        """Saves a KEF envelope directly to storage, returns True if successful"""
+        b64_kef = base_encode(kef_envelope, 64)
+        try:
+            stored = self._load(sd_card)
+            if sd_card:
+                # Other firmware and tools only read MNEMONICS_FILE from SD
+                # cards, so it is written right away
+                stored[mnemonic_id] = {"b64_kef": b64_kef}
+                if self._log_records[sd_card] is None:
+                    self._write_sd_file()
+                else:
+                    self.compact(sd_card)
+            else:
+                self._append([mnemonic_id, b64_kef], sd_card)
+                stored[mnemonic_id] = {"b64_kef": b64_kef}
+        except:
+            # Reloaded from storage when next needed
+            self._stored[sd_card] = None
+            return False
         return True
 
     def del_mnemonic(self, mnemonic_id, sd_card=False):
-        """Remove an entry from encrypted mnemonics file"""
-        if sd_card:
-            self.stored_sd.pop(mnemonic_id)
-            with SDHandler() as sd:
-                orig_len = len(sd.read(MNEMONICS_FILE))
-                contents = json.dumps(self.stored_sd)
-                # pad contents to orig_len to avoid abandoned bytes on sdcard
-                if len(contents) < orig_len:
-                    contents += " " * (orig_len - len(contents))
-                sd.write(MNEMONICS_FILE, contents)
-        else:
-            self.stored.pop(mnemonic_id)
-            with open(FLASH_PATH_STR % MNEMONICS_FILE, "w") as f:
-                f.write(json.dumps(self.stored))
+        """Remove an entry from encrypted mnemonics, rewriting MNEMONICS_FILE
+        right away so the deleted envelope does not linger on it
+        """
+        self._load(sd_card).pop(mnemonic_id)
+        if self._log_records[sd_card] is not None:
+            # A tombstone keeps the entry deleted should compaction be cut
+            # short before the log holding its addition is removed
+            if self._append([mnemonic_id], sd_card):
+                # Appending it compacted the log already
+                return
+        self.compact(sd_card)
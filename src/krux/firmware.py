@@ -35,6 +35,7 @@ from .wdt import wdt
 from .themes import theme
 from .metadata import VERSION
 from .settings import SD_PATH
+from krux import flash_occupancy
 
 FLASH_SIZE = 2**24
 MAX_FIRMWARE_SIZE = 0x300000
@@ -43,6 +44,8 @@ FIRMWARE_SLOT_1 = 0x00080000
 FIRMWARE_SLOT_2 = 0x00390000
 SPIFFS_ADDR = 0xD00000
 FIRMWARE_WRITE_CHUNCK_SIZE = 2**16
+# Bytes of a sector read at once when comparing it in differential writes
+DIFFERENTIAL_READ_SIZE = 2**12
 
 MAIN_BOOT_CONFIG_SECTOR_ADDRESS = 0x00004000
 BACKUP_BOOT_CONFIG_SECTOR_ADDRESS = 0x00005000
@@ -54,9 +57,7 @@ FLASH_IO_WAIT_TIME = 100
 
 CALVER_SIZE = 7
 READ_FIRMWARE_BUFFER = 2**14
-READ_FIRMWARE_VERSION_BUFFER = 2**10
 FIRMWARE_VERSION_CHUNK_OVERLAP = 120
-DEVICE_TYPE_CHUNK_OVERLAP = 20
 
 
 def find_active_firmware(sector):
@@ -87,10 +88,22 @@ def update_boot_config_sector(
 
 
 def write_data(
-    pct_cb, address, data, data_size, chunk_size, header=False, sha_suffix=None
+    pct_cb,
+    address,
+    data,
+    data_size,
+    chunk_size,
+    header=False,
+    sha_suffix=None,
+    differential=False,
 ):
-    """Writes data to the flash, optionally adding header and sha suffix for firmware"""
+    """Writes data to the flash, optionally adding header and sha suffix for firmware.
+    If differential, sectors already holding the same content are not rewritten.
+    Returns the number of sectors written and skipped
+    """
     buffer = bytearray(chunk_size)
+    written = 0
+    skipped = 0
     i = 0
     chunk_read = 0
     total_read = 0
@@ -145,43 +158,49 @@ def write_data(
             buffer[chunk_read + j] = 0b0
 
         cur_address = i * chunk_size + address
+        if differential:
+            chunk_header = (
+                b"\x00" + data_size.to_bytes(4, "little") if header_offset else b""
+            )
+            if _flash_matches(
+                cur_address, chunk_header, buffer, chunk_size_after_header
+            ):
+                skipped += 1
+                i += 1
+                chunk_read = 0
+                continue
         flash.erase(cur_address, chunk_size)
+        flash_occupancy.invalidate()
         time.sleep_ms(FLASH_IO_WAIT_TIME)
         if header and i == 0:
             flash.write(cur_address, b"\x00" + data_size.to_bytes(4, "little"))
             time.sleep_ms(FLASH_IO_WAIT_TIME)
         flash.write(cur_address + header_offset, buffer[:chunk_size_after_header])
         time.sleep_ms(FLASH_IO_WAIT_TIME)
+        written += 1
         i += 1
         num_read = 0
         chunk_read = 0
+    return written, skipped
 
 
-def fsize(firmware_filename):
-    """Returns the size of the firmware"""
-    size = 0
-    with open(firmware_filename, "rb", buffering=0) as file:
-        while True:
-            chunk = file.read(READ_FIRMWARE_BUFFER)
-            if not chunk:
-                break
-            size += len(chunk)
-    return size
+def _flash_matches(address, header, buffer, size):
+    """Returns whether flash at address holds header followed by the first size
+    bytes of buffer, reading a few KB at a time instead of a whole sector
+    """
+    if header and flash.read(address, len(header)) != header:
+        return False
+    address += len(header)
+    for offset in range(0, size, DIFFERENTIAL_READ_SIZE):
+        length = min(DIFFERENTIAL_READ_SIZE, size - offset)
+        if flash.read(address + offset, length) != buffer[offset : offset + length]:
+            return False
+    return True
 
 
-def sha256(firmware_filename, firmware_size=None):
-    """Returns the sha256 hash of the firmware"""
-    hasher = uhashlib_hw.sha256()
-    # If firmware size is supplied, then we want a sha256 of the firmware with its header
-    if firmware_size is not None:
-        hasher.update(b"\x00" + firmware_size.to_bytes(4, "little"))
-    with open(firmware_filename, "rb", buffering=0) as file:
-        while True:
-            chunk = file.read(READ_FIRMWARE_BUFFER)
-            if not chunk:
-                break
-            hasher.update(chunk)
-    return hasher.digest()
+def fsize(firmware_filename):
+    """Returns the size of the firmware"""
+    return os.stat(firmware_filename)[6]
 
 
 def find_all_occurrences(data, pattern):
@@ -215,52 +234,80 @@ def extract_calver(context):
     return None
 
 
-def is_this_device(firmware_filename):
-    """Return True if firmware is for this device"""
-    with open(firmware_filename, "rb", buffering=0) as f:
-        firmware_data = b""
-        last_chunk = b""
-        while True:
-            chunk = f.read(READ_FIRMWARE_VERSION_BUFFER)
-            if not chunk:
-                break
-            # Buffer must overlap slightly to avoid missing patterns split between chunks
-            firmware_data = last_chunk + chunk
-            last_chunk = chunk[-DEVICE_TYPE_CHUNK_OVERLAP:]
-            if (
-                firmware_data.find(('"' + board.config["type"] + '"').encode("ascii"))
-                != -1
-            ):
-                return True
-    return False
+class FirmwareInfo:
+    """Results of a single pass inspection of a firmware file"""
 
+    def __init__(self):
+        self.size = 0
+        self.sha256 = None
+        self.header_sha256 = None
+        self.for_this_device = False
+        self.version = None
 
-def is_version_greater(firmware_filename):
-    """Return the version if greater, else False"""
-    new_version = None
-    with open(firmware_filename, "rb", buffering=0) as f:
-        firmware_data = b""
-        last_chunk = b""
+
+def inspect_firmware(firmware_filename, firmware_size=None):
+    """Reads the firmware once, computing its size and sha256, looking for this
+    device's board type and for the version next to krux/metadata.py.
+    If firmware size is supplied, the sha256 of the firmware with its header is
+    also computed
+    """
+    info = FirmwareInfo()
+    hasher = uhashlib_hw.sha256()
+    header_hasher = None
+    if firmware_size is not None:
+        import hashlib
+
+        # Software hasher, so hardware one isn't shared between two contexts
+        header_hasher = hashlib.sha256(b"\x00" + firmware_size.to_bytes(4, "little"))
+    device_marker = ('"' + board.config["type"] + '"').encode("ascii")
+    last_chunk = b""
+    with open(firmware_filename, "rb", buffering=0) as file:
         while True:
-            chunk = f.read(READ_FIRMWARE_VERSION_BUFFER)
+            chunk = file.read(READ_FIRMWARE_BUFFER)
             if not chunk:
                 break
+            info.size += len(chunk)
+            hasher.update(chunk)
+            if header_hasher is not None:
+                header_hasher.update(chunk)
+
             # Buffer must overlap slightly to avoid missing patterns split between chunks
             firmware_data = last_chunk + chunk
             last_chunk = chunk[-FIRMWARE_VERSION_CHUNK_OVERLAP:]
-            positions = find_all_occurrences(firmware_data, b"krux/metadata.py")
-            if not positions:
-                continue
-            for pos in positions:
+            if not info.for_this_device:
+                info.for_this_device = firmware_data.find(device_marker) != -1
+            for pos in find_all_occurrences(firmware_data, b"krux/metadata.py"):
                 delta = 100
                 start_range = max(pos - delta, 0)
                 end_range = min(pos + delta, len(firmware_data))
-                context_before = firmware_data[start_range:end_range]
-                version = extract_calver(context_before)
+                version = extract_calver(firmware_data[start_range:end_range])
                 if version:
-                    new_version = version
+                    info.version = version
                     break
 
+    info.sha256 = hasher.digest()
+    if header_hasher is not None:
+        info.header_sha256 = header_hasher.digest()
+    return info
+
+
+def _inspected(firmware):
+    """Returns the inspection of a firmware filename or the given FirmwareInfo"""
+    if isinstance(firmware, FirmwareInfo):
+        return firmware
+    return inspect_firmware(firmware)
+
+
+def is_this_device(firmware):
+    """Return True if firmware (filename or FirmwareInfo) is for this device"""
+    return _inspected(firmware).for_this_device
+
+
+def is_version_greater(firmware):
+    """Return the version of firmware (filename or FirmwareInfo) if greater,
+    else False
+    """
+    new_version = _inspected(firmware).version
     try:
         new_ver = tuple(map(int, new_version.split(".")))
         current_version = VERSION.split(".")
@@ -335,8 +382,14 @@ def upgrade():
         display.flash_text(t("Missing signature file"), theme.error_color)
         return False
 
+    # Read the firmware only once to get its hashes, board type and version
+    firmware_info = inspect_firmware(firmware_path, new_size)
+    if firmware_info.size != new_size:
+        display.flash_text("Error read/write data", theme.error_color)
+        return False
+
     # Validate signature
-    firmware_hash = sha256(firmware_path)
+    firmware_hash = firmware_info.sha256
     try:
         # Parse, serialize, and reparse to ensure signature is compact prior to verification
         sig = ec.Signature.parse(ec.Signature.parse(sig).serialize())
@@ -348,13 +401,13 @@ def upgrade():
         return False
 
     # Validate firmware device type
-    if not is_this_device(firmware_path):
+    if not is_this_device(firmware_info):
         display.flash_text("Firmware not for this device", theme.error_color)
         return False
 
     # Validate firmware file version
     try:
-        new_version = is_version_greater(firmware_path)
+        new_version = is_version_greater(firmware_info)
 
         if not new_version:
             display.flash_text(
@@ -384,10 +437,11 @@ def upgrade():
     # Write new firmware to the opposite slot
     new_address = FIRMWARE_SLOT_2 if address == FIRMWARE_SLOT_1 else FIRMWARE_SLOT_1
 
-    firmware_with_header_hash = sha256(firmware_path, new_size)
+    firmware_with_header_hash = firmware_info.header_sha256
     try:
         with open(firmware_path, "rb", buffering=0) as firmware_file:
-            write_data(
+            # Sectors matching the new firmware are left untouched
+            written, skipped = write_data(
                 lambda pct: status_text(
                     t("Processing…") + "1/3" + "\n\n%d%%" % int(pct * 100)
                 ),
@@ -397,6 +451,7 @@ def upgrade():
                 FIRMWARE_WRITE_CHUNCK_SIZE,
                 True,
                 firmware_with_header_hash,
+                differential=True,
             )
 
         write_data(
@@ -426,7 +481,12 @@ def upgrade():
         return False
 
     status_text(
-        t("Upgrade complete.") + "\n\n\n" + t("Remove firmware files from SD Card?")
+        t("Upgrade complete.")
+        + "\n"
+        + t("Sectors rewritten:")
+        + " %d/%d" % (written, written + skipped)
+        + "\n\n"
+        + t("Remove firmware files from SD Card?")
     )
     inp.buttons_active = True
     if not inp.wait_for_button() in (BUTTON_PAGE, BUTTON_PAGE_PREV):
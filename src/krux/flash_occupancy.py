@@ -0,0 +1,66 @@
+# The MIT License (MIT)
+
+# Copyright (c) 2021-2024 Krux contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Bytes read first from each block, most used blocks are told apart from empty
+# ones without reading them whole
+PROBE_SIZE = 32
+
+# Occupancy bitmap of the last scan, one bit per block, set if block is used,
+# and the block size it was scanned with
+_CACHED_MAP = {"occupancy": None, "block_size": 0}
+
+
+def invalidate():
+    """Drops the cached occupancy map. Must be called whenever flash is written"""
+    _CACHED_MAP["occupancy"] = None
+
+
+def scan(flash_size, block_size):
+    """Returns a bitmap with one bit per flash block, set if the block is not
+    empty. Flash is only scanned if there is no valid cached map
+    """
+    if _CACHED_MAP["occupancy"] is not None and _CACHED_MAP["block_size"] == block_size:
+        return _CACHED_MAP["occupancy"]
+
+    import flash
+    from .wdt import wdt
+
+    blocks = flash_size // block_size
+    occupancy = bytearray((blocks + 7) >> 3)
+    empty_block = b"\xff" * block_size
+    empty_probe = empty_block[:PROBE_SIZE]
+    for index in range(blocks):
+        wdt.feed()
+        address = index * block_size
+        if (
+            flash.read(address, PROBE_SIZE) != empty_probe
+            or flash.read(address, block_size) != empty_block
+        ):
+            occupancy[index >> 3] |= 1 << (index & 7)
+    _CACHED_MAP["occupancy"] = occupancy
+    _CACHED_MAP["block_size"] = block_size
+    return occupancy
+
+
+def is_used(occupancy, index):
+    """Returns True if block at index is marked as used on occupancy bitmap"""
+    return bool(occupancy[index >> 3] & (1 << (index & 7)))
@@ -136,13 +136,58 @@ MODE_IVS = {
 AES_BLOCK_SIZE = 16
 
 
+class KeyCache:
+    """Opt-in, session-scoped cache of pbkdf2 stretched keys"""
+
+    def __init__(self):
+        self.enabled = False
+        self.keys = {}
+
+    def enable(self):
+        """Keeps stretched keys in memory until clear() is called"""
+        self.enabled = True
+
+    def clear(self, disable=False):
+        """Zeroizes and evicts every cached stretched key, optionally disabling
+        the cache"""
+        for stretched in self.keys.values():
+            for i in range(len(stretched)):
+                stretched[i] = 0
+        self.keys.clear()
+        if disable:
+            self.enabled = False
+
+    def stretch(self, key, salt, iterations):
+        """Returns pbkdf2_hmac_sha256(key, salt, iterations), from cache when
+        enabled"""
+        if not self.enabled:
+            return uhashlib_hw.pbkdf2_hmac_sha256(key, salt, iterations)
+
+        # index by a digest so the cache never holds the secret itself
+        cache_id = uhashlib_hw.sha256(
+            len(key).to_bytes(4, "big")
+            + key
+            + len(salt).to_bytes(4, "big")
+            + salt
+            + str(iterations).encode()
+        ).digest()
+        stretched = self.keys.get(cache_id)
+        if stretched is None:
+            stretched = bytearray(uhashlib_hw.pbkdf2_hmac_sha256(key, salt, iterations))
+            self.keys[cache_id] = stretched
+        return bytes(stretched)
+
+
+key_cache = KeyCache()  # Singleton
+
+
 class Cipher:
     """More than just a helper for AES encrypt/decrypt. Enforces KEF VERSIONS rules"""
 
     def __init__(self, key, salt, iterations):
         key = key if isinstance(key, bytes) else key.encode()
         salt = salt if isinstance(salt, bytes) else salt.encode()
-        self._key = uhashlib_hw.pbkdf2_hmac_sha256(key, salt, iterations)
+        self._key = key_cache.stretch(key, salt, iterations)
 
     def encrypt(self, plain, version, iv=b"", fail_unsafe=True):
         """AES encrypt according to KEF rules defined by version, returns payload bytes"""
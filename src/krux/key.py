@@ -28,6 +28,7 @@ from hashlib import sha256
 from embit import bip32, bip39
 from embit.wordlists.bip39 import WORDLIST
 from embit.networks import NETWORKS
+from .bip39 import WORDLIST_PREFIXES
 from .settings import (
     TEST_TXT,
     THIN_SPACE,
@@ -328,8 +329,8 @@ class Key:
             raise ValueError("must provide 11 or 23 words")
 
         accu = 0
-        for index in [WORDLIST.index(x) for x in words]:
-            accu = (accu << 11) + index
+        for word in words:
+            accu = (accu << 11) + WORDLIST_PREFIXES.index(word)
 
         # in bits: final entropy, needed entropy, checksum
         len_target = (len(words) * 11 + 11) // 33 * 32
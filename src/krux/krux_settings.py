@@ -74,9 +74,8 @@ def t(slug):
     if not locale_control.translation:
         return slug
     slug_id = binascii.crc32(slug.encode("utf-8"))
-    try:
-        translation_index = locale_control.reference.index(slug_id)
-    except:
+    translation_index = locale_control.lookup.get(slug_id)
+    if translation_index is None:
         return slug
     return locale_control.translation[translation_index]
 
@@ -86,6 +85,7 @@ class LocaleControl:
 
     def __init__(self):
         self.reference = None
+        self.lookup = None
         self.translation = None
         self.locales = []
         self.update_locales()
@@ -103,6 +103,7 @@ class LocaleControl:
 
         if locale == DEFAULT_LOCALE:
             self.reference = None
+            self.lookup = None
             self.translation = None
             return
         module_path = "krux.translations.{}".format(locale[:2])
@@ -116,6 +117,8 @@ class LocaleControl:
             from .translations import ref_array
 
             self.reference = ref_array
+            # Slug CRC to translation index, shared by all locales
+            self.lookup = {slug_id: i for i, slug_id in enumerate(ref_array)}
 
 
 locale_control = LocaleControl()
@@ -427,12 +430,14 @@ class EncryptionSettings(SettingsNamespace):
     namespace = "settings.encryption"
     version = CategorySetting("version", "AES-GCM", list(MODE_NAMES.values()))
     pbkdf2_iterations = NumberSetting(int, "pbkdf2_iterations", 100000, [10000, 500000])
+    key_cache = CategorySetting("key_cache", False, [False, True])
 
     def label(self, attr):
         """Returns a label for UI when given a setting name or namespace"""
         return {
             "version": t("Encryption Mode"),
             "pbkdf2_iterations": t("PBKDF2 iter."),
+            "key_cache": t("Cache Keys"),
         }[attr]
 
 
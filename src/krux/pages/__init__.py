@@ -47,7 +47,7 @@ from ..display import (
     STATUS_BAR_HEIGHT,
     BOTTOM_LINE,
 )
-from ..qr import to_qr_codes, FORMAT_NONE
+from ..qr import QRFrames, FORMAT_NONE
 from ..krux_settings import t, Settings
 from ..sd_card import SDHandler
 from ..kboard import kboard
@@ -73,6 +73,9 @@ DIGITS = "1234567890"
 BATTERY_WIDTH = 22
 BATTERY_HEIGHT = 7
 
+# Items of a LazyMenu kept built, a few pages worth
+LAZY_MENU_CACHE_SIZE = 16
+
 LOAD_FROM_CAMERA = 0
 LOAD_FROM_SD = 1
 
@@ -276,7 +279,7 @@ class Page:
                 t("PAGE to toggle brightness"), cursor_y, theme.frame_color
             )
 
-        code_generator = to_qr_codes(data, qr_data_width, qr_format)
+        frames = QRFrames(data, qr_data_width, qr_format)
         qr_foreground = WHITE if theme.bg_color == WHITE else None
         extra_debounce_flag = True
         self.ctx.input.buttons_active = True
@@ -286,11 +289,7 @@ class Page:
         i = 0
         done = False
         while not done:
-            try:
-                code, num_parts = next(code_generator)
-            except:
-                code_generator = to_qr_codes(data, qr_data_width, qr_format)
-                code, num_parts = next(code_generator)
+            code, num_parts = next(frames)
 
             # Draw QR code
             if qr_foreground:
@@ -638,6 +637,36 @@ class ListView:
         return self.offset + i
 
 
+class LazyMenu:
+    """Menu items built only when accessed, for long menus. build_item(index)
+    returns the (label, handler) of an item, labels must fit in a single line
+    """
+
+    def __init__(self, count, build_item):
+        self.count = count
+        self.build_item = build_item
+        self.built = {}
+        self.extra = []
+
+    def __len__(self):
+        return self.count + len(self.extra)
+
+    def __getitem__(self, index):
+        if index >= self.count:
+            return self.extra[index - self.count]
+        item = self.built.get(index)
+        if item is None:
+            if len(self.built) >= LAZY_MENU_CACHE_SIZE:
+                self.built = {}
+            item = self.build_item(index)
+            self.built[index] = item
+        return item
+
+    def append(self, item):
+        """Adds an item after the lazily built ones"""
+        self.extra.append(item)
+
+
 class Menu:
     """Represents a menu that can render itself to the screen, handle item selection,
     and invoke menu item callbacks that return a status
@@ -656,7 +685,7 @@ class Menu:
         self.menu = menu
         if back_label:
             back_label = t("Back") if back_label == "Back" else back_label
-            self.menu += [("< " + back_label, back_status)]
+            self.menu.append(("< " + back_label, back_status))
         self.disable_statusbar = disable_statusbar or (
             self.ctx.wallet is None and not kboard.has_battery
         )
@@ -668,10 +697,17 @@ class Menu:
             # Always disable status bar if menu has non standard offset
             self.disable_statusbar = True
             self.menu_offset = offset if offset >= 0 else DEFAULT_PADDING
+        # Lazy menu labels are single lines, no need to build them all to check
+        menu_lines = None if isinstance(self.menu, LazyMenu) else self.menu
         max_viewable = min(
-            self.ctx.display.max_menu_lines(self.menu_offset, self.menu), len(self.menu)
+            self.ctx.display.max_menu_lines(self.menu_offset, menu_lines),
+            len(self.menu),
         )
         self.menu_view = ListView(self.menu, max_viewable)
+        # Geometry of the items on screen, used to repaint only what changed
+        self.menu_layout = []
+        self.menu_regions = []
+        self.drawn_battery = None
 
     @property
     def back_index(self):
@@ -721,6 +757,34 @@ class Menu:
             selected_item_index = self._move_back()
         return selected_item_index
 
+    def _refresh_menu(self, partial, drawn_index, selected_item_index):
+        """Draws the menu, or when what is on screen is still valid, only
+        moves the selection from drawn_index and refreshes the status bar
+        """
+        if partial:
+            if drawn_index != selected_item_index:
+                self._redraw_selection(drawn_index, selected_item_index)
+            if kboard.has_touchscreen:
+                self.ctx.input.touch.y_regions = self.menu_regions
+            self.refresh_status_bar()
+            return
+        if self.menu_offset > STATUS_BAR_HEIGHT:
+            # Clear only the menu area
+            self.ctx.display.fill_rectangle(
+                0,
+                self.menu_offset,
+                self.ctx.display.width(),
+                self.ctx.display.height() - self.menu_offset,
+                theme.bg_color,
+            )
+        else:
+            self.ctx.display.clear()
+        if kboard.has_touchscreen:
+            self._draw_touch_menu(selected_item_index)
+        else:
+            self._draw_menu(selected_item_index)
+        self.draw_status_bar()
+
     def run_loop(self, start_from_index=None, swipe_up_fnc=None, swipe_down_fnc=None):
         """Runs the menu loop until one of the menu items returns either a MENU_EXIT
         or MENU_SHUTDOWN status
@@ -730,26 +794,24 @@ class Menu:
         if start_from_index is not None:
             start_from_submenu = True
             selected_item_index = start_from_index
+        # What is on screen: (view offset, buttons active) and selected index,
+        # None when anything else may have drawn over the menu
+        drawn_view = None
+        drawn_index = None
         while True:
             gc.collect()
-            if self.menu_offset > STATUS_BAR_HEIGHT:
-                # Clear only the menu area
-                self.ctx.display.fill_rectangle(
-                    0,
-                    self.menu_offset,
-                    self.ctx.display.width(),
-                    self.ctx.display.height() - self.menu_offset,
-                    theme.bg_color,
-                )
-            else:
-                self.ctx.display.clear()
-            if kboard.has_touchscreen:
-                self._draw_touch_menu(selected_item_index)
-            else:
-                self._draw_menu(selected_item_index)
-            self.draw_status_bar()
+            view = (self.menu_view.offset, self.ctx.input.buttons_active)
+            self._refresh_menu(
+                drawn_view == view
+                and (not kboard.has_touchscreen or self.ctx.input.buttons_active),
+                drawn_index,
+                selected_item_index,
+            )
+            drawn_view = view
+            drawn_index = selected_item_index
             self.ctx.input.reset_ios_state()
             if start_from_submenu:
+                drawn_view = None
                 status = self._clicked_item(selected_item_index)
                 if status != MENU_CONTINUE:
                     return (self.menu_view.index(selected_item_index), status)
@@ -767,6 +829,7 @@ class Menu:
                         btn = BUTTON_ENTER
                     self.ctx.input.touch.clear_regions()
                 if btn == BUTTON_ENTER:
+                    drawn_view = None
                     status = self._clicked_item(selected_item_index)
                     if status != MENU_CONTINUE:
                         return (self.menu_view.index(selected_item_index), status)
@@ -775,6 +838,7 @@ class Menu:
                 elif btn in (BUTTON_PAGE_PREV, FAST_BACKWARD):
                     selected_item_index = self._process_page_prev(selected_item_index)
                 elif btn in (SWIPE_UP, SWIPE_DOWN, SWIPE_LEFT, SWIPE_RIGHT):
+                    drawn_view = None
                     if btn in (SWIPE_UP, SWIPE_LEFT):
                         selected_item_index = self._process_swipe_up(
                             selected_item_index, swipe_up_fnc
@@ -787,6 +851,7 @@ class Menu:
                         return selected_item_index
                 elif btn is None and self.menu_offset == STATUS_BAR_HEIGHT:
                     # Activates screensaver if there's no info_box(other things draw on the screen)
+                    drawn_view = None
                     self.screensaver()
 
     def _clicked_item(self, selected_item_index):
@@ -815,9 +880,15 @@ class Menu:
             )
             self.draw_network_indicator()
             self.draw_wallet_indicator()
+            self.drawn_battery = None
             if kboard.has_battery:
                 _thread.start_new_thread(self.draw_battery_indicator, ())
 
+    def refresh_status_bar(self):
+        """Redraws only the status bar indicators that may have changed"""
+        if not self.disable_statusbar and kboard.has_battery:
+            _thread.start_new_thread(self.draw_battery_indicator, ())
+
     #     self.draw_ram_indicator()
 
     # def draw_ram_indicator(self):
@@ -863,9 +934,22 @@ class Menu:
             battery_color = theme.go_color
         else:
             battery_color = theme.error_color if charge < 0.3 else theme.fg_color
+        charge_length = int((BATTERY_WIDTH - 3) * charge)
+        if self.drawn_battery == (charge_length, battery_color):
+            return
         width = self.ctx.display.width()
         x_padding = FONT_HEIGHT // 3
         y_padding = (STATUS_BAR_HEIGHT // 2) - (BATTERY_HEIGHT // 2)
+        if self.drawn_battery is not None:
+            # Erase previous charge level
+            self.ctx.display.fill_rectangle(
+                width - x_padding - BATTERY_WIDTH + 2,
+                y_padding + 2,
+                BATTERY_WIDTH - 3,
+                BATTERY_HEIGHT - 3,
+                theme.info_bg_color,
+            )
+        self.drawn_battery = (charge_length, battery_color)
         self.ctx.display.outline(
             width - x_padding - BATTERY_WIDTH,
             y_padding,
@@ -876,7 +960,6 @@ class Menu:
         self.ctx.display.fill_rectangle(
             width - x_padding + 1, y_padding + 2, 2, BATTERY_HEIGHT - 3, battery_color
         )
-        charge_length = int((BATTERY_WIDTH - 3) * charge)
         self.ctx.display.fill_rectangle(
             width - x_padding - BATTERY_WIDTH + 2,
             y_padding + 2,
@@ -928,10 +1011,13 @@ class Menu:
     def _draw_touch_menu(self, selected_item_index):
         # map regions with dynamic height to fill screen
         self.ctx.input.touch.clear_regions()
+        menu_items_lines = [
+            self.ctx.display.to_lines(menu_item[0]) for menu_item in self.menu_view
+        ]
         offset_y = 0
         y_keypad_map = [offset_y]
-        for menu_item in self.menu_view:
-            offset_y += len(self.ctx.display.to_lines(menu_item[0])) + 1
+        for menu_item_lines in menu_items_lines:
+            offset_y += len(menu_item_lines) + 1
             y_keypad_map.append(offset_y)
         height_multiplier = (
             self.ctx.display.height() - self.menu_offset - DEFAULT_PADDING
@@ -945,6 +1031,7 @@ class Menu:
         # Expand last region to fill the screen
         y_keypad_map[-1] = self.ctx.display.height()
         self.ctx.input.touch.y_regions = y_keypad_map
+        self.menu_regions = y_keypad_map
 
         # Draw dividers
         for i, y in enumerate(y_keypad_map[:-1]):
@@ -954,8 +1041,9 @@ class Menu:
                 )
 
         # draw centralized strings in regions
+        self.menu_layout = []
         for i, menu_item in enumerate(self.menu_view):
-            menu_item_lines = self.ctx.display.to_lines(menu_item[0])
+            menu_item_lines = menu_items_lines[i]
             region_height = y_keypad_map[i + 1] - y_keypad_map[i]
             offset_y_item = (
                 region_height - len(menu_item_lines) * FONT_HEIGHT
@@ -963,23 +1051,19 @@ class Menu:
             fg_color = (
                 theme.fg_color if menu_item[1] is not None else theme.disabled_color
             )
-            if selected_item_index == i and self.ctx.input.buttons_active:
-                self.ctx.display.fill_rectangle(
-                    0,
+            self.menu_layout.append(
+                (
                     offset_y_item + 1 - FONT_HEIGHT // 2,
-                    self.ctx.display.width(),
                     (len(menu_item_lines) + 1) * FONT_HEIGHT,
+                    offset_y_item,
+                    menu_item_lines,
                     fg_color,
                 )
-            for j, text in enumerate(menu_item_lines):
-                if selected_item_index == i and self.ctx.input.buttons_active:
-                    self.ctx.display.draw_hcentered_text(
-                        text, offset_y_item + FONT_HEIGHT * j, theme.bg_color, fg_color
-                    )
-                else:
-                    self.ctx.display.draw_hcentered_text(
-                        text, offset_y_item + FONT_HEIGHT * j, fg_color
-                    )
+            )
+            self._draw_menu_item(
+                self.menu_layout[i],
+                selected_item_index == i and self.ctx.input.buttons_active,
+            )
 
     def _draw_menu(self, selected_item_index):
         extra_lines = sum(
@@ -1004,27 +1088,80 @@ class Menu:
         )
         items_pad //= max(len(self.menu_view) - 1, 1)
         items_pad = min(items_pad, FONT_HEIGHT)
+        self.menu_layout = []
         for i, menu_item in enumerate(self.menu_view):
             fg_color = (
                 theme.fg_color if menu_item[1] is not None else theme.disabled_color
             )
             menu_item_lines = self.ctx.display.to_lines(menu_item[0])
             delta_y = len(menu_item_lines) * FONT_HEIGHT + items_pad
-            if selected_item_index == i:
-                self.ctx.display.fill_rectangle(
-                    0,
+            self.menu_layout.append(
+                (
                     offset_y + 1 - items_pad // 2,
-                    self.ctx.display.width(),
                     delta_y - 2,
+                    offset_y,
+                    menu_item_lines,
                     fg_color,
                 )
-                for j, text in enumerate(menu_item_lines):
-                    self.ctx.display.draw_hcentered_text(
-                        text, offset_y + FONT_HEIGHT * j, theme.bg_color, fg_color
-                    )
-            else:
-                for j, text in enumerate(menu_item_lines):
-                    self.ctx.display.draw_hcentered_text(
-                        text, offset_y + FONT_HEIGHT * j, fg_color
-                    )
+            )
+            self._draw_menu_item(self.menu_layout[i], selected_item_index == i)
             offset_y += delta_y
+
+    def _draw_menu_item(self, item_layout, selected, top=0):
+        """Draws a menu item, highlighted if selected. Highlight is clipped
+        above top
+        """
+        rect_y, rect_height, offset_y, menu_item_lines, fg_color = item_layout
+        if selected:
+            self.ctx.display.fill_rectangle(
+                0,
+                max(rect_y, top),
+                self.ctx.display.width(),
+                rect_y + rect_height - max(rect_y, top),
+                fg_color,
+            )
+            for j, text in enumerate(menu_item_lines):
+                self.ctx.display.draw_hcentered_text(
+                    text, offset_y + FONT_HEIGHT * j, theme.bg_color, fg_color
+                )
+        else:
+            for j, text in enumerate(menu_item_lines):
+                self.ctx.display.draw_hcentered_text(
+                    text, offset_y + FONT_HEIGHT * j, fg_color
+                )
+
+    def _redraw_selection(self, previous_index, selected_item_index):
+        """Repaints only the items affected by moving the highlight, instead of
+        the whole menu
+        """
+        # Status bar is drawn over highlights, keep it untouched
+        top = 0 if self.disable_statusbar else STATUS_BAR_HEIGHT
+        prev_y, prev_height = self.menu_layout[previous_index][:2]
+        new_y, new_height = self.menu_layout[selected_item_index][:2]
+        self.ctx.display.fill_rectangle(
+            0,
+            max(prev_y, top),
+            self.ctx.display.width(),
+            prev_y + prev_height - max(prev_y, top),
+            theme.bg_color,
+        )
+        # Redraw, in the same order of a full draw, the changed items and every
+        # item whose text overlaps what is being repainted
+        spans = [(prev_y, prev_y + prev_height), (new_y, new_y + new_height)]
+        dirty = set()
+        grown = True
+        while grown:
+            grown = False
+            for i, item_layout in enumerate(self.menu_layout):
+                if i in dirty:
+                    continue
+                text_y = item_layout[2]
+                text_end = text_y + len(item_layout[3]) * FONT_HEIGHT
+                if i in (previous_index, selected_item_index) or any(
+                    text_y < end and text_end > start for start, end in spans
+                ):
+                    dirty.add(i)
+                    spans.append((text_y, text_end))
+                    grown = True
+        for i in sorted(dirty):
+            self._draw_menu_item(self.menu_layout[i], i == selected_item_index, top)
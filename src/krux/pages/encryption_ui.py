@@ -661,12 +661,51 @@ class LoadEncryptedMnemonic(Page):
                     ),
                 )
             )
+        if not remove_opt and mnemonic_ids_menu:
+            mnemonic_ids_menu.append((t("Try Key on All"), self._load_with_any_id))
         submenu = Menu(self.ctx, mnemonic_ids_menu)
         index, status = submenu.run_loop()
         if index == submenu.back_index:
             return MENU_CONTINUE
         return status
 
+    def _load_with_any_id(self):
+        """Tries one key against all stored mnemonics, listing those it opens"""
+        from ..encryption import MnemonicStorage
+        from ..settings import THIN_SPACE
+
+        key_capture = EncryptionKey(self.ctx)
+        key = key_capture.encryption_key()
+        if key in (None, "", ESC_KEY):
+            self.flash_error(t("Key was not provided"))
+            return MENU_CONTINUE
+        self.ctx.display.clear()
+        self.ctx.display.draw_centered_text(t("Processing…"))
+        mnemonic_storage = MnemonicStorage()
+        matches, _ = mnemonic_storage.decrypt_all(key)
+        del mnemonic_storage
+
+        matches = [match for match in matches if len(match[2].split()) in (12, 24)]
+        if not matches:
+            self.flash_error(t("Failed to decrypt"))
+            return MENU_CONTINUE
+        if len(matches) == 1:
+            return matches[0][2].split()
+
+        matches_menu = []
+        for mnemonic_id, sd_card, words in sorted(
+            matches, key=lambda match: (match[1], match[0])
+        ):
+            location = " (SD" + THIN_SPACE + "card)" if sd_card else " (flash)"
+            matches_menu.append(
+                (mnemonic_id + location, lambda words=words: words.split())
+            )
+        submenu = Menu(self.ctx, matches_menu)
+        index, status = submenu.run_loop()
+        if index == submenu.back_index:
+            return MENU_CONTINUE
+        return status
+
     def _load_encrypted_mnemonic(self, mnemonic_id, sd_card=False):
         """Uses encryption module to load and decrypt a mnemonic"""
         from ..encryption import MnemonicStorage
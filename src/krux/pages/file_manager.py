@@ -21,12 +21,17 @@
 # THE SOFTWARE.
 
 import gc
-from . import Page, Menu, MENU_EXIT, MENU_CONTINUE, MENU_RESTART
+from . import Page, Menu, LazyMenu, MENU_EXIT, MENU_CONTINUE, MENU_RESTART
 from ..sd_card import SDHandler
 from ..krux_settings import t
 from ..format import generate_thousands_separator, render_decimal_separator
 from ..display import BOTTOM_PROMPT_LINE
-from ..settings import SD_PATH, SETTINGS_FILENAME, MNEMONICS_FILE
+from ..settings import (
+    SD_PATH,
+    SETTINGS_FILENAME,
+    MNEMONICS_FILE,
+    MNEMONICS_LOG_FILE,
+)
 
 SD_ROOT_PATH = "/" + SD_PATH
 
@@ -42,39 +47,26 @@ class FileManager(Page):
         self, select_file_handler=lambda *args: MENU_EXIT, file_extension=""
     ):
         """Starts a file explorer on the SD folder and returns the file selected"""
-        import os
-
         path = SD_ROOT_PATH
         status = ""
+        # Listings of directories visited, until something is written to SD
+        listings = {}
         while True:
             # if is a dir then list all files in it
             if SDHandler.dir_exists(path):
-                items = []  # simple reference for the files shown on the menu_items
-                menu_items = []  # the user menu to interact
-
-                if path != SD_ROOT_PATH:
-                    items.append("..")
-                    menu_items.append(("../", lambda: MENU_EXIT))
-
-                # sorts by name ignorecase
-                dir_files = sorted(os.listdir(path), key=str.lower)
+                listing = listings.get(path)
+                if listing is None or listing[0] != SDHandler.writes:
+                    listing = (SDHandler.writes,) + SDHandler.list_dir(path)
+                    listings[path] = listing
+                _, directories, files = listing
 
-                # separate directories from files
-                directories = []
-                files = []
-
-                for filename in dir_files:
-                    if SDHandler.file_exists(path + "/" + filename):
-                        files.append(filename)
-                    else:
-                        directories.append(filename)
-
-                del dir_files
+                # simple reference for the files shown on the menu items
+                items = [] if path == SD_ROOT_PATH else [".."]
 
                 # show sorted folders first then sorted files
-                for i, filename in enumerate(directories + files):
-                    is_directory = i < len(directories)
-
+                items.extend(directories)
+                directories_end = len(items)
+                for filename in files:
                     extension_match = False
                     if isinstance(file_extension, str):
                         # No extension filter or matches
@@ -85,24 +77,23 @@ class FileManager(Page):
                             if filename.endswith(ext):
                                 extension_match = True
                                 break
-
-                    if extension_match or is_directory:
+                    if extension_match:
                         items.append(filename)
-                        display_filename = filename + "/" if is_directory else filename
-                        menu_items.append(
-                            (
-                                self.fit_to_line(display_filename),
-                                (
-                                    (lambda: MENU_EXIT)
-                                    if is_directory
-                                    else (
-                                        lambda file=filename: select_file_handler(
-                                            path + "/" + file
-                                        )
-                                    )
-                                ),
-                            )
-                        )
+
+                def menu_item(index):
+                    filename = items[index]
+                    if index == 0 and path != SD_ROOT_PATH:
+                        return ("../", lambda: MENU_EXIT)
+                    if index < directories_end:
+                        return (self.fit_to_line(filename + "/"), lambda: MENU_EXIT)
+                    file_path = path + "/" + filename
+                    return (
+                        self.fit_to_line(filename),
+                        lambda: select_file_handler(file_path),
+                    )
+
+                # the user menu to interact, items are built as they are shown
+                menu_items = LazyMenu(len(items), menu_item)
 
                 # We need to add this option because /sd can be empty!
                 items.append("Back")
@@ -137,7 +128,7 @@ class FileManager(Page):
         """Handler to print file info when selecting a file in the file explorer"""
 
         file = self.display_file(file)
-        if file in (SETTINGS_FILENAME, MNEMONICS_FILE):
+        if file in (SETTINGS_FILENAME, MNEMONICS_FILE, MNEMONICS_LOG_FILE):
             self.ctx.input.wait_for_button()
         elif self.prompt(t("Delete this file?"), BOTTOM_PROMPT_LINE):
             self.ctx.display.clear()
@@ -32,6 +32,7 @@ from ..wdt import wdt
 from ..firmware import FLASH_SIZE
 from ..camera import ENTROPY_MODE
 from ..kboard import kboard
+from .. import flash_occupancy
 
 FLASH_ROWS = 64
 BLOCK_SIZE = 0x1000
@@ -107,6 +108,7 @@ class FillFlash(Page):
             try:
                 if flash.read(address, BLOCK_SIZE) == empty_buf:
                     flash.write(address, chunk)
+                    flash_occupancy.invalidate()
                     chunk_index += 1
                     line_color = theme.highlight_color
             except Exception:
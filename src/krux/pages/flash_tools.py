@@ -55,13 +55,12 @@ class FlashTools(Page):
 
     def flash_map(self):
         """Load the flash map page"""
-        import flash
         import image
+        from .. import flash_occupancy
 
         image_block_size = self.ctx.display.width() // FLASH_ROWS
         if self.ctx.display.width() >= self.ctx.display.height():
             image_block_size -= 1
-        empty_buf = b"\xff" * BLOCK_SIZE
         column, row = 0, 0
         offset_x = (self.ctx.display.width() - (image_block_size * FLASH_ROWS)) // 2
         offset_y = DEFAULT_PADDING + 2 * FONT_HEIGHT
@@ -115,11 +114,13 @@ class FlashTools(Page):
         )
 
         # Draw a map of the flash memory
+        occupancy = flash_occupancy.scan(FLASH_SIZE, BLOCK_SIZE)
         mem_bar = image.Image(size=(FLASH_ROWS * image_block_size, image_block_size))
-        for address in range(0, FLASH_SIZE, BLOCK_SIZE):
+        for index in range(FLASH_SIZE // BLOCK_SIZE):
             wdt.feed()
+            address = index * BLOCK_SIZE
             color = theme.highlight_color if address < SPIFFS_ADDR else theme.fg_color
-            if flash.read(address, BLOCK_SIZE) == empty_buf:
+            if not flash_occupancy.is_used(occupancy, index):
                 color = theme.disabled_color
             # Draw the block
             mem_bar.draw_rectangle(
@@ -173,6 +174,7 @@ class FlashTools(Page):
         """Erase all SPIFFS, removing all saved configs and mnemonics"""
 
         import flash
+        from .. import flash_occupancy
 
         empty_buf = b"\xff" * ERASE_BLOCK_SIZE
         for address in range(SPIFFS_ADDR, FLASH_SIZE, ERASE_BLOCK_SIZE):
@@ -180,6 +182,7 @@ class FlashTools(Page):
             if flash.read(address, ERASE_BLOCK_SIZE) == empty_buf:
                 continue
             flash.erase(address, ERASE_BLOCK_SIZE)
+            flash_occupancy.invalidate()
 
     def erase_users_data(self):
         """Fully formats SPIFFS memory"""
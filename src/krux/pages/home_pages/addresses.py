@@ -334,41 +334,65 @@ class Addresses(Page):
             checking_match_txt = t("Verifying…") + " " + t("%d to %d")
             checked_no_match_txt = t("Checked %d addresses with no matches.")
             is_valid_txt = "%s\n\n" + t("is a valid address!")
-            not_found_txt = "%s\n\n" + t("was NOT FOUND in the first %d addresses")
+            not_found_txt = "%s\n\n" + t("was NOT FOUND in %d addresses checked")
+
+            from embit.networks import NETWORKS
+            from embit.script import address_to_scriptpubkey
+
+            # Compare scriptPubKey bytes instead of rendered address strings,
+            # once the address is known to be for the network addresses of
+            # this wallet are shown on
+            network = NETWORKS[self.ctx.wallet.which_network()]
+            script_pubkey = address_to_scriptpubkey(addr)
+            if script_pubkey.address(network) != addr:
+                self.flash_error(t("Invalid address"))
+                return MENU_CONTINUE
+            script_pubkey = script_pubkey.data
 
-            found = False
+            # Receive and change branches are searched together
+            num_branches = self.ctx.wallet.descriptor.num_branches
+            found = None
             num_checked = 0
-            while not found:
+            while found is None:
                 self.ctx.display.clear()
                 self.ctx.display.draw_centered_text(
                     checking_match_txt
                     % (num_checked, num_checked + SCAN_ADDRESS_LIMIT - 1)
                 )
-                for some_addr in self.ctx.wallet.obtain_addresses(
-                    num_checked, limit=SCAN_ADDRESS_LIMIT, branch_index=addr_type
-                ):
-                    num_checked += 1
-
-                    found = addr == some_addr
-                    if found:
-                        break
+                found = self.ctx.wallet.find_script_pubkey(
+                    script_pubkey,
+                    num_checked,
+                    limit=SCAN_ADDRESS_LIMIT,
+                    branch_index=addr_type,
+                )
+                num_checked += SCAN_ADDRESS_LIMIT
 
                 gc.collect()
 
-                if not found:
+                if found is None:
                     self.ctx.display.clear()
                     self.ctx.display.draw_centered_text(
-                        checked_no_match_txt % num_checked
+                        checked_no_match_txt % (num_checked * num_branches)
                     )
                     if not self.prompt(t("Try more?"), BOTTOM_PROMPT_LINE):
                         break
 
             self.ctx.display.clear()
-            result_message = (
-                is_valid_txt % (str(num_checked - 1) + ".\n\n" + format_address(addr))
-                if found
-                else not_found_txt % (format_address(addr), num_checked)
-            )
+            if found is not None:
+                found_branch, found_index = found
+                index_txt = str(found_index) + "."
+                if found_branch != addr_type:
+                    # Found while interleaving the other branch
+                    branch_txt = t("Change") if found_branch == 1 else t("Receive")
+                    index_txt = branch_txt + " " + index_txt
+                result_message = is_valid_txt % (
+                    index_txt + "\n\n" + format_address(addr)
+                )
+            else:
+                result_message = not_found_txt % (
+                    format_address(addr),
+                    num_checked * num_branches,
+                )
             self.ctx.display.draw_centered_text(result_message)
             self._scan_highlight_addr(result_message)
             self.ctx.input.wait_for_button()
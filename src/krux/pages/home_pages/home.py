@@ -295,7 +295,9 @@ class Home(Page):
                     return MENU_CONTINUE
 
         # index == 2: Sign to SD card
-        signer.sign(trim=False)
+        stream_sign = signer.can_stream_sign()
+        if not stream_sign:
+            signer.sign(trim=False)
         psbt_filename = self._format_psbt_file_extension(psbt_filename)
         gc.collect()
 
@@ -307,6 +309,10 @@ class Home(Page):
                     if signer.is_b64_file:
                         signed_psbt, _ = signer.psbt_qr()
                         sd.write(psbt_filename, signed_psbt)
+                    elif stream_sign:
+                        self.ctx.display.clear()
+                        self.ctx.display.draw_centered_text(t("Signing…"))
+                        signer.sign_to_file(SDHandler.PATH_STR % psbt_filename)
                     else:
                         with open(SDHandler.PATH_STR % psbt_filename, "wb") as f:
                             # Write PSBT data directly to the file
@@ -318,6 +324,10 @@ class Home(Page):
                     return MENU_CONTINUE
             except OSError:
                 self.flash_error(t("SD card not detected."))
+            except ValueError as e:
+                # Streamed PSBTs only find out there is nothing to sign
+                # while signing, the partial file has been removed
+                self.flash_error(t("Error:") + "\n%s" % e)
 
         return MENU_CONTINUE
 
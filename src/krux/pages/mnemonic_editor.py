@@ -21,7 +21,6 @@
 # THE SOFTWARE.
 
 from embit import bip39
-from embit.wordlists.bip39 import WORDLIST
 from . import Page, ESC_KEY, LETTERS
 from ..display import DEFAULT_PADDING, MINIMAL_PADDING, FONT_HEIGHT
 from ..krux_settings import t
@@ -35,6 +34,7 @@ from ..input import (
     FAST_BACKWARD,
 )
 from ..key import Key
+from ..bip39 import WORDINDEX, WORDLIST_PREFIXES, PrefixIndex
 from ..kboard import kboard
 
 GO_INDEX = 25
@@ -56,69 +56,23 @@ class MnemonicEditor(Page):
             self.current_mnemonic = self.initial_mnemonic.copy()
         self.mnemonic_length = len(self.current_mnemonic)
         self.header_offset = DEFAULT_PADDING
-        self.search_ranges = {}
-
-    def compute_search_ranges(self, alt_wordlist=None):
-        """Compute search ranges for the autocomplete and possible_letters functions"""
-        if alt_wordlist:
-            wordlist = alt_wordlist
-        else:
-            wordlist = WORDLIST
-        search_ranges = {}
-        i = 0
-        while i < len(wordlist):
-            start_word = wordlist[i]
-            start_letter = start_word[0]
-            j = i + 1
-            while j < len(wordlist):
-                end_word = wordlist[j]
-                end_letter = end_word[0]
-                if end_letter != start_letter:
-                    search_ranges[start_letter] = (i, j)
-                    i = j - 1
-                    break
-                j += 1
-            if start_letter not in search_ranges:
-                search_ranges[start_letter] = (i, j)
-            i += 1
-        self.search_ranges = search_ranges
+        self.alt_prefixes = None
 
     def autocomplete(self, prefix, alt_wordlist=None):
         """Autocomplete a word"""
-        if alt_wordlist:
-            wordlist = alt_wordlist
-            self.compute_search_ranges(wordlist)
-        else:
-            wordlist = WORDLIST
-        if len(prefix) > 0:
-            letter = prefix[0]
-            start, stop = self.search_ranges[letter]
-            matching_words = list(
-                filter(
-                    lambda word: word.startswith(prefix),
-                    wordlist[start:stop],
-                )
-            )
-            if len(matching_words) == 1:
-                return matching_words[0]
-        return None
+        return self._prefix_index(alt_wordlist).completion(prefix)
 
     def possible_letters(self, prefix, alt_wordlist=None):
         """Possible next letters for a BIP39 word given a prefix"""
-        if alt_wordlist:
-            wordlist = alt_wordlist
-            self.compute_search_ranges(wordlist)
-        else:
-            wordlist = WORDLIST
-        if len(prefix) == 0:
-            return self.search_ranges.keys()
-        letter = prefix[0]
-        start, stop = self.search_ranges[letter]
-        return {
-            word[len(prefix)]
-            for word in wordlist[start:stop]
-            if word.startswith(prefix) and len(word) > len(prefix)
-        }
+        return self._prefix_index(alt_wordlist).next_letters(prefix)
+
+    def _prefix_index(self, alt_wordlist=None):
+        """Returns the prefix index of the wordlist in use"""
+        if not alt_wordlist:
+            return WORDLIST_PREFIXES
+        if self.alt_prefixes is None or self.alt_prefixes.wordlist is not alt_wordlist:
+            self.alt_prefixes = PrefixIndex(alt_wordlist)
+        return self.alt_prefixes
 
     def calculate_checksum(self):
         """Recalculate the checksum of the mnemonic"""
@@ -265,7 +219,6 @@ class MnemonicEditor(Page):
         word_txt = str(index + 1) + ". " + self.current_mnemonic[index]
         self.flash_text(word_txt)
         while True:
-            self.compute_search_ranges()
             # if new and last word, lead input to a valid mnemonic
             if self.new_mnemonic and index == self.mnemonic_length - 1:
                 final_words = Key.get_final_word_candidates(self.current_mnemonic[:-1])
@@ -284,7 +237,7 @@ class MnemonicEditor(Page):
                 )
             if word == ESC_KEY:
                 return None
-            if word in WORDLIST:
+            if word in WORDINDEX:
                 return word
             word = ""
 
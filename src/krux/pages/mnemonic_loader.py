@@ -36,6 +36,7 @@ from . import (
 from ..display import BOTTOM_PROMPT_LINE
 from ..qr import FORMAT_UR
 from ..key import Key
+from ..bip39 import WORDLIST_PREFIXES
 from ..krux_settings import t
 
 
@@ -130,7 +131,6 @@ class MnemonicLoader(Page):
             title = t("Enter each word of your BIP39 mnemonic.")
 
         mnemonic_editor = MnemonicEditor(self.ctx)
-        mnemonic_editor.compute_search_ranges()
 
         return self._load_key_from_keypad(
             title,
@@ -492,15 +492,11 @@ class MnemonicLoader(Page):
         """Ensure all words are in the wordlist, autocomplete if possible"""
         for i, word in enumerate(words):
             if word not in WORDLIST:
-                word_lower = word.lower()
-                # Try to autocomplete the word
-                auto_complete = False
-                for list_word in WORDLIST:
-                    if list_word.startswith(word_lower):
-                        words[i] = list_word
-                        auto_complete = True
-                        break
-                if not auto_complete:
+                # Try to autocomplete the word with the first one it prefixes
+                start, end = WORDLIST_PREFIXES.prefix_range(word.lower())
+                if start < end:
+                    words[i] = WORDLIST[start]
+                else:
                     # Mark as invalid and clear the words list to indicate failure
                     return []
         return words
@@ -35,6 +35,10 @@ ANTI_GLARE_WAIT_TIME = 500
 MESSAGE_DISPLAY_PERIOD = 5000
 PROGRESS_BAR_HEIGHT = 15
 
+# Margin added around the last codes found, as a fraction of their size,
+# where the next frame is searched first
+ROI_PADDING_RATIO = 0.5
+
 
 class QRCodeCapture(Page):
     """UI to capture an encryption key"""
@@ -45,6 +49,14 @@ class QRCodeCapture(Page):
         self.progress_bar_offset_y = {"cube": 225, "m5stickv": 210, "amigo": 380}.get(
             board.config["type"], 305
         )
+        # Frames with codes, by whether they brought any new payload
+        self.unique_frames = 0
+        self.duplicate_frames = 0
+        # Region of the frame where a single code was last found, and how
+        # often the next frame's codes were found there
+        self.roi = None
+        self.roi_hits = 0
+        self.roi_misses = 0
 
     def light_control(self):
         """Controls the light based on the user input"""
@@ -72,6 +84,8 @@ class QRCodeCapture(Page):
                 theme.bg_color,
             )
             self.ctx.display.draw_centered_text(t("Zoomed mode"))
+        # Codes will be elsewhere on the new camera framing
+        self.roi = None
         time.sleep_ms(ANTI_GLARE_WAIT_TIME)
         # Erase the message from the screen
         self.ctx.display.fill_rectangle(
@@ -84,6 +98,41 @@ class QRCodeCapture(Page):
         self.ctx.display.to_landscape()
         self.ctx.input.reset_ios_state()
 
+    def roi_hit_rate(self):
+        """Returns the fraction of tracked frames whose codes were found
+        within the region of interest"""
+        tracked = self.roi_hits + self.roi_misses
+        return self.roi_hits / tracked if tracked else 0
+
+    def track_roi(self, img, code):
+        """Sets the region of interest to the padded rectangle of code"""
+        x, y, w, h = code.rect()
+        padding = int(max(w, h) * ROI_PADDING_RATIO)
+        left = max(0, x - padding)
+        top = max(0, y - padding)
+        right = min(img.width(), x + w + padding)
+        bottom = min(img.height(), y + h + padding)
+        self.roi = (left, top, right - left, bottom - top)
+
+    def find_qrcodes(self, img):
+        """Searches for codes around where a single code was last found, then
+        on the whole frame if none was found there. Frames with several codes
+        are not tracked, as their codes may be anywhere on the next frame
+        """
+        res = None
+        if self.roi is not None:
+            res = img.find_qrcodes(roi=self.roi)
+            if res:
+                self.roi_hits += 1
+            else:
+                self.roi_misses += 1
+        if not res:
+            res = img.find_qrcodes()
+        self.roi = None
+        if res and len(res) == 1:
+            self.track_roi(img, res[0])
+        return res
+
     def update_progress_ur(self, parser, color):
         """Fill the progress bar according to FORMAT_UR"""
         self.ctx.display.to_portrait()
@@ -97,20 +146,24 @@ class QRCodeCapture(Page):
 
         self.ctx.display.to_landscape()
 
-    def update_progress_other(self, parser, index, previous_index):
-        """Updates the progress bar for pMofN and BBQR"""
+    def update_progress_other(self, parser, indexes, previous_indexes):
+        """Updates the progress bar for pMofN and BBQR, highlighting the parts
+        just captured"""
         self.ctx.display.to_portrait()
 
         block_size = self.ctx.display.width() / parser.total_count()
-        fill_size = int(block_size * (index + 1)) - int(block_size * index)
-        self.ctx.display.fill_rectangle(
-            int(block_size * index),
-            self.progress_bar_offset_y,
-            fill_size,
-            PROGRESS_BAR_HEIGHT,
-            theme.highlight_color,
-        )
-        if previous_index is not None:
+        for index in indexes:
+            fill_size = int(block_size * (index + 1)) - int(block_size * index)
+            self.ctx.display.fill_rectangle(
+                int(block_size * index),
+                self.progress_bar_offset_y,
+                fill_size,
+                PROGRESS_BAR_HEIGHT,
+                theme.highlight_color,
+            )
+        for previous_index in previous_indexes:
+            if previous_index in indexes:
+                continue
             fill_size = int(block_size * (previous_index + 1)) - int(
                 block_size * previous_index
             )
@@ -124,8 +177,33 @@ class QRCodeCapture(Page):
 
         self.ctx.display.to_landscape()
 
+    def parse_codes(self, parser, codes):
+        """Feeds every code found in a frame to the parser, skipping payloads
+        seen recently and, among several codes, those not part of the series.
+        Returns the new part indexes, or None if every payload was a duplicate
+        """
+        new_parts = []
+        unique = False
+        for code in codes:
+            data = code.payload()
+            # Skip payloads still on screen from previous frames
+            if parser.is_duplicate(data):
+                continue
+            unique = True
+            if len(codes) > 1 and not parser.accepts(data):
+                continue
+            new_part = parser.parse(data)
+            if new_part is not None and new_part not in new_parts:
+                new_parts.append(new_part)
+            if parser.is_complete():
+                break
+        return new_parts if unique else None
+
     def qr_capture_loop(self):
-        """Captures either singular or animated QRs and parses their contents"""
+        """Captures either singular or animated QRs and parses their contents.
+        Every code found in a frame is parsed, so parts torn across a frame or
+        printed side by side are all captured
+        """
 
         self.ctx.display.clear()
         self.ctx.display.draw_centered_text(t("Loading Camera…"))
@@ -133,9 +211,14 @@ class QRCodeCapture(Page):
 
         parser = QRPartParser()
         prev_parsed_count = 0
-        new_part = None
-        previous_part = None
+        new_parts = []
+        previous_parts = []
         ur_highlighted = False
+        self.unique_frames = 0
+        self.duplicate_frames = 0
+        self.roi = None
+        self.roi_hits = 0
+        self.roi_misses = 0
 
         # Flush events ocurred while loading camera
         self.ctx.input.reset_ios_state()
@@ -170,15 +253,15 @@ class QRCodeCapture(Page):
             ):
                 break
 
-            if new_part is not None and new_part != previous_part:
+            if new_parts and new_parts != previous_parts:
                 if parser.format == FORMAT_UR:
                     self.update_progress_ur(parser, theme.highlight_color)
                     ur_highlighted = True
-                    previous_part = None
+                    previous_parts = []
                 else:
-                    self.update_progress_other(parser, new_part, previous_part)
-                    previous_part = new_part
-                new_part = None
+                    self.update_progress_other(parser, new_parts, previous_parts)
+                    previous_parts = new_parts
+                new_parts = []
             elif ur_highlighted:
                 self.update_progress_ur(parser, theme.fg_color)
                 ur_highlighted = False
@@ -189,17 +272,21 @@ class QRCodeCapture(Page):
             else:
                 self.ctx.display.render_image(img)
 
-            res = img.find_qrcodes()
+            res = self.find_qrcodes(img)
             if res:
-                data = res[0].payload()
-                new_part = parser.parse(data)
-
+                new_parts = self.parse_codes(parser, res)
+                if new_parts is None:
+                    # Every payload was already parsed from previous frames
+                    new_parts = []
+                    self.duplicate_frames += 1
+                    continue
+                self.unique_frames += 1
                 if (
                     parser.format == FORMAT_UR
                     and parser.processed_parts_count() > prev_parsed_count
                 ):
                     prev_parsed_count = parser.processed_parts_count()
-                    new_part = True
+                    new_parts = [True]
 
             if parser.is_complete():
                 break
@@ -21,7 +21,7 @@
 # THE SOFTWARE.
 
 import qrcode
-from embit.wordlists.bip39 import WORDLIST
+from ..bip39 import WORDINDEX
 from . import Page, Menu, MENU_CONTINUE, MENU_EXIT, ESC_KEY
 from ..themes import theme, WHITE, BLACK, DARKGREY
 from ..krux_settings import t
@@ -77,7 +77,7 @@ class SeedQRView(Page):
         words = self.ctx.wallet.key.mnemonic.split(" ")
         numbers = ""
         for word in words:
-            numbers += str("%04d" % WORDLIST.index(word))
+            numbers += str("%04d" % WORDINDEX[word])
         return qrcode.encode(numbers)  # pylint: disable=E1101
 
     def _binary_seed_qr(self):
@@ -87,7 +87,7 @@ class SeedQRView(Page):
     def _to_compact_seed_qr(self, mnemonic):
         mnemonic = mnemonic.split(" ")
         checksum_bits = 8 if len(mnemonic) == 24 else 4
-        indexes = [WORDLIST.index(word) for word in mnemonic]
+        indexes = [WORDINDEX[word] for word in mnemonic]
         bitstring = "".join(["{:0>11}".format(bin(index)[2:]) for index in indexes])[
             :-checksum_bits
         ]
@@ -290,41 +290,22 @@ class SeedQRView(Page):
 
     def add_frame(self, binary_image, size):
         """Adds a 1 block frame to QR codes"""
-        new_size = size + 2
-        # Create a new bytearray to store the framed image
-        framed_image = bytearray(b"\x00" * ((new_size * new_size + 7) >> 3))
-        # Copy the original image into the center of the framed image
-        for y in range(0, size):
-            for x in range(0, size):
-                original_index = y * size + x
-                original_bit = (
-                    binary_image[original_index >> 3] >> (original_index % 8)
-                ) & 1
-                if original_bit:
-                    framed_index = (y + 1) * new_size + x + 1
-                    framed_image[framed_index >> 3] |= 1 << (framed_index % 8)
-
-        return framed_image, new_size
+        from ..bit_matrix import frame
+
+        return frame(binary_image, size)
 
     def save_pbm_image(self, file_name):
         """Saves QR code image as compact B&W bitmap format file"""
         from ..sd_card import PBM_IMAGE_EXTENSION
+        from ..bit_matrix import get_row, row_msb_bytes
         from .file_operations import SaveFile
 
         code, size = self.add_frame(self.code, self.qr_size)
         pbm_data = bytearray()
         pbm_data.extend(("P4\n{0} {0}\n".format(size)).encode())
+        row_bytes = bytearray((size + 7) >> 3)
         for row in range(size):
-            byte = 0
-            for col in range(size):
-                bit_index = row * size + col
-                if code[bit_index >> 3] & (1 << (bit_index % 8)):
-                    byte |= 1 << (7 - (col % 8))
-
-                # If we filled a byte or reached the end of the row, append it
-                if col % 8 == 7 or col == size - 1:
-                    pbm_data.append(byte)
-                    byte = 0
+            pbm_data.extend(row_msb_bytes(get_row(code, size, row), size, row_bytes))
 
         save_page = SaveFile(self.ctx)
         save_page.save_file(
@@ -338,6 +319,7 @@ class SeedQRView(Page):
     def save_bmp_image(self, file_name, resolution):
         """Save QR code image as .bmp file"""
         from ..sd_card import SDHandler, BMP_IMAGE_EXTENSION
+        from ..bit_matrix import get_row, row_runs
         from .file_operations import SaveFile
 
         try:
@@ -350,14 +332,12 @@ class SeedQRView(Page):
 
                 code, size = self.add_frame(self.code, self.qr_size)
                 raw_image = image.Image(size=(size, size))
-                for y_index in range(0, size):
-                    for x_index in range(0, size):
-                        index = y_index * size + x_index
-                        bit_value = (code[index >> 3] >> (index % 8)) & 1
-                        if bit_value:
-                            raw_image.set_pixel((x_index, y_index), lcd.BLACK)
-                        else:
-                            raw_image.set_pixel((x_index, y_index), lcd.WHITE)
+                raw_image.draw_rectangle(0, 0, size, size, lcd.WHITE, fill=True)
+                for y_index in range(size):
+                    for x_index, length in row_runs(get_row(code, size, y_index)):
+                        raw_image.draw_line(
+                            x_index, y_index, x_index + length - 1, y_index, lcd.BLACK
+                        )
                 bmp_img = image.Image(size=(resolution, resolution), copy_to_fb=True)
                 scale = resolution // size
                 bmp_img.draw_image(
@@ -385,6 +365,7 @@ class SeedQRView(Page):
     def save_svg_image(self, file_name):
         """Save QR code image as .svg file"""
         from ..sd_card import SVG_IMAGE_EXTENSION
+        from ..bit_matrix import get_row, row_runs
         from .file_operations import SaveFile
 
         self.ctx.display.clear()
@@ -407,21 +388,20 @@ class SeedQRView(Page):
         )
 
         # create squares for each bit in the QR code
-        for y_index in range(0, size):
-            for x_index in range(0, size):
-                index = y_index * size + x_index
-                bit_value = (code[index >> 3] >> (index % 8)) & 1
-                if bit_value:
-                    x = x_index * scale
-                    y = y_index * scale
-                    scale_x = scale
-                    scale_y = scale
-                    square = 'x="{}" y="{}" width="{}" height="{}"'.format(
-                        x, y, scale_x, scale_y
+        svg_rects = []
+        for y_index in range(size):
+            y = y_index * scale
+            for run_x, length in row_runs(get_row(code, size, y_index)):
+                for x_index in range(run_x, run_x + length):
+                    square = 'x="{x}" y="{y}" width="{s}" height="{s}"'.format(
+                        x=x_index * scale, y=y, s=scale
                     )
-                    svg_data += '<rect stroke="black" stroke-width="0" {} fill="black"/>\n'.format(
-                        square
+                    svg_rects.append(
+                        '<rect stroke="black" stroke-width="0" {} fill="black"/>\n'.format(
+                            square
+                        )
                     )
+        svg_data += "".join(svg_rects)
 
         # close the SVG tag
         svg_data += "</svg>"
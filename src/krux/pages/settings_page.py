@@ -43,6 +43,7 @@ from ..krux_settings import (
 )
 from ..input import BUTTON_ENTER, BUTTON_PAGE, BUTTON_PAGE_PREV, BUTTON_TOUCH
 from ..sd_card import SDHandler
+from .. import flash_occupancy
 from . import (
     Page,
     Menu,
@@ -131,6 +132,7 @@ class SettingsPage(Page):
             try:
                 # Delete settings from flash
                 os.remove("/%s/%s" % (FLASH_PATH, SETTINGS_FILENAME))
+                flash_occupancy.invalidate()
             except:
                 pass
             self.ctx.power_manager.reboot()
@@ -186,6 +188,7 @@ class SettingsPage(Page):
         # Saves the stretched Tamper Check Code in a file
         with open(TC_CODE_PATH, "wb") as f:
             f.write(secret)
+        flash_occupancy.invalidate()
         self.ctx.tc_code_enabled = True
         self.flash_text(t("Tamper check code set successfully"))
 
@@ -401,6 +404,13 @@ class SettingsPage(Page):
             locale_control.load_locale(new_category)
         elif setting.attr == "theme":
             theme.update()
+        elif setting.attr == "key_cache":
+            from krux import kef
+
+            if new_category:
+                kef.key_cache.enable()
+            else:
+                kef.key_cache.clear(disable=True)
         # Update screen in case orientation has changed
         elif setting.attr == "flipped_orientation":
             self.ctx.display.to_landscape()
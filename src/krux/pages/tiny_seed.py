@@ -25,6 +25,7 @@ import image
 import sensor
 import time
 from embit.wordlists.bip39 import WORDLIST
+from ..bip39 import WORDINDEX
 from . import Page, FLASH_MSG_TIME
 from ..themes import theme
 from ..wdt import wdt
@@ -132,7 +133,7 @@ class TinySeed(Page):
         is_word_list = isinstance(words[0], str)
         for row in range(12):
             if is_word_list:
-                word_list_index = WORDLIST.index(words[page * 12 + row]) + 1
+                word_list_index = WORDINDEX[words[page * 12 + row]] + 1
             else:
                 word_list_index = words[page * 12 + row]
             for bit in range(12):
@@ -210,7 +211,7 @@ class TinySeed(Page):
             y = grid_y_offset
             for row in range(12):
                 if isinstance(words[0], str):
-                    word_list_index = WORDLIST.index(words[page * 12 + row]) + 1
+                    word_list_index = WORDINDEX[words[page * 12 + row]] + 1
                 else:
                     word_list_index = words[page * 12 + row]
                 for col in range(12):
@@ -101,14 +101,13 @@ class GCodeGenerator(Printer):
     def print_qr_code(self, qr_code):
         """Prints a QR code, scaling it up as large as possible"""
         from ..qr import get_size
-
-        size = 0
+        from ..bit_matrix import get_row, frame
 
         size = get_size(qr_code)
 
-        # If inverted we add two columns and two rows to cut a border.
+        # If inverted we add a light frame so its border is cut as well.
         if self.invert:
-            size += 2
+            qr_code, size = frame(qr_code, size)
 
         cell_size = (self.part_size - (self.border_padding * 2)) / size
 
@@ -126,31 +125,16 @@ class GCodeGenerator(Printer):
 
         num_passes = math.ceil(self.cut_depth / self.pass_depth)
         for p in range(num_passes):
+            plunge_depth = min((p + 1) * self.pass_depth, self.cut_depth)
             for row in range(size):
+                # Reversing row so milling goes from top to bottom
+                reversed_row = size - 1 - row
+                row_value = get_row(qr_code, size, row)
+                if self.invert:
+                    row_value ^= (1 << size) - 1
                 for col in range(size):
-                    plunge_depth = min((p + 1) * self.pass_depth, self.cut_depth)
-                    # Reversing row so milling goes from top to bottom
-                    reversed_row = size - 1 - row
-                    if self.invert and row == 0:
+                    if row_value & (1 << col):
                         self.cut_cell(col, reversed_row, cell_size, plunge_depth)
-                    elif self.invert and row == (size - 1):
-                        self.cut_cell(col, 0, cell_size, plunge_depth)
-                    elif self.invert and col == 0:
-                        self.cut_cell(0, reversed_row, cell_size, plunge_depth)
-                    elif self.invert and col == (size - 1):
-                        self.cut_cell(size - 1, reversed_row, cell_size, plunge_depth)
-                    else:
-                        # If inverted we need to calculate based on original qr code array size.
-                        if self.invert:
-                            bit_index = (row - 1) * (size - 2) + (col - 1)
-                        else:
-                            bit_index = row * size + col
-                        bit = qr_code[bit_index >> 3] & (1 << (bit_index % 8))
-                        cut = (bit > 0 and not self.invert) or (
-                            bit == 0 and self.invert
-                        )
-                        if cut:
-                            self.cut_cell(col, reversed_row, cell_size, plunge_depth)
 
     # We could optimize by milling rows instead of cell by cell,
     # but this would not allow the use of drill bits
@@ -116,6 +116,7 @@ class AdafruitPrinter(Printer):
     def print_qr_code(self, qr_code):
         """Prints a QR code, scaling it up as large as possible"""
         from ..qr import get_size
+        from ..bit_matrix import get_row, scale_row, scale_table, row_msb_bytes
 
         size = get_size(qr_code)
 
@@ -126,25 +127,12 @@ class AdafruitPrinter(Printer):
 
         line_bytes_size = (size * scale + 7) // 8  # amount of bytes per line
         self.set_bitmap_mode(line_bytes_size, size * scale, 3)
+        table = scale_table(scale)
         for row in range(size):
-            byte = 0
-            line_bytes = bytearray()
-            for col in range(size):
-                bit_index = row * size + col
-                bit = qr_code[bit_index >> 3] & (1 << (bit_index % 8))
-                for i in range(scale):
-                    byte <<= 1
-                    if bit:
-                        byte |= 1
-                    end_line = col == size - 1 and i == scale - 1
-                    shift_index = (col * scale + i) % 8
-                    # If we filled a byte or reached the end of the row, append it
-                    if shift_index == 7 or end_line:
-                        if end_line:
-                            # Shift pending bits if on last byte of row
-                            byte <<= 7 - shift_index
-                        line_bytes.append(byte)
-                        byte = 0
+            line_bytes = row_msb_bytes(
+                scale_row(get_row(qr_code, size, row), size, scale, table),
+                size * scale,
+            )
             for _ in range(scale):
                 self.uart_conn.write(line_bytes)
                 time.sleep_ms(self.dot_print_time)
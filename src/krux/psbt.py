@@ -20,7 +20,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 import gc
+import os
 from embit.psbt import PSBT, CompressMode
+from embit.psbtview import PSBTView, read_write
+from embit.transaction import SIGHASH
 from ur.ur import UR
 import urtypes
 from urtypes.crypto import CRYPTO_PSBT
@@ -41,6 +44,9 @@ BTC_SYMBOL = "₿"
 
 MAX_POLICY_COSIGNERS_DISPLAYED = 5
 
+# Binary PSBT files from this size on are signed straight from the SD card
+STREAM_SIGN_MIN_SIZE = 16 * 1024
+
 
 class Counter(dict):
     """Helper class for dict"""
@@ -50,6 +56,116 @@ class Counter(dict):
         return self.get(key, 0)
 
 
+class PSBTAnalysis:
+    """Analysis of a PSBT shared by validation, review and signing"""
+
+    def __init__(self):
+        self.psbt = None
+        self.xpubs = None
+        self.input_policies = None
+        self.input_derivations = {}
+        self.output_classes = None
+
+    def clear(self, psbt=None):
+        """Drops all cached results, starting over for psbt"""
+        self.psbt = psbt
+        self.xpubs = None
+        self.input_policies = None
+        self.input_derivations = {}
+        self.output_classes = None
+
+
+class StreamSigningView(PSBTView):
+    """PSBTView that reads scopes in a single pass and signs one at a time"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scope = None
+        self.scope_index = None
+        self.utxo_values = None
+        self.utxo_scripts = None
+
+    def scopes(self, outputs=False, compress=None):
+        """Yields the input or output scopes in order, reading the stream once"""
+        if compress is None:
+            compress = self.compress
+        count = self.num_outputs if outputs else self.num_inputs
+        offset = self.seek_to_scope(self.num_inputs if outputs else 0)
+        for i in range(count):
+            # Reading the global tx moves the stream, seek back to the scope
+            if outputs:
+                vout = self.tx.vout(i) if self.tx else None
+                self.stream.seek(offset)
+                scope = self.PSBTOUT_CLS.read_from(
+                    self.stream, vout=vout, compress=compress
+                )
+            else:
+                vin = self.tx.vin(i) if self.tx else None
+                self.stream.seek(offset)
+                scope = self.PSBTIN_CLS.read_from(
+                    self.stream, vin=vin, compress=compress
+                )
+            offset = self.stream.tell()
+            yield scope
+
+    def xpubs(self):
+        """Returns the global xpubs mapped to their derivations"""
+        from embit.bip32 import HDKey
+        from embit.psbt import DerivationPath, read_string, skip_string
+
+        xpubs = {}
+        self.seek_to_scope(None)
+        while True:
+            key = read_string(self.stream)
+            if not key:
+                break
+            if key[0] == 0x01:
+                xpubs[HDKey.parse(key[1:])] = DerivationPath.parse(
+                    read_string(self.stream)
+                )
+            else:
+                skip_string(self.stream)
+        return xpubs
+
+    def input(self, i, compress=None):
+        """Returns the scope being signed instead of parsing it again"""
+        if i == self.scope_index:
+            return self.scope
+        return super().input(i, compress)
+
+    def sighash(self, i, sighash=SIGHASH.ALL, input_scope=None, **kwargs):
+        """Taproot sighash reading all spent UTXOs only once per PSBT"""
+        inp = self.input(i) if input_scope is None else input_scope
+        if not inp.is_taproot:
+            return super().sighash(i, sighash, input_scope=inp, **kwargs)
+        if self.utxo_values is None:
+            self.utxo_values = []
+            self.utxo_scripts = []
+            for scope in self.scopes(compress=CompressMode.CLEAR_ALL):
+                self.utxo_values.append(scope.utxo.value)
+                self.utxo_scripts.append(scope.utxo.script_pubkey)
+        return self.sighash_taproot(
+            i,
+            script_pubkeys=self.utxo_scripts,
+            values=self.utxo_values,
+            sighash=sighash,
+            **kwargs,
+        )
+
+    def sign_input_with_tapkey(
+        self, key, input_index, inp=None, sighash=SIGHASH.DEFAULT
+    ):
+        """Signs a taproot input, keeping a key path signature in its own field
+        too, as PSBT.sign_with does
+        """
+        inp = inp or self.input(input_index)
+        witness = inp.final_scriptwitness
+        counter = super().sign_input_with_tapkey(key, input_index, inp, sighash)
+        if inp.final_scriptwitness is not witness and hasattr(inp, "taproot_key_sig"):
+            inp.taproot_key_sig = inp.final_scriptwitness.items[0]
+        return counter
+
+
 class PSBTSigner:
     """Responsible for validating and signing PSBTs"""
 
@@ -60,6 +176,9 @@ class PSBTSigner:
         self.qr_format = qr_format
         self.policy = None
         self.is_b64_file = False
+        self.file_path = None
+        self.fill_fingerprints = False
+        self.analysis = PSBTAnalysis()
 
         # Parse the PSBT
         if psbt_filename:
@@ -67,29 +186,33 @@ class PSBTSigner:
             from .settings import SD_PATH
 
             file_path = "/%s/%s" % (SD_PATH, psbt_filename)
-            try:
-                with open(file_path, "rb") as file:
-                    self.psbt = PSBT.read_from(file)
-                self.validate()
-            except:
+            self.file_path = file_path
+            if self._streamable_file():
+                # Large binary PSBTs are read from SD scope by scope as needed
+                self.psbt = None
+            else:
                 try:
-                    self.policy = None  # Reset policy
-                    self.is_b64_file = self.file_is_base64_encoded(file_path)
-                    if self.is_b64_file:
-                        # BlueWallet exports PSBTs as base64 encoded files
-                        # So it will be decoded and loaded uncompressed
-                        with open(file_path, "r") as file:
-                            psbt_data = file.read()
-                        self.psbt = PSBT.parse(base_decode(psbt_data, 64))
-                    else:
-                        # Try to load the PSBT in compressed mode
-                        with open(file_path, "rb") as file:
-                            file.seek(0)  # Reset the file pointer to the beginning
-                            self.psbt = PSBT.read_from(
-                                file, compress=CompressMode.CLEAR_ALL
-                            )
-                except Exception as e:
-                    raise ValueError("Error loading PSBT file: %s" % e)
+                    self.psbt = self._read_file(file_path)
+                    self.validate()
+                except:
+                    try:
+                        self.policy = None  # Reset policy
+                        self.is_b64_file = self.file_is_base64_encoded(file_path)
+                        if self.is_b64_file:
+                            # BlueWallet exports PSBTs as base64 encoded files
+                            # So it will be decoded and loaded uncompressed
+                            with open(file_path, "r") as file:
+                                psbt_data = file.read()
+                            self.psbt = PSBT.parse(base_decode(psbt_data, 64))
+                        else:
+                            # Try to load the PSBT in compressed mode
+                            with open(file_path, "rb") as file:
+                                file.seek(0)  # Reset the file pointer to the beginning
+                                self.psbt = PSBT.read_from(
+                                    file, compress=CompressMode.CLEAR_ALL
+                                )
+                    except Exception as e:
+                        raise ValueError("Error loading PSBT file: %s" % e)
             self.base_encoding = 64  # In case it is exported as QR code
         elif isinstance(psbt_data, UR):
             try:
@@ -146,24 +269,47 @@ class PSBTSigner:
             except Exception:
                 return False
 
+    def _read_file(self, file_path):
+        """Reads a binary PSBT file, reading it again in compressed mode if
+        it does not fit in memory
+        """
+        try:
+            with open(file_path, "rb") as file:
+                return PSBT.read_from(file)
+        except MemoryError:
+            gc.collect()
+            with open(file_path, "rb") as file:
+                return PSBT.read_from(file, compress=CompressMode.CLEAR_ALL)
+
+    def _streamable_file(self):
+        """Whether the PSBT file is binary and large enough to be read from SD
+        as needed instead of being loaded whole
+        """
+        try:
+            if os.stat(self.file_path)[6] < STREAM_SIGN_MIN_SIZE:
+                return False
+            with open(self.file_path, "rb") as file:
+                return file.read(len(PSBTView.MAGIC)) == PSBTView.MAGIC
+        except OSError:
+            return False
+
+    def _scopes(self, outputs=False):
+        """Yields the PSBT input or output scopes, read one at a time from SD
+        if the PSBT is not loaded
+        """
+        if self.psbt is not None:
+            yield from self.psbt.outputs if outputs else self.psbt.inputs
+            return
+        with open(self.file_path, "rb") as file:
+            for scope in StreamSigningView.view(file).scopes(outputs):
+                if self.fill_fingerprints:
+                    self._fill_zero_fingerprint_scope(scope)
+                yield scope
+
     def validate(self):
         """Validates the PSBT"""
         # From: https://github.com/diybitcoinhardware/embit/blob/master/examples/change.py#L110
-        xpubs = []
-        origin_less_xpub = None
-        try:
-            xpubs, origin_less_xpub = self.xpubs()
-        except:
-            # Expected to fail to get xpubs from Miniscript PSBT
-            pass
-        for inp in self.psbt.inputs:
-            # get policy of the input
-            try:
-                inp_policy = self.get_policy_from_psbt_input(
-                    inp, xpubs, origin_less_xpub
-                )
-            except:
-                raise ValueError("Unable to get policy")
+        for inp_policy in self.input_policies():
             # if policy is None - assign current
             if self.policy is None:
                 self.policy = inp_policy
@@ -188,6 +334,70 @@ class PSBTSigner:
             if self.wallet.policy != self.policy:
                 raise ValueError("policy mismatch")
 
+    def _analysis(self):
+        """Returns the cached PSBT analysis, dropped if the PSBT was replaced"""
+        if self.analysis.psbt is not self.psbt:
+            self.analysis.clear(self.psbt)
+        return self.analysis
+
+    def cached_xpubs(self):
+        """Returns xpubs() resolved once per PSBT, or empty if unavailable"""
+        analysis = self._analysis()
+        if analysis.xpubs is None:
+            try:
+                analysis.xpubs = self.xpubs()
+            except:
+                # Expected to fail to get xpubs from Miniscript PSBT
+                analysis.xpubs = ([], None)
+        return analysis.xpubs
+
+    def input_policies(self):
+        """Returns the policy of each PSBT input, computed once"""
+        analysis = self._analysis()
+        if analysis.input_policies is None:
+            xpubs, origin_less_xpub = self.cached_xpubs()
+            policies = []
+            for inp in self._scopes():
+                try:
+                    policies.append(
+                        self.get_policy_from_psbt_input(inp, xpubs, origin_less_xpub)
+                    )
+                except:
+                    raise ValueError("Unable to get policy")
+            analysis.input_policies = policies
+        return analysis.input_policies
+
+    def input_derivations(self):
+        """Returns (pubkey, DerivationPath) pairs of each input for the PSBT policy"""
+        analysis = self._analysis()
+        policy_type = self.policy["type"]
+        if policy_type not in analysis.input_derivations:
+            derivations_list = []
+            for inp in self._scopes():
+                if policy_type == P2TR:
+                    derivations = inp.taproot_bip32_derivations
+                    pairs = [(pub, derivations[pub][1]) for pub in derivations]
+                else:
+                    derivations = inp.bip32_derivations
+                    pairs = [(pub, derivations[pub]) for pub in derivations]
+                derivations_list.append(pairs)
+            analysis.input_derivations[policy_type] = derivations_list
+        return analysis.input_derivations[policy_type]
+
+    def output_classes(self):
+        """Returns (policy type, output type) of each PSBT output, computed once"""
+        analysis = self._analysis()
+        if analysis.output_classes is None:
+            xpubs, origin_less_xpub = self.cached_xpubs()
+            classes = []
+            for out in self._scopes(outputs=True):
+                out_policy = get_policy(out, out.script_pubkey, xpubs, origin_less_xpub)
+                classes.append(
+                    (out_policy["type"], self._classify_output(out_policy, out))
+                )
+            analysis.output_classes = classes
+        return analysis.output_classes
+
     def get_policy_from_psbt_input(self, tx_input, xpubs, origin_less_xpub=None):
         """Extracts the scriptPubKey from an input's UTXO and determines the policy."""
         if tx_input.witness_utxo:
@@ -204,26 +414,14 @@ class PSBTSigner:
         """Verifies if the PSBT key path matches loaded keys's derivation path"""
         mismatched_paths = []
         der_path_nodes = len(self.wallet.key.derivation.split("/")) - 1
-        for _input in self.psbt.inputs:
-            if self.policy["type"] == P2TR:
-                derivations = _input.taproot_bip32_derivations
-            else:
-                derivations = _input.bip32_derivations
-            for pubkey in derivations:
+        for derivations in self.input_derivations():
+            for _, derivation in derivations:
                 # Checks if fingerprint belongs to loaded key
-                if self.policy["type"] == P2TR:
-                    fingerprint = derivations[pubkey][1].fingerprint
-                else:
-                    fingerprint = derivations[pubkey].fingerprint
-                if fingerprint != self.wallet.key.fingerprint:
+                if derivation.fingerprint != self.wallet.key.fingerprint:
                     # Not our key, won't check derivation path mismatch
                     continue
-                if self.policy["type"] == P2TR:
-                    derivation_path = derivations[pubkey][1].derivation
-                else:
-                    derivation_path = derivations[pubkey].derivation
                 textual_path = "m"
-                for index in derivation_path[:der_path_nodes]:
+                for index in derivation.derivation[:der_path_nodes]:
                     if index >= 2**31:
                         textual_path += "/{}h".format(index - 2**31)
                     else:
@@ -280,7 +478,9 @@ class PSBTSigner:
 
         return prefix + BTC_SYMBOL + THIN_SPACE + "%s" % format_btc(amount)
 
-    def _get_resume_fee(self, inp_amount, out_amount, output_policy_count):
+    def _get_resume_fee(
+        self, inp_amount, out_amount, output_policy_count, num_inputs, num_outputs
+    ):
         from .format import replace_decimal_separator
 
         fee = inp_amount - out_amount
@@ -302,8 +502,8 @@ class PSBTSigner:
             satvb = fee / SatsVB.get_vbytes(
                 self.policy,
                 output_policy_count,
-                len(self.psbt.inputs),
-                len(self.psbt.outputs),
+                num_inputs,
+                num_outputs,
             )
             resume_fee_str += (" ~%.1f" % satvb) + " sat/vB"
 
@@ -324,16 +524,16 @@ class PSBTSigner:
         """Returns a list of messages describing where amounts are going"""
 
         inp_amount = 0
-        for inp in self.psbt.inputs:
+        num_inputs = 0
+        for inp in self._scopes():
+            num_inputs += 1
             if inp.witness_utxo:
                 inp_amount += inp.witness_utxo.value
             elif inp.non_witness_utxo:  # Legacy
                 # Retrieve the value from the specified output in the non_witness_utxo
                 inp_amount += inp.non_witness_utxo.vout[inp.vout].value
         resume_inputs_str = (
-            (t("Inputs (%d):") % len(self.psbt.inputs))
-            + self._btc_render(inp_amount)
-            + "\n\n"
+            (t("Inputs (%d):") % num_inputs) + self._btc_render(inp_amount) + "\n\n"
         )
 
         self_transfer_list = []
@@ -348,50 +548,22 @@ class PSBTSigner:
 
         output_policy_count = Counter()
 
-        xpubs = []
-        origin_less_xpub = None
-        try:
-            xpubs, origin_less_xpub = self.xpubs()
-        except:
-            # Expected to fail to get xpubs from Miniscript PSBT
-            pass
-        for i, out in enumerate(self.psbt.outputs):
-            out_policy = get_policy(
-                out, self.psbt.tx.vout[i].script_pubkey, xpubs, origin_less_xpub
-            )
-            output_policy_count[out_policy["type"]] += 1
-            output_type = self._classify_output(out_policy, out)
+        output_classes = self.output_classes()
+        for (out_policy_type, output_type), out in zip(
+            output_classes, self._scopes(outputs=True)
+        ):
+            output_policy_count[out_policy_type] += 1
+            address = out.script_pubkey.address(network=self.wallet.key.network)
 
             if output_type == CHANGE:
-                change_list.append(
-                    (
-                        self.psbt.tx.vout[i].script_pubkey.address(
-                            network=self.wallet.key.network
-                        ),
-                        self.psbt.tx.vout[i].value,
-                    )
-                )
-                change_amount += self.psbt.tx.vout[i].value
+                change_list.append((address, out.value))
+                change_amount += out.value
             elif output_type == SELF_TRANSFER:
-                self_transfer_list.append(
-                    (
-                        self.psbt.tx.vout[i].script_pubkey.address(
-                            network=self.wallet.key.network
-                        ),
-                        self.psbt.tx.vout[i].value,
-                    )
-                )
-                self_amount += self.psbt.tx.vout[i].value
+                self_transfer_list.append((address, out.value))
+                self_amount += out.value
             else:  # Address is from other wallet
-                spend_list.append(
-                    (
-                        self.psbt.tx.vout[i].script_pubkey.address(
-                            network=self.wallet.key.network
-                        ),
-                        self.psbt.tx.vout[i].value,
-                    )
-                )
-                spend_amount += self.psbt.tx.vout[i].value
+                spend_list.append((address, out.value))
+                spend_amount += out.value
 
         if len(spend_list) > 0:
             resume_spend_str = (
@@ -411,7 +583,11 @@ class PSBTSigner:
             )
 
         resume_fee_str, fee_percent = self._get_resume_fee(
-            inp_amount, self_amount + change_amount + spend_amount, output_policy_count
+            inp_amount,
+            self_amount + change_amount + spend_amount,
+            output_policy_count,
+            num_inputs,
+            len(output_classes),
         )
 
         messages = []
@@ -446,12 +622,17 @@ class PSBTSigner:
         """
         filled = 0
 
-        for inp in self.psbt.inputs:
+        for inp in self._scopes():
             filled += self._fill_zero_fingerprint_scope(inp)
 
-        for out in self.psbt.outputs:
+        for out in self._scopes(outputs=True):
             filled += self._fill_zero_fingerprint_scope(out)
 
+        if filled:
+            # Scopes read from SD are filled again each time they are read
+            self.fill_fingerprints = True
+            # Fingerprints take part in policy and output classification
+            self.analysis.clear()
         return filled
 
     def _fill_zero_fingerprint_scope(self, scope):
@@ -475,6 +656,11 @@ class PSBTSigner:
 
     def sign(self, trim=True):
         """Signs the PSBT and preserves necessary fields for the final transaction"""
+        if self.psbt is None:
+            # Only signing to a QR code needs the whole PSBT loaded
+            self.psbt = self._read_file(self.file_path)
+            if self.fill_fingerprints:
+                self.fill_zero_fingerprint()
         self.add_signatures()
 
         if not trim:
@@ -516,6 +702,46 @@ class PSBTSigner:
 
         self.psbt = trimmed_psbt
 
+    def can_stream_sign(self):
+        """Whether the PSBT is read from SD as needed and is signed to a file"""
+        return self.file_path is not None and self.psbt is None
+
+    def sign_to_file(self, out_path):
+        """Signs the PSBT file input by input, writing the signed PSBT to
+        out_path without loading the whole PSBT into memory
+        """
+        tmp_path = out_path + ".tmp" if out_path == self.file_path else out_path
+        sigs = 0
+        try:
+            with open(self.file_path, "rb") as source:
+                view = StreamSigningView.view(source)
+                with open(tmp_path, "wb") as target:
+                    # Global scope is copied verbatim
+                    source.seek(view.offset)
+                    read_write(source, target, view.first_scope - view.offset)
+                    for i, scope in enumerate(view.scopes()):
+                        self._fill_zero_fingerprint_scope(scope)
+                        view.scope = scope
+                        view.scope_index = i
+                        sigs += view.sign_input(i, self.wallet.key.root, _NullStream())
+                        view.scope = view.scope_index = None
+                        scope.write_to(target, version=view.version)
+                        gc.collect()
+                    for scope in view.scopes(outputs=True):
+                        self._fill_zero_fingerprint_scope(scope)
+                        scope.write_to(target, version=view.version)
+            if sigs == 0:
+                raise ValueError("cannot sign")
+        except:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if tmp_path != out_path:
+            os.remove(out_path)
+            os.rename(tmp_path, out_path)
+
     def psbt_qr(self):
         """Returns the psbt in the same form it was read as a QR code"""
         psbt_data = self.psbt.serialize()
@@ -550,8 +776,13 @@ class PSBTSigner:
         """
         from embit.psbt import DerivationPath
 
-        if self.psbt.xpubs:
-            return self.psbt.xpubs, None
+        if self.psbt is not None:
+            psbt_xpubs = self.psbt.xpubs
+        else:
+            with open(self.file_path, "rb") as file:
+                psbt_xpubs = StreamSigningView.view(file).xpubs()
+        if psbt_xpubs:
+            return psbt_xpubs, None
 
         if not self.wallet.descriptor:
             raise ValueError("missing xpubs")
@@ -584,23 +815,12 @@ class PSBTSigner:
         if is_multisig(self.policy):
             policy_str += str(self.policy["m"]) + " of " + str(self.policy["n"]) + "\n"
         fingerprints = []
-        for inp in self.psbt.inputs:
+        if self.policy["type"] in (P2WSH, P2TR):
             # Do we need to loop through all the inputs or just one?
-            if self.policy["type"] == P2WSH:
-                for pub in inp.bip32_derivations:
+            for derivations in self.input_derivations():
+                for _, derivation in derivations:
                     fingerprint_srt = Key.format_fingerprint(
-                        inp.bip32_derivations[pub].fingerprint, True
-                    )
-                    if fingerprint_srt not in fingerprints:
-                        if len(fingerprints) > MAX_POLICY_COSIGNERS_DISPLAYED:
-                            fingerprints[-1] = ELLIPSIS
-                            break
-                        fingerprints.append(fingerprint_srt)
-            elif self.policy["type"] == P2TR:
-                for pub in inp.taproot_bip32_derivations:
-                    _, derivation_path = inp.taproot_bip32_derivations[pub]
-                    fingerprint_srt = Key.format_fingerprint(
-                        derivation_path.fingerprint, True
+                        derivation.fingerprint, True
                     )
                     if fingerprint_srt not in fingerprints:
                         if len(fingerprints) > MAX_POLICY_COSIGNERS_DISPLAYED:
@@ -612,6 +832,14 @@ class PSBTSigner:
         return policy_str
 
 
+class _NullStream:
+    """Discards the per-input signature data written by PSBTView"""
+
+    def write(self, data):
+        """Pretends to write, returning the data length"""
+        return len(data)
+
+
 def is_multisig(policy):
     """Returns a boolean indicating if the policy is a multisig"""
     return (
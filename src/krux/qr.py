@@ -20,7 +20,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 # pylint: disable=E1101
-import io
 import math
 import qrcode
 
@@ -41,6 +40,12 @@ UR_BYTEWORDS_CRC_LEN = 4  # 32 bits CRC used on Bytewords encoding
 
 UR_MIN_FRAGMENT_LENGTH = 10
 
+# Memory, in bytes, that encoded QR parts may take in a QRFrames cache
+QR_FRAMES_CACHE_BUDGET = 32 * 1024
+
+# Recently parsed payloads remembered to skip repeated camera frames
+RECENT_PAYLOADS_SIZE = 8
+
 # https://www.qrcode.com/en/about/version.html
 # List of capacities, based on versions
 # Tables below are limited to version 20 and we use L (Low) ECC (Error Correction Code) Level
@@ -135,6 +140,24 @@ class QRPartParser:
         self.format = None
         self.decoder = None
         self.bbqr = None
+        # Indexes of BBQr parts that failed to decode and were not rescanned
+        self.failed_parts = set()
+        self.recent_payloads = []
+        self.unique_count = 0
+        self.duplicate_count = 0
+
+    def is_duplicate(self, data):
+        """Returns True if data was among the recently seen payloads, so it can
+        skip parsing. Counts unique and duplicate payloads for diagnostics
+        """
+        if data in self.recent_payloads:
+            self.duplicate_count += 1
+            return True
+        if len(self.recent_payloads) >= RECENT_PAYLOADS_SIZE:
+            self.recent_payloads.pop(0)
+        self.recent_payloads.append(data)
+        self.unique_count += 1
+        return False
 
     def parsed_count(self):
         """Returns the number of parsed parts so far"""
@@ -183,14 +206,38 @@ class QRPartParser:
                 self.decoder = URDecoder()
             self.decoder.receive_part(data)
         elif self.format == FORMAT_BBQR:
-            from .bbqr import parse_bbqr
+            from .bbqr import parse_bbqr, decode_bbqr_part
 
             part, index, total = parse_bbqr(data)
-            self.parts[index] = part
             self.total = total
+            if index not in self.parts:
+                # Decode each part as it arrives, so completion only joins bytes
+                try:
+                    self.parts[index] = decode_bbqr_part(part, self.bbqr.encoding)
+                except:
+                    # Not counted as parsed, so the part is scanned again
+                    self.failed_parts.add(index)
+                    return None
+                self.failed_parts.discard(index)
             return index
         return None
 
+    def accepts(self, data):
+        """Returns whether data can be part of the series being parsed, so other
+        codes captured along with it can be skipped
+        """
+        if self.format is None:
+            return True
+        qr_format, bbqr = detect_format(data)
+        if qr_format != self.format:
+            return False
+        if qr_format == FORMAT_BBQR:
+            return (
+                bbqr.encoding == self.bbqr.encoding
+                and bbqr.file_type == self.bbqr.file_type
+            )
+        return True
+
     def is_complete(self):
         """Returns a boolean indicating whether or not enough parts have been parsed"""
         if self.format == FORMAT_UR:
@@ -214,19 +261,21 @@ class QRPartParser:
             return UR(self.decoder.result.type, bytearray(self.decoder.result.cbor))
 
         if self.format == FORMAT_BBQR:
-            from .bbqr import decode_bbqr
+            from .bbqr import join_bbqr
 
-            return decode_bbqr(self.parts, self.bbqr.encoding, self.bbqr.file_type)
+            if self.failed_parts:
+                # Capture was over before the part was scanned again
+                raise ValueError("Invalid BBQR part")
 
-        code_buffer = io.StringIO("")
+            return join_bbqr(self.parts, self.bbqr.encoding, self.bbqr.file_type)
+
+        code_parts = []
         for _, part in sorted(self.parts.items()):
             if isinstance(part, bytes):
-                # Encoded data won't write on StringIO
+                # Encoded data can't be joined as text
                 return part
-            code_buffer.write(part)
-        code = code_buffer.getvalue()
-        code_buffer.close()
-        return code
+            code_parts.append(part)
+        return "".join(code_parts)
 
 
 def to_qr_codes(data, max_width, qr_format):
@@ -291,6 +340,48 @@ def to_qr_codes(data, max_width, qr_format):
                 yield (code, num_parts)
 
 
+class QRFrames:
+    """Cycles through the QR codes of data, encoding each part only once while
+    they fit in the memory budget. UR parts are fountain encoded, never repeat
+    and are always generated
+    """
+
+    def __init__(self, data, max_width, qr_format, budget=QR_FRAMES_CACHE_BUDGET):
+        self.data = data
+        self.max_width = max_width
+        self.qr_format = qr_format
+        self.budget = budget
+        self.generator = to_qr_codes(data, max_width, qr_format)
+        self.frames = [] if qr_format != FORMAT_UR else None
+        self.cached_size = 0
+        self.index = 0
+        self.encoded = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.frames and len(self.frames) == self.frames[0][1]:
+            # All parts cached, only blit from now on
+            frame = self.frames[self.index]
+            self.index = (self.index + 1) % len(self.frames)
+            return frame
+        try:
+            frame = next(self.generator)
+        except StopIteration:
+            self.generator = to_qr_codes(self.data, self.max_width, self.qr_format)
+            frame = next(self.generator)
+        self.encoded += 1
+        if self.frames is not None:
+            self.cached_size += len(frame[0])
+            if self.cached_size > self.budget:
+                # Over budget, fallback to encoding every part
+                self.frames = None
+            else:
+                self.frames.append(frame)
+        return frame
+
+
 def get_size(qr_code):
     """Returns the size of the qr code as the number of chars until the first newline"""
     size = math.sqrt(len(qr_code) * 8)
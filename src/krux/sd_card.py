@@ -41,6 +41,9 @@ class SDHandler:
 
     PATH_STR = "/" + SD_PATH + "/%s"
 
+    # Counts writes, so cached directory listings can tell they are stale
+    writes = 0
+
     def __init__(self):
         pass
 
@@ -61,11 +64,19 @@ class SDHandler:
         """Writes the data in binary format into the filename, truncating the file first"""
         with open(SDHandler.PATH_STR % filename, "wb") as file:
             file.write(data)
+        SDHandler.writes += 1
 
     def write(self, filename, data):
         """Writes the data into the filename, truncating the file first"""
         with open(SDHandler.PATH_STR % filename, "w") as file:
             file.write(data)
+        SDHandler.writes += 1
+
+    def append(self, filename, data):
+        """Appends the data to the end of the filename"""
+        with open(SDHandler.PATH_STR % filename, "a") as file:
+            file.write(data)
+        SDHandler.writes += 1
 
     def read_binary(self, filename):
         """Reads the filename in binary format and returns the data"""
@@ -80,6 +91,31 @@ class SDHandler:
     def delete(self, filename):
         """Deletes the filename"""
         os.remove(SDHandler.PATH_STR % filename)
+        SDHandler.writes += 1
+
+    @staticmethod
+    def list_dir(path):
+        """Returns the directory and file names in path, each sorted ignoring
+        case. Entry types come with the listing when ilistdir is available,
+        saving a stat per entry
+        """
+        directories = []
+        files = []
+        if hasattr(os, "ilistdir"):
+            for entry in os.ilistdir(path):
+                if entry[1] & 0x4000:
+                    directories.append(entry[0])
+                else:
+                    files.append(entry[0])
+            directories.sort(key=str.lower)
+            files.sort(key=str.lower)
+        else:
+            for filename in sorted(os.listdir(path), key=str.lower):
+                if SDHandler.file_exists(path + "/" + filename):
+                    files.append(filename)
+                else:
+                    directories.append(filename)
+        return directories, files
 
     @staticmethod
     def dir_exists(filename):
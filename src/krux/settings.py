@@ -34,6 +34,7 @@ FLASH_PATH = "flash"
 # Specific storage filenames
 SETTINGS_FILENAME = "settings.json"
 MNEMONICS_FILE = "seeds.json"
+MNEMONICS_LOG_FILE = "seeds.log"
 
 # Network settings
 MAIN_TXT = "main"
@@ -160,6 +161,10 @@ class Store:
         self.settings = {}
         self.file_location = Store.get_vfs_location(SD_PATH)
         self.dirty = False
+        # Namespace path -> its settings dict (or None if not stored), reset
+        # whenever namespaces are added or removed
+        self.namespaces = {}
+        self.namespaces_root = None
 
         # Check for the correct settings persist location
         # Try to load from SD
@@ -192,21 +197,39 @@ class Store:
 
     def _load_settings(self):
         """Loads settings based on the current file_location (SD/flash)"""
+        from krux import atomic_file
+
         try:
-            with open(self.file_location + SETTINGS_FILENAME, "r") as f:
-                self.settings = json.loads(f.read())
+            self.settings = json.loads(
+                atomic_file.read(self.file_location + SETTINGS_FILENAME)
+            )
         except:
             pass
 
+    def _namespace(self, namespace):
+        """Returns the settings dict of a namespace, or None if nothing is
+        stored under it. Walks settings without building out namespaces
+        """
+        if self.namespaces_root is not self.settings:
+            # Settings were replaced, e.g. loaded from file
+            self.namespaces = {}
+            self.namespaces_root = self.settings
+        try:
+            return self.namespaces[namespace]
+        except KeyError:
+            pass
+        s = self.settings
+        for level in namespace.split("."):
+            s = s.get(level)
+            if s is None:
+                break
+        self.namespaces[namespace] = s
+        return s
+
     def get(self, namespace, setting_name, default_value):
         """Returns a setting value under the given namespace, or default value if not set"""
-        s = json.loads(
-            json.dumps(self.settings)
-        )  # deepcopy to avoid building out namespaces
-        for level in namespace.split("."):
-            s[level] = s.get(level, {})
-            s = s[level]
-        if setting_name not in s:
+        s = self._namespace(namespace)
+        if s is None or setting_name not in s:
             return default_value
         return s[setting_name]
 
@@ -216,7 +239,9 @@ class Store:
         """
         s = self.settings
         for level in namespace.split("."):
-            s[level] = s.get(level, {})
+            if level not in s:
+                s[level] = {}
+                self.namespaces = {}
             s = s[level]
         old_value = s.get(setting_name, None)
         if old_value != setting_value:
@@ -239,6 +264,7 @@ class Store:
         for s, level in reversed(levels):
             if not s[level]:
                 del s[level]
+                self.namespaces = {}
                 self.dirty = True
 
     def update_file_location(self, location):
@@ -249,30 +275,38 @@ class Store:
                 os.remove(Store.get_vfs_location(SD_PATH) + SETTINGS_FILENAME)
             else:
                 os.remove(Store.get_vfs_location(FLASH_PATH) + SETTINGS_FILENAME)
+                from krux import flash_occupancy
+
+                flash_occupancy.invalidate()
         except:
             pass
 
     def save_settings(self):
-        """Helper to persist SETTINGS_FILENAME where user selected"""
+        """Helper to persist SETTINGS_FILENAME where user selected.
+        Changes made since last save are written at once, atomically, and
+        only if they differ from what is persisted
+        """
+        from krux import atomic_file
+
         persisted = False
 
         if self.dirty:
             settings_filename = self.file_location + SETTINGS_FILENAME
-            new_contents = json.dumps(self.settings)
             old_contents = "{}"
             try:
-                with open(settings_filename, "r") as f:
-                    old_contents = f.read()
+                old_contents = atomic_file.read(settings_filename)
+            except:
+                pass
+            try:
+                persisted = atomic_file.write(
+                    settings_filename, json.dumps(self.settings), old_contents
+                )
+                if persisted and FLASH_PATH in self.file_location:
+                    from krux import flash_occupancy
+
+                    flash_occupancy.invalidate()
             except:
                 pass
-            # Compare old and new file contents, if different, write new content
-            if new_contents != old_contents:
-                try:
-                    with open(settings_filename, "w") as f:
-                        f.write(new_contents)
-                    persisted = True
-                except:
-                    pass
             self.dirty = False
 
         return persisted
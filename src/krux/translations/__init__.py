@@ -70,6 +70,7 @@ ref_array = [
     2519455027,
     2363604010,
     2038226551,
+    2535612875,
     3138204438,
     1207696150,
     1583186953,
@@ -291,6 +292,7 @@ ref_array = [
     2736506158,
     2029624154,
     289960586,
+    1514691695,
     1022211991,
     4255182430,
     3753172956,
@@ -345,6 +347,7 @@ ref_array = [
     725348723,
     3684696112,
     2978718564,
+    2235661845,
     2732611775,
     401829098,
     2061556020,
@@ -406,5 +409,5 @@ ref_array = [
     2595315106,
     2845072720,
     2904991687,
-    1875891934,
+    1980261052,
 ]
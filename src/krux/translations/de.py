@@ -58,6 +58,7 @@ translation_array = [
     "Helligkeit",
     "Tasten",
     "Entprellung der Tasten",
+    "Schlüssel zwischenspeichern",
     "Aufnahme abgebrochen",
     "Change Adresse",
     "Thema ändern und neu starten?",
@@ -279,6 +280,7 @@ translation_array = [
     "Wörter 13-24 scannen",
     "Bildschirmschonerzeit",
     "Script-Art",
+    "Neu geschriebene Sektoren:",
     "Sicherheit",
     "Selbstübertragung oder Change (%d):",
     "Selbstübertragung:",
@@ -333,6 +335,7 @@ translation_array = [
     "Werkzeuge",
     "Berühre Schwellenwert",
     "Touchscreen",
+    "Schlüssel bei allen versuchen",
     "Weiter versuchen?",
     "BIP39 Passphrase eingeben",
     "Schlüssel eingeben",
@@ -394,5 +397,5 @@ translation_array = [
     "zu Sechskant",
     "zu utf8",
     "unbekannt",
-    "wurde in den ersten %d Adressen nicht gefunden",
+    "wurde in %d geprüften Adressen nicht gefunden",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "Brillo",
     "Botones",
     "Rebote de Botones",
+    "Guardar claves en caché",
     "Captura cancelada",
     "Cambio",
     "¿Cambiar de tema y reiniciar?",
@@ -279,6 +280,7 @@ translation_array = [
     "Escaneo de palabras 13-24",
     "Tiempo de Espera del Protector de Pantalla",
     "Tipo de Script",
+    "Sectores reescritos:",
     "Seguridad",
     "Autotransferencia o Cambio (%d):",
     "Autotransferencia:",
@@ -333,6 +335,7 @@ translation_array = [
     "Herramientas",
     "Umbral Táctil",
     "Pantalla Táctil",
+    "Probar clave en todos",
     "¿Intentar con mas?",
     "Escribe la Passphrase BIP39",
     "Introduce la clave",
@@ -394,5 +397,5 @@ translation_array = [
     "a hexadecimal",
     "a utf8",
     "desconocido",
-    "NO FUE ENCONTRADO en las primeras %d direcciones",
+    "NO FUE ENCONTRADO en %d direcciones comprobadas",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "Luminosité",
     "Boutons",
     "Anti-rebond des boutons",
+    "Mettre les clés en cache",
     "Capture annulée",
     "Monnaie",
     "Changer de thème et redémarrer\u2009?",
@@ -279,6 +280,7 @@ translation_array = [
     "Analyser les mots 13 à 24",
     "Delai d'Inactivité",
     "Type de Script",
+    "Secteurs réécrits :",
     "Sécurité",
     "Auto-transfert ou monnaie (%d)\u2009:",
     "Auto-transfert\u2009:",
@@ -333,6 +335,7 @@ translation_array = [
     "Outils",
     "Sensibilité",
     "Écran Tactile",
+    "Essayer la clé sur tous",
     "Réessayer\u2009?",
     "Entrez la phrase secrète BIP39",
     "Taper clé",
@@ -394,5 +397,5 @@ translation_array = [
     "vers hexa.",
     "vers utf8",
     "inconnu",
-    "INTROUVABLE dans les %d premières adresses",
+    "INTROUVABLE parmi %d adresses vérifiées",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "明るさ",
     "ボタン",
     "ボタンのデバウンス",
+    "キーをキャッシュ",
     "キャプチャがキャンセルされました",
     "お釣り",
     "テーマの変更と再起動しますか?",
@@ -279,6 +280,7 @@ translation_array = [
     "単語13-24をスキャン中",
     "スクリーンセーバーの時間",
     "スクリプトタイプ",
+    "書き換えたセクター:",
     "セキュリティa",
     "自己転送または変更（%d）:",
     "自己転送:",
@@ -333,6 +335,7 @@ translation_array = [
     "ツール",
     "タッチスレッショルド",
     "タッチスクリーン",
+    "すべてにキーを試す",
     "もっと試してみますか?",
     "BIP39パスフレーズを入力してください",
     "キーを入力する",
@@ -394,5 +397,5 @@ translation_array = [
     "16進数に",
     "utf 8へ",
     "不明",
-    "最初の%dアドレスに見つかりませんでした",
+    "確認した%dアドレスに見つかりませんでした",
 ]
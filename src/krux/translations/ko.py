@@ -58,6 +58,7 @@ translation_array = [
     "밝기",
     "버튼",
     "버튼 바운스 방지",
+    "키 캐시",
     "캡처 취소됨",
     "잔돈",
     "테마를 변경하고 재부팅하시겠습니까?",
@@ -279,6 +280,7 @@ translation_array = [
     "13번째부터 24번째 단어를 스캔 중입니다",
     "화면보호기 시간",
     "지갑 형식",
+    "다시 쓴 섹터:",
     "보안",
     "본인주소 전송 또는 잔돈 (%d):",
     "자가 이체:",
@@ -333,6 +335,7 @@ translation_array = [
     "도구",
     "터치 민감도",
     "터치스크린",
+    "모두에 키 시도",
     "더 하시겠습니까?",
     "BIP39 패스프레이즈 입력",
     "비밀번호 입력",
@@ -394,5 +397,5 @@ translation_array = [
     "16진수로",
     "utf8로",
     "알 수 없음",
-    "첫 번째 %d개의 주소에서 찾을 수 없습니다",
+    "확인한 %d개의 주소에서 찾을 수 없습니다",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "Helderheid",
     "Knoppen",
     "Debounce van knoppen",
+    "Sleutels cachen",
     "Opname geannuleerd",
     "Change",
     "Thema veranderen en opnieuw opstarten?",
@@ -279,6 +280,7 @@ translation_array = [
     "Woorden 13 t/m 24 scannen",
     "Schermbeveiligingstijd",
     "Scripttype",
+    "Herschreven sectoren:",
     "Beveiliging",
     "Overschrijving naar jezelf, of wisselgeld (%d):",
     "Zelf overschrijving:",
@@ -333,6 +335,7 @@ translation_array = [
     "Hulpmiddelen",
     "Aanraak gevoeligheid",
     "Aanraakscherm",
+    "Sleutel op alle proberen",
     "Meer proberen?",
     "Voer een BIP39 wachtwoord in",
     "Voer sleutel in",
@@ -394,5 +397,5 @@ translation_array = [
     "om te hexeren",
     "naar utf8",
     "onbekend",
-    "werd NIET GEVONDEN in de eerste %d adressen",
+    "werd NIET GEVONDEN in %d gecontroleerde adressen",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "Brilho",
     "Botões",
     "Debounce dos botões",
+    "Manter chaves em cache",
     "Captura cancelada",
     "Troco",
     "Mudar o tema e reiniciar?",
@@ -279,6 +280,7 @@ translation_array = [
     "Escaneando as palavras de 13-24",
     "Tempo para proteção de tela",
     "Tipo de Script",
+    "Setores regravados:",
     "Segurança",
     "Autotransferência ou Troco (%d):",
     "Autotransferência:",
@@ -333,6 +335,7 @@ translation_array = [
     "Ferramentas",
     "Limiar de Toque",
     "Touchscreen",
+    "Testar chave em todos",
     "Tentar mais?",
     "Digitar a senha BIP39",
     "Digite a Chave",
@@ -394,5 +397,5 @@ translation_array = [
     "para hexadecimal",
     "para utf8",
     "desconhecida",
-    "NÃO FOI ENCONTRADO nos primeiros %d endereços",
+    "NÃO FOI ENCONTRADO em %d endereços checados",
 ]
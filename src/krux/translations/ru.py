@@ -58,6 +58,7 @@ translation_array = [
     "Яркость",
     "Кнопки",
     "Антидребезг кнопок",
+    "Кэшировать ключи",
     "Захват отменен",
     "Сдача",
     "Сменить тему и перезагрузить?",
@@ -279,6 +280,7 @@ translation_array = [
     "Сканирование слов 13-24",
     "Время Экранной Заставки",
     "Тип скрипта",
+    "Перезаписано секторов:",
     "Охрана",
     "Трансфер самому себе или Сдача (%d):",
     "Перевод самому себе:",
@@ -333,6 +335,7 @@ translation_array = [
     "Инструменты",
     "Чувствительность",
     "Тачскрин",
+    "Проверить ключ на всех",
     "Попробовать ещё?",
     "Ввести BIP39 фразу-пароль",
     "Ввести Ключ",
@@ -394,5 +397,5 @@ translation_array = [
     "к шестигранной",
     "to utf8",
     "неизвестный",
-    "нЕ НАЙДЕНО в первых %d адресах",
+    "нЕ НАЙДЕНО среди %d проверенных адресов",
 ]
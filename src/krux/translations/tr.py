@@ -58,6 +58,7 @@ translation_array = [
     "Parlaklık",
     "Butonlar",
     "Buton Geri-sekmesi",
+    "Anahtarları önbelleğe al",
     "Yakalama iptal edildi",
     "Para Üstü",
     "Temayı değiştir ve yeniden başlat?",
@@ -279,6 +280,7 @@ translation_array = [
     "13-24 kelimeleri taranıyor",
     "Ekran Koruyucu Süresi",
     "Betik Türü",
+    "Yeniden yazılan sektörler:",
     "Güvenlik",
     "Kendine-transfer veya Para Üstü (%d):",
     "Kendine-transfer:",
@@ -333,6 +335,7 @@ translation_array = [
     "Araçlar",
     "Dokunma Eşiği",
     "Dokunmatik ekran",
+    "Anahtarı hepsinde dene",
     "Daha fazla kez denensin mi?",
     "BIP39 parolasını yazın",
     "Anahtar Yaz",
@@ -394,5 +397,5 @@ translation_array = [
     "to hex",
     "utf8 'e",
     "bilinmiyor",
-    "ilk %d adreste BULUNAMADI",
+    "kontrol edilen %d adreste BULUNAMADI",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "Độ sáng",
     "Nút",
     "Loại bỏ nhiễu nút",
+    "Lưu đệm khóa",
     "Hủy chụp hình",
     "Thay đổi",
     "Thay đổi giao diện và khởi động lại?",
@@ -279,6 +280,7 @@ translation_array = [
     "Đang quét từ 13-24",
     "Thời gian chế độ bảo vệ màn hình",
     "Kiểu văn lệnh",
+    "Số sector đã ghi lại:",
     "Bảo mật",
     "Tự chuyển nhượng hoặc giao dịch (%d):",
     "Tự chuyển nhượng:",
@@ -333,6 +335,7 @@ translation_array = [
     "Công cụ",
     "Ngưỡng cảm ứng",
     "Màn hình cảm ứng",
+    "Thử khóa cho tất cả",
     "Thử thêm nữa?",
     "Nhập cụm mật khẩu BIP39",
     "Nhập khóa",
@@ -394,5 +397,5 @@ translation_array = [
     "thành hex",
     "đến utf8",
     "không rõ",
-    "kHÔNG TÌM THẤY trong %d địa chỉ đầu tiên",
+    "kHÔNG TÌM THẤY trong %d địa chỉ đã kiểm tra",
 ]
@@ -58,6 +58,7 @@ translation_array = [
     "亮度",
     "按钮",
     "按钮去抖动",
+    "缓存密钥",
     "截取已取消",
     "找零",
     "更改主题并重新启动？",
@@ -279,6 +280,7 @@ translation_array = [
     "扫描第 13-24 个单词",
     "屏保时间",
     "脚本类型",
+    "已重写扇区:",
     "安全",
     "自转或找零 (%d):",
     "自行转账:",
@@ -333,6 +335,7 @@ translation_array = [
     "工具",
     "触摸阈值",
     "触摸屏",
+    "对全部尝试密钥",
     "再次尝试？",
     "输入 BIP39 Phrasephrase",
     "输入私钥",
@@ -394,5 +397,5 @@ translation_array = [
     "成为十六进制",
     "to_utf8()",
     "未知",
-    "在前 %d 个地址中未找到",
+    "在已检查的 %d 个地址中未找到",
 ]
@@ -19,6 +19,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+from collections import OrderedDict
 from embit.descriptor.descriptor import Descriptor
 from embit.descriptor.arguments import Key
 from embit.networks import NETWORKS
@@ -40,11 +41,33 @@ from .key import (
     TYPE_MINISCRIPT,
 )
 
+ADDRESS_CACHE_SIZE = 64
+SCRIPT_INDEX_SIZE = 1000
+
 
 class AssumptionWarning(Exception):
     """An exception for assumptions that require user acceptance"""
 
 
+class DerivationCache:
+    """Branch nodes, recent addresses and the scriptPubKey index of a descriptor"""
+
+    def __init__(self):
+        self.descriptor = None
+        self.branch_descriptors = {}
+        self.addresses = OrderedDict()
+        self.script_index = {}
+        self.indexed_count = {}
+
+    def clear(self, descriptor=None):
+        """Drops all cached derivations, starting over for descriptor"""
+        self.descriptor = descriptor
+        self.branch_descriptors = {}
+        self.addresses = OrderedDict()
+        self.script_index = {}
+        self.indexed_count = {}
+
+
 class Wallet:
     """Represents the wallet that the current key belongs to"""
 
@@ -57,6 +80,7 @@ class Wallet:
         self.policy = None
         self.persisted = False
         self._network = None
+        self.derivations = DerivationCache()
         if self.key and self.key.policy_type == TYPE_SINGLESIG:
             if self.key.script_type == P2PKH:
                 self.descriptor = Descriptor.from_string(
@@ -262,13 +286,83 @@ class Wallet:
             raise ValueError("No descriptor to derive addresses from")
 
         starting_index = i
+        network = NETWORKS[self.which_network()]
 
         while limit is None or i < starting_index + limit:
-            yield self.descriptor.derive(i, branch_index=branch_index).address(
-                network=NETWORKS[self.which_network()]
-            )
+            yield self._address(i, branch_index, network)
             i += 1
 
+    def _address(self, i, branch_index, network):
+        """Returns the address at index i of a branch, from the LRU of recently
+        rendered addresses when possible"""
+        addresses = self._derivations().addresses
+        cache_key = (branch_index, i, network["name"])
+        address = addresses.pop(cache_key, None)
+        if address is None:
+            address = (
+                self._branch_descriptor(branch_index).derive(i).address(network=network)
+            )
+            if len(addresses) >= ADDRESS_CACHE_SIZE:
+                del addresses[next(iter(addresses))]
+        addresses[cache_key] = address
+        return address
+
+    def find_script_pubkey(self, script_pubkey, i=0, limit=1, branch_index=0):
+        """Searches receive and change branches, interleaved and starting with
+        branch_index, for the index in range i to i + limit - 1 that derives the
+        script_pubkey bytes. Returns (branch_index, index) or None.
+
+        Every scriptPubKey derived is kept in a session index, so an address
+        already seen by a previous search is found without deriving again"""
+
+        if self.descriptor is None:
+            raise ValueError("No descriptor to derive addresses from")
+
+        derivations = self._derivations()
+        found = derivations.script_index.get(script_pubkey)
+        if found is not None:
+            return found
+
+        branches = [branch_index] + [
+            b for b in range(self.descriptor.num_branches) if b != branch_index
+        ]
+        for index in range(i, i + limit):
+            for branch in branches:
+                indexed_count = derivations.indexed_count.get(branch, 0)
+                if index < indexed_count:
+                    # Already in the index, so it is not a match
+                    continue
+                derived = (
+                    self._branch_descriptor(branch).derive(index).script_pubkey().data
+                )
+                if (
+                    index == indexed_count
+                    and len(derivations.script_index) < SCRIPT_INDEX_SIZE
+                ):
+                    derivations.script_index[derived] = (branch, index)
+                    derivations.indexed_count[branch] = index + 1
+                if derived == script_pubkey:
+                    return branch, index
+        return None
+
+    def _derivations(self):
+        """Returns the derivation cache, dropped if the descriptor was loaded or
+        replaced"""
+        if self.derivations.descriptor is not self.descriptor:
+            self.derivations.clear(self.descriptor)
+        return self.derivations
+
+    def _branch_descriptor(self, branch_index):
+        """Returns the descriptor fixed on a branch with every key already derived
+        to its branch-level node, so each address costs a single child derivation"""
+        branch_descriptors = self._derivations().branch_descriptors
+        if branch_index not in branch_descriptors:
+            descriptor = self.descriptor.branch(branch_index)
+            for key in descriptor.keys:
+                derive_to_branch_node(key)
+            branch_descriptors[branch_index] = descriptor
+        return branch_descriptors[branch_index]
+
     def has_change_addr(self):
         """Returns if this wallet knows how to derive its change addresses"""
 
@@ -293,6 +387,35 @@ def to_unambiguous_descriptor(descriptor):
     return descriptor
 
 
+def derive_to_branch_node(key):
+    """Derives, in place, an extended key of a branched descriptor down to the
+    parent of its wildcard, keeping only the wildcard step as allowed derivation"""
+    from embit.descriptor.arguments import AllowedDerivation, KeyOrigin
+
+    if (
+        not key.is_extended
+        or key.allowed_derivation is None
+        or key.allowed_derivation.has_hardend
+    ):
+        return
+
+    indexes = key.allowed_derivation.indexes
+    prefix = indexes
+    rest = []
+    if None in indexes:
+        prefix = indexes[: indexes.index(None)]
+        rest = indexes[len(prefix) :]
+    if not prefix:
+        return
+
+    if key.origin:
+        key.origin = KeyOrigin(key.origin.fingerprint, key.origin.derivation + prefix)
+    else:
+        key.origin = KeyOrigin(key.key.my_fingerprint, prefix)
+    key.key = key.key.derive(prefix)
+    key.allowed_derivation = AllowedDerivation(rest) if rest else None
+
+
 def parse_key_value_file(wallet_data):
     """Tries to parse data as a key-value file"""
     key_vals = []
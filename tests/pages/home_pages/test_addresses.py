@@ -282,9 +282,10 @@ def test_scan_address(mocker, m5stickv, tdata):
                         "0.\n\n%s\n\nis a valid address!" % format_address(case[3])
                     )
                 else:
-                    attempts = 50 * (len(case[5]) - 3)
+                    # Receive and change branches are both searched
+                    attempts = 2 * 50 * (len(case[5]) - 3)
                     ctx.display.draw_centered_text.assert_called_with(
-                        "%s\n\nwas NOT FOUND in the first %s addresses"
+                        "%s\n\nwas NOT FOUND in %s addresses checked"
                         % (format_address(case[3]), attempts)
                     )
         else:
@@ -293,6 +294,62 @@ def test_scan_address(mocker, m5stickv, tdata):
         assert ctx.input.wait_for_button.call_count == len(case[5])
 
 
+def test_scan_address_found_on_other_branch(mocker, m5stickv, tdata):
+    from krux.pages.home_pages.addresses import Addresses
+    from krux.wallet import Wallet
+    from krux.input import BUTTON_ENTER
+    from krux.qr import FORMAT_NONE
+    from krux.pages.qr_capture import QRCodeCapture
+    from krux.format import format_address
+
+    wallet = Wallet(tdata.SINGLESIG_12_WORD_KEY)
+    change_addr = list(wallet.obtain_addresses(3, limit=1, branch_index=1))[0]
+    ctx = create_ctx(mocker, [BUTTON_ENTER, BUTTON_ENTER, BUTTON_ENTER], wallet, None)
+    addresses_ui = Addresses(ctx)
+    mocker.patch.object(
+        QRCodeCapture, "qr_capture_loop", new=lambda self: (change_addr, FORMAT_NONE)
+    )
+    mocker.spy(wallet, "find_script_pubkey")
+
+    # Scanning from receive also searches the change branch in the same pass
+    addresses_ui.scan_address()
+
+    wallet.find_script_pubkey.assert_called_once()
+    ctx.display.draw_centered_text.assert_called_with(
+        "Change 3.\n\n%s\n\nis a valid address!" % format_address(change_addr)
+    )
+
+
+def test_scan_address_from_other_network(mocker, m5stickv, tdata):
+    from krux.pages.home_pages.addresses import Addresses
+    from krux.wallet import Wallet
+    from krux.input import BUTTON_ENTER
+    from krux.qr import FORMAT_NONE
+    from krux.pages.qr_capture import QRCodeCapture
+    from embit.networks import NETWORKS
+    from embit.script import address_to_scriptpubkey
+
+    wallet = Wallet(tdata.SINGLESIG_12_WORD_KEY)
+    # Owned scriptPubKey, rendered as a testnet address
+    addr = list(wallet.obtain_addresses(0, limit=1))[0]
+    testnet_addr = address_to_scriptpubkey(addr).address(NETWORKS["test"])
+    ctx = create_ctx(mocker, [BUTTON_ENTER, BUTTON_ENTER], wallet, None)
+    addresses_ui = Addresses(ctx)
+    mocker.patch.object(
+        QRCodeCapture, "qr_capture_loop", new=lambda self: (testnet_addr, FORMAT_NONE)
+    )
+    mocker.spy(wallet, "find_script_pubkey")
+    mocker.spy(wallet, "which_network")
+    mocker.spy(addresses_ui, "flash_error")
+
+    addresses_ui.scan_address()
+
+    # Same network as the addresses shown for the wallet
+    wallet.which_network.assert_called()
+    wallet.find_script_pubkey.assert_not_called()
+    addresses_ui.flash_error.assert_called_once_with("Invalid address")
+
+
 def test_scan_address_highlight(mocker, m5stickv, tdata):
     from krux.pages.home_pages.addresses import Addresses
     from krux.wallet import Wallet
@@ -689,9 +746,10 @@ def test_scan_change_address(mocker, m5stickv, tdata):
                         "0.\n\n%s\n\nis a valid address!" % format_address(case[3])
                     )
                 else:
-                    attempts = 50 * (len(case[5]) - 3)
+                    # Receive and change branches are both searched
+                    attempts = 2 * 50 * (len(case[5]) - 3)
                     ctx.display.draw_centered_text.assert_called_with(
-                        "%s\n\nwas NOT FOUND in the first %s receive addresses"
+                        "%s\n\nwas NOT FOUND in %s addresses checked"
                         % (format_address(case[3]), attempts)
                     )
         else:
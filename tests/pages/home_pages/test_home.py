@@ -1489,6 +1489,37 @@ def test_sign_wrong_key(mocker, m5stickv, tdata):
     home.display_qr_codes.assert_not_called()
 
 
+def test_stream_sign_wrong_key_to_sd(mocker, m5stickv, tdata):
+    from krux.pages.home_pages.home import Home
+    from krux.wallet import Wallet
+    from krux.input import BUTTON_ENTER, BUTTON_PAGE
+
+    btn_seq = [
+        BUTTON_PAGE,  # Move to "Sign to QR code"
+        BUTTON_PAGE,  # Move to "Sign to SD card"
+        BUTTON_ENTER,  # Sign to SD card
+    ]
+    ctx = create_ctx(mocker, btn_seq, Wallet(tdata.SINGLESIG_12_WORD_KEY))
+    home = Home(ctx)
+    mocker.patch.object(home, "has_sd_card", new=lambda: True)
+    mocker.patch.object(
+        home, "_format_psbt_file_extension", return_value="test-signed.psbt"
+    )
+    mocker.patch("krux.sd_card.SDHandler.__enter__")
+    mocker.patch("krux.sd_card.SDHandler.__exit__", return_value=False)
+    mocker.spy(home, "flash_error")
+    signer = mocker.MagicMock(is_b64_file=False)
+    signer.can_stream_sign.return_value = True
+    signer.sign_to_file.side_effect = ValueError("cannot sign")
+
+    home._sign_menu(signer, "test.psbt", ["resume"])
+
+    assert ctx.input.wait_for_button.call_count == len(btn_seq)
+    signer.sign.assert_not_called()
+    signer.sign_to_file.assert_called_once_with("/sd/test-signed.psbt")
+    home.flash_error.assert_called_once_with("Error:\ncannot sign")
+
+
 def test_sign_review_3_times(mocker, m5stickv, tdata):
     from krux.pages.home_pages.home import Home
     from krux.wallet import Wallet
@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import patch
 from . import create_ctx
 
-
 TEST_KEY = "test key"
 CBC_WORDS = "dog guitar hotel random owner gadget salute riot patrol work advice panic erode leader pass cross section laundry elder asset soul scale immune scatter"
 ECB_WORDS = "brass creek fuel snack era success impulse dirt caution purity lottery lizard boil festival neither case swift smooth range mail gravity sample never ivory"
@@ -460,7 +459,10 @@ def test_load_encrypted_from_flash(m5stickv, mocker):
         mocker.MagicMock(return_value=TEST_KEY),
     )
     ctx = create_ctx(mocker, BTN_SEQUENCE)
-    with patch("krux.encryption.open", new=mocker.mock_open(read_data=SEEDS_JSON)) as m:
+    mocker.patch("os.rename")
+    with patch(
+        "krux.atomic_file.open", new=mocker.mock_open(read_data=SEEDS_JSON)
+    ) as m:
         encrypted_mnemonics = LoadEncryptedMnemonic(ctx)
         words = encrypted_mnemonics.load_from_storage()
     assert words == ECB_WORDS.split()
@@ -502,7 +504,63 @@ def test_load_encrypted_from_flash_wrong_key(m5stickv, mocker):
         mocker.MagicMock(return_value="wrong key"),
     )
     ctx = create_ctx(mocker, BTN_SEQUENCE)
-    with patch("krux.encryption.open", new=mocker.mock_open(read_data=SEEDS_JSON)) as m:
+    mocker.patch("os.rename")
+    with patch(
+        "krux.atomic_file.open", new=mocker.mock_open(read_data=SEEDS_JSON)
+    ) as m:
+        encrypted_mnemonics = LoadEncryptedMnemonic(ctx)
+        words = encrypted_mnemonics.load_from_storage()
+    assert words == MENU_CONTINUE
+    assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
+
+
+def test_load_encrypted_trying_key_on_all(m5stickv, mocker):
+    from krux.input import BUTTON_ENTER, BUTTON_PAGE
+    from krux.pages.encryption_ui import LoadEncryptedMnemonic
+    from krux.encryption import MnemonicStorage
+
+    BTN_SEQUENCE = (
+        # Try Key on All
+        [BUTTON_PAGE, BUTTON_PAGE, BUTTON_ENTER]
+        # Second match, ecbID
+        + [BUTTON_PAGE, BUTTON_ENTER]
+    )
+    mocker.patch(
+        "krux.pages.encryption_ui.EncryptionKey.encryption_key",
+        mocker.MagicMock(return_value=TEST_KEY),
+    )
+    decrypt_all_spy = mocker.spy(MnemonicStorage, "decrypt_all")
+    ctx = create_ctx(mocker, BTN_SEQUENCE)
+    mocker.patch("os.rename")
+    with patch(
+        "krux.atomic_file.open", new=mocker.mock_open(read_data=SEEDS_JSON)
+    ) as m:
+        encrypted_mnemonics = LoadEncryptedMnemonic(ctx)
+        words = encrypted_mnemonics.load_from_storage()
+    assert words == ECB_WORDS.split()
+    decrypt_all_spy.assert_called_once()
+    assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
+
+
+def test_load_encrypted_trying_wrong_key_on_all(m5stickv, mocker):
+    from krux.input import BUTTON_ENTER, BUTTON_PAGE
+    from krux.pages.encryption_ui import LoadEncryptedMnemonic
+    from krux.pages import MENU_CONTINUE
+
+    BTN_SEQUENCE = (
+        [BUTTON_PAGE, BUTTON_PAGE, BUTTON_ENTER]  # Try Key on All
+        + [BUTTON_ENTER]  # Fail to decrypt
+        + [BUTTON_PAGE, BUTTON_ENTER]  # Leave
+    )
+    mocker.patch(
+        "krux.pages.encryption_ui.EncryptionKey.encryption_key",
+        mocker.MagicMock(return_value="wrong key"),
+    )
+    ctx = create_ctx(mocker, BTN_SEQUENCE)
+    mocker.patch("os.rename")
+    with patch(
+        "krux.atomic_file.open", new=mocker.mock_open(read_data=SEEDS_JSON)
+    ) as m:
         encrypted_mnemonics = LoadEncryptedMnemonic(ctx)
         words = encrypted_mnemonics.load_from_storage()
     assert words == MENU_CONTINUE
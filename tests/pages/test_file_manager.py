@@ -357,3 +357,53 @@ def test_folders_exploring(m5stickv, mocker, mock_file_operations):
     file_manager = FileManager(ctx)
     file_manager.select_file(select_file_handler=file_manager.show_file_details)
     assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
+
+
+def test_file_listing_is_lazy_and_cached(m5stickv, mocker):
+    import os
+    from krux.pages import MENU_RESTART
+    from krux.pages.file_manager import FileManager
+    from krux.sd_card import SDHandler
+    from krux.input import BUTTON_ENTER, BUTTON_PAGE, BUTTON_PAGE_PREV
+
+    listings = {
+        "/sd": [("subdir", 0x4000, 0)]
+        + [("file%03d.psbt" % i, 0x8000, 0) for i in range(300)],
+        "/sd/subdir": [("file.psbt", 0x8000, 0)],
+    }
+    ilistdir = mocker.patch.object(
+        os, "ilistdir", create=True, side_effect=lambda path: iter(listings[path])
+    )
+    stat = mocker.patch("os.stat")
+    mocker.patch(
+        "krux.sd_card.SDHandler.dir_exists",
+        mocker.MagicMock(side_effect=lambda path: path in listings),
+    )
+
+    def delete_file(_file):
+        SDHandler.writes += 1
+        return MENU_RESTART
+
+    BTN_SEQUENCE = (
+        [BUTTON_ENTER]  # Enter subdir
+        + [BUTTON_ENTER]  # Back to parent folder
+        + [BUTTON_PAGE]  # Move to first file
+        + [BUTTON_ENTER]  # "Delete" it
+        + [BUTTON_PAGE_PREV]  # Move to Back
+        + [BUTTON_ENTER]  # Leave file explorer
+    )
+    ctx = create_ctx(mocker, BTN_SEQUENCE)
+    fit_to_line = mocker.spy(FileManager, "fit_to_line")
+    file_manager = FileManager(ctx)
+    assert file_manager.select_file(select_file_handler=delete_file) == ""
+    assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
+
+    # Only items of the pages shown are built, without a stat per entry
+    assert fit_to_line.call_count < 50
+    stat.assert_not_called()
+    # Parent folder listing is reused until something is written to SD
+    assert ilistdir.call_args_list == [
+        mocker.call("/sd"),
+        mocker.call("/sd/subdir"),
+        mocker.call("/sd"),
+    ]
@@ -138,3 +138,28 @@ def test_tc_flash_hash(multiple_devices, mocker):
         assert flash.read.call_count == 4096
         assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
         ctx.display.draw_hcentered_text.assert_has_calls([case[3]], [case[4]])
+
+
+def test_flash_map_reuses_occupancy(amigo, mocker):
+    """Test the flash map is redisplayed without reading flash until it is written."""
+    import flash
+    from krux.firmware import FLASH_SIZE
+    from krux.pages.flash_tools import FlashTools, BLOCK_SIZE
+    from krux.input import BUTTON_ENTER
+
+    mocker.patch.object(flash, "read", return_value=b"\x00" * BLOCK_SIZE)
+    ctx = create_ctx(mocker, [BUTTON_ENTER] * 3)
+    test_tools = FlashTools(ctx)
+
+    test_tools.flash_map()
+    assert flash.read.call_count == FLASH_SIZE // BLOCK_SIZE
+
+    flash.read.reset_mock()
+    test_tools.flash_map()
+    flash.read.assert_not_called()
+
+    # Writing flash, like erasing users' data, drops the cached map
+    test_tools.erase_spiffs()
+    flash.read.reset_mock()
+    test_tools.flash_map()
+    assert flash.read.call_count == FLASH_SIZE // BLOCK_SIZE
@@ -295,3 +295,127 @@ def test_disabled_entry(mocker, m5stickv):
     assert index == menu.back_index
     assert status == MENU_EXIT
     assert ctx.input.wait_for_fastnav_button.call_count == len(BTN_SEQUENCE)
+
+
+def test_run_loop_redraws_only_selection(mocker, m5stickv):
+    from krux.pages import Menu, MENU_CONTINUE, MENU_EXIT
+    from krux.input import BUTTON_ENTER, BUTTON_PAGE, BUTTON_PAGE_PREV
+
+    ctx = mock_context(mocker)
+    ctx.power_manager.battery_charge_remaining.return_value = 1
+    menu = Menu(
+        ctx,
+        [
+            ("Option", lambda: MENU_CONTINUE),
+            ("Long Option", lambda: MENU_CONTINUE),
+            ("Longer Option", lambda: MENU_EXIT),
+        ],
+        back_label=None,
+    )
+    redraw = mocker.spy(menu, "_redraw_selection")
+    ctx.input.wait_for_fastnav_button.side_effect = [
+        BUTTON_PAGE,
+        BUTTON_PAGE,
+        BUTTON_PAGE_PREV,
+        BUTTON_PAGE,
+        BUTTON_ENTER,
+    ]
+
+    index, status = menu.run_loop()
+    assert (index, status) == (2, MENU_EXIT)
+    # Menu is fully drawn once, then the clicked item clears the screen
+    assert ctx.display.clear.call_count == 2
+    assert [c.args for c in redraw.call_args_list] == [(0, 1), (1, 2), (2, 1), (1, 2)]
+
+
+def _pixel_display(mocker, width, height):
+    """Display mock that paints into a framebuffer of (text, color) cells"""
+    from krux.display import FONT_HEIGHT
+
+    screen = [[None] * width for _ in range(height)]
+
+    def fill_rectangle(x, y, w, h, color, radius=0):
+        for row in screen[max(y, 0) : y + h]:
+            row[max(x, 0) : x + w] = [color] * len(row[max(x, 0) : x + w])
+
+    def draw_hcentered_text(text, offset_y, color=1, bg_color=0):
+        x = (width - len(text) * 8) // 2
+        for row in screen[offset_y : offset_y + FONT_HEIGHT]:
+            row[x : x + len(text) * 8] = [(text, color, bg_color)] * (len(text) * 8)
+
+    def clear():
+        fill_rectangle(0, 0, width, height, 0)
+
+    display = mocker.MagicMock(
+        width=mocker.MagicMock(return_value=width),
+        height=mocker.MagicMock(return_value=height),
+        to_lines=lambda text: text.split("|"),
+        max_menu_lines=mocker.MagicMock(return_value=7),
+        fill_rectangle=fill_rectangle,
+        draw_hcentered_text=draw_hcentered_text,
+        clear=clear,
+    )
+    return display, screen
+
+
+def _assert_partial_redraw_matches_full_draw(mocker, draw):
+    from krux.pages import Menu, MENU_CONTINUE
+
+    ctx = mock_context(mocker)
+    ctx.input.buttons_active = True
+    ctx.display, screen = _pixel_display(mocker, 135, 240)
+    menu = Menu(
+        ctx,
+        [
+            ("Option", lambda: MENU_CONTINUE),
+            ("Two|Lines", lambda: MENU_CONTINUE),
+            ("Disabled", None),
+            ("Option", lambda: MENU_CONTINUE),
+            ("Option", lambda: MENU_CONTINUE),
+            ("Option", lambda: MENU_CONTINUE),
+        ],
+    )
+    items = len(menu.menu_view)
+    for previous in range(items):
+        for selected in range(items):
+            ctx.display.clear()
+            draw(menu, selected)
+            menu.draw_status_bar()
+            expected = [row[:] for row in screen]
+
+            ctx.display.clear()
+            draw(menu, previous)
+            menu.draw_status_bar()
+            menu._redraw_selection(previous, selected)
+            assert screen == expected
+
+
+def test_redraw_selection_matches_full_draw(mocker, m5stickv):
+    from krux.pages import Menu
+
+    _assert_partial_redraw_matches_full_draw(mocker, Menu._draw_menu)
+
+
+def test_redraw_selection_matches_full_touch_draw(mocker, amigo):
+    from krux.pages import Menu
+
+    _assert_partial_redraw_matches_full_draw(mocker, Menu._draw_touch_menu)
+
+
+def test_draw_battery_indicator_only_on_change(mocker, amigo):
+    from krux.pages import Menu
+
+    ctx = mock_context(mocker)
+    ctx.power_manager.usb_connected.return_value = False
+    ctx.power_manager.battery_charge_remaining.return_value = 0.8
+    menu = Menu(ctx, [])
+
+    menu.draw_battery_indicator()
+    assert ctx.display.fill_rectangle.call_count == 2
+    menu.draw_battery_indicator()
+    assert ctx.display.fill_rectangle.call_count == 2
+
+    # New level erases the previous one before drawing
+    ctx.power_manager.battery_charge_remaining.return_value = 0.5
+    menu.draw_battery_indicator()
+    assert ctx.display.fill_rectangle.call_count == 5
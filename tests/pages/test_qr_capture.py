@@ -8,10 +8,25 @@ from ..shared_mocks import (
     SNAP_FIND_ANIMATED_SKIPPING,
     SNAP_REPEAT_QRCODE,
     TimeMocker,
+    Mockqrcode,
     mock_context,
 )
 
 
+def frames_snapshot(mocker, frames):
+    """Returns a snapshot mock replaying frames, each a list of payloads"""
+    replay = iter(frames)
+
+    def snapshot():
+        img = mocker.MagicMock()
+        img.width.return_value = 320
+        img.height.return_value = 240
+        img.find_qrcodes.return_value = [Mockqrcode(data) for data in next(replay)]
+        return img
+
+    return snapshot
+
+
 def test_capture_qr_code(mocker, multiple_devices, tdata):
     from krux.pages.qr_capture import QRCodeCapture
     from krux.qr import FORMAT_PMOFN, FORMAT_UR
@@ -261,6 +276,209 @@ def test_capture_qr_code_loop_duplicated_frames(mocker, m5stickv, tdata):
     )
 
 
+def test_capture_qr_code_skips_duplicate_frames(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+    from krux.qr import QRPartParser
+
+    parts = tdata.TEST_PARTS_FORMAT_PMOFN
+    # Animation displayed slower than the camera frame rate
+    frames = [[part] for part in parts for _ in range(3)]
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(ctx.camera, "snapshot", new=frames_snapshot(mocker, frames))
+    spy_parse = mocker.spy(QRPartParser, "parse")
+    spy_accepts = mocker.spy(QRPartParser, "accepts")
+
+    qr_capturer = QRCodeCapture(ctx)
+    qr_code, _ = qr_capturer.qr_capture_loop()
+    assert qr_code == tdata.TEST_DATA_B58
+    assert spy_parse.call_count == len(parts)
+    spy_accepts.assert_not_called()
+    assert qr_capturer.unique_frames == len(parts)
+    # Last part completes the capture on its first frame
+    assert qr_capturer.duplicate_frames == 2 * (len(parts) - 1)
+
+
+def test_capture_qr_code_roi_tracking(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+
+    parts = tdata.TEST_PARTS_FORMAT_PMOFN
+    # Code held still for two parts, then moved to the other side of the frame
+    rects = [(20, 40, 100, 100), (24, 44, 100, 100), (200, 120, 100, 100)]
+    replay = iter(zip(parts, rects))
+    searched = []
+
+    def snapshot():
+        part, (x, y, w, h) = next(replay)
+
+        def find_qrcodes(roi=(0, 0, 320, 240)):
+            searched.append(roi)
+            roi_x, roi_y, roi_w, roi_h = roi
+            if (
+                roi_x <= x
+                and roi_y <= y
+                and x + w <= roi_x + roi_w
+                and y + h <= roi_y + roi_h
+            ):
+                return [Mockqrcode(part, (x, y, w, h))]
+            return []
+
+        img = mocker.MagicMock()
+        img.width.return_value = 320
+        img.height.return_value = 240
+        img.find_qrcodes.side_effect = find_qrcodes
+        return img
+
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(ctx.camera, "snapshot", new=snapshot)
+
+    qr_capturer = QRCodeCapture(ctx)
+    qr_code, _ = qr_capturer.qr_capture_loop()
+    assert qr_code == tdata.TEST_DATA_B58
+    assert searched == [
+        (0, 0, 320, 240),
+        # ROI padded by half the code size, clamped to the frame
+        (0, 0, 170, 190),
+        # Missed on the ROI tracked from the second code, found on full frame
+        (0, 0, 174, 194),
+        (0, 0, 320, 240),
+    ]
+    assert (qr_capturer.roi_hits, qr_capturer.roi_misses) == (1, 1)
+    assert qr_capturer.roi_hit_rate() == 0.5
+
+
+def test_capture_qr_code_roi_replay_benchmark(mocker, m5stickv):
+    from krux.pages.qr_capture import QRCodeCapture
+
+    # Animated code held still on screen, camera shaking a few pixels
+    total = 20
+    parts = ["p%dof%d %02d" % (i + 1, total, i) for i in range(total)]
+    rects = [(110 + i % 3, 70 + i % 2, 100, 100) for i in range(total)]
+    replay = iter(zip(parts, rects))
+    searched_pixels = []
+
+    def snapshot():
+        part, rect = next(replay)
+
+        def find_qrcodes(roi=(0, 0, 320, 240)):
+            searched_pixels.append(roi[2] * roi[3])
+            return [Mockqrcode(part, rect)]
+
+        img = mocker.MagicMock()
+        img.width.return_value = 320
+        img.height.return_value = 240
+        img.find_qrcodes.side_effect = find_qrcodes
+        return img
+
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(ctx.camera, "snapshot", new=snapshot)
+
+    qr_capturer = QRCodeCapture(ctx)
+    qr_code, _ = qr_capturer.qr_capture_loop()
+    assert qr_code == "".join("%02d" % i for i in range(total))
+    # Every frame after the first was found within the ROI
+    assert (qr_capturer.roi_hits, qr_capturer.roi_misses) == (total - 1, 0)
+    assert qr_capturer.roi_hit_rate() == 1
+    # A 200x200 padded ROI is 52% of the pixels of a full frame
+    assert len(searched_pixels) == total
+    assert sum(searched_pixels[1:]) == (total - 1) * 200 * 200
+
+
+def test_capture_qr_code_roi_not_tracked_for_several_codes(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+
+    parts = tdata.TEST_PARTS_FORMAT_PMOFN
+    frames = [[parts[0], parts[1]], [parts[2]]]
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(ctx.camera, "snapshot", new=frames_snapshot(mocker, frames))
+    qr_capturer = QRCodeCapture(ctx)
+    track_roi = mocker.spy(qr_capturer, "track_roi")
+
+    qr_code, _ = qr_capturer.qr_capture_loop()
+    assert qr_code == tdata.TEST_DATA_B58
+    # Only the single-code frame was tracked
+    track_roi.assert_called_once()
+
+
+def test_capture_qr_code_multiple_codes_per_frame(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+    from krux.qr import FORMAT_PMOFN
+    from krux.wdt import wdt
+
+    data = tdata.TEST_DATA_B58 * 3
+    total = 9
+    size = -(-len(data) // total)
+    parts = [
+        "p%dof%d %s" % (i + 1, total, data[i * size : (i + 1) * size])
+        for i in range(total)
+    ]
+    # Replay of an animation where each frame tears across two parts
+    frames = [[parts[(2 * i) % total], parts[(2 * i + 1) % total]] for i in range(20)]
+
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    frame_counts = []
+    for replay in (
+        [frame[:1] for frame in frames],  # Only the first code of each frame
+        frames,
+    ):
+        ctx = create_ctx(mocker, None)
+        mocker.patch.object(ctx.camera, "snapshot", new=frames_snapshot(mocker, replay))
+        spy_wdt = mocker.spy(wdt, "feed")
+        qr_code, qr_format = QRCodeCapture(ctx).qr_capture_loop()
+        assert qr_code == data
+        assert qr_format == FORMAT_PMOFN
+        frame_counts.append(spy_wdt.call_count)
+        mocker.stop(spy_wdt)
+
+    assert frame_counts == [total, (total + 1) // 2]
+
+
+def test_capture_qr_code_skips_repeated_and_foreign_codes(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+    from krux.qr import QRPartParser
+
+    parts = tdata.TEST_PARTS_FORMAT_PMOFN
+    frames = [
+        [parts[0], parts[0], "foreign code"],
+        [parts[0]],
+        [tdata.TEST_PARTS_FORMAT_MULTIPART_BBQR[0], parts[1], parts[2]],
+    ]
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(ctx.camera, "snapshot", new=frames_snapshot(mocker, frames))
+    spy_parse = mocker.spy(QRPartParser, "parse")
+
+    qr_code, _ = QRCodeCapture(ctx).qr_capture_loop()
+    assert qr_code == tdata.TEST_DATA_B58
+    assert [c.args[1] for c in spy_parse.call_args_list] == [
+        parts[0],
+        parts[1],
+        parts[2],
+    ]
+
+
+def test_capture_qr_code_sheet(mocker, m5stickv, tdata):
+    from krux.pages.qr_capture import QRCodeCapture
+    from krux.qr import FORMAT_BBQR
+
+    # A printed sheet with every BBQr part, the first frame catching only some
+    sheet = tdata.TEST_PARTS_FORMAT_MULTIPART_BBQR[::-1]
+    mocker.patch("time.ticks_ms", TimeMocker(1000).tick)
+
+    ctx = create_ctx(mocker, None)
+    mocker.patch.object(
+        ctx.camera, "snapshot", new=frames_snapshot(mocker, [sheet[:2], sheet])
+    )
+    qr_code, qr_format = QRCodeCapture(ctx).qr_capture_loop()
+    assert qr_code == tdata.TEST_DATA_BBQR_MULTI
+    assert qr_format == FORMAT_BBQR
+    # Both parts of the first frame were highlighted at once
+    assert ctx.display.fill_rectangle.call_count == 2
+
+
 def test_qr_str_to_bytes(mocker, m5stickv):
     from krux.pages.qr_capture import qr_str_to_bytes
     from ur.ur import UR
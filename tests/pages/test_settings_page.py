@@ -493,6 +493,25 @@ def test_encryption_pbkdf2_setting(m5stickv, mocker):
     assert Settings().encryption.pbkdf2_iterations == 110000
 
 
+def test_encryption_key_cache_setting(m5stickv, mocker):
+    from krux.pages.settings_page import SettingsPage
+    from krux.krux_settings import EncryptionSettings
+    from krux import kef
+
+    ctx = mock_context(mocker)
+    settings_page = SettingsPage(ctx)
+
+    settings_page._category_change_special_cases(EncryptionSettings.key_cache, True)
+    assert kef.key_cache.enabled
+    kef.Cipher(b"key", b"salt", 10000)
+    cached = list(kef.key_cache.keys.values())
+
+    settings_page._category_change_special_cases(EncryptionSettings.key_cache, False)
+    assert not kef.key_cache.enabled
+    assert kef.key_cache.keys == {}
+    assert not any(cached[0])
+
+
 def test_restore_settings(amigo, mocker, mocker_sd_card_ok):
     from krux.pages.settings_page import SettingsPage
     from krux.settings import FLASH_PATH, SETTINGS_FILENAME
@@ -500,6 +519,7 @@ def test_restore_settings(amigo, mocker, mocker_sd_card_ok):
 
     BTN_SEQUENCE = [BUTTON_ENTER]  # Confirm restore
 
+    invalidate = mocker.patch("krux.flash_occupancy.invalidate")
     with patch("os.remove") as mock_remove:
         with patch("krux.sd_card.SDHandler.delete") as mock_delete_sd:
             ctx = create_ctx(mocker, BTN_SEQUENCE)
@@ -507,6 +527,7 @@ def test_restore_settings(amigo, mocker, mocker_sd_card_ok):
             settings_page.restore_settings()
     mock_delete_sd.assert_called_once_with(SETTINGS_FILENAME)
     mock_remove.assert_called_once_with("/" + FLASH_PATH + "/" + SETTINGS_FILENAME)
+    invalidate.assert_called_once()
     assert ctx.input.wait_for_button.call_count == len(BTN_SEQUENCE)
 
 
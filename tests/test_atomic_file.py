@@ -0,0 +1,65 @@
+def test_write_and_read(tmp_path):
+    from krux import atomic_file
+
+    path = str(tmp_path / "settings.json")
+
+    assert atomic_file.write(path, '{"a": 1}') is True
+    assert atomic_file.read(path) == '{"a": 1}'
+
+    assert atomic_file.write(path, '{"a": 2}') is True
+    assert atomic_file.read(path) == '{"a": 2}'
+    # No temporary file or journal left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["settings.json"]
+
+
+def test_write_skips_unchanged_contents(mocker, tmp_path):
+    from krux import atomic_file
+
+    path = str(tmp_path / "settings.json")
+    atomic_file.write(path, '{"a": 1}')
+
+    mo = mocker.patch("krux.atomic_file.open", wraps=open)
+    assert atomic_file.write(path, '{"a": 1}') is False
+    mo.assert_called_once_with(path, "r")
+
+    # Current contents given by caller, file is not even read
+    mo.reset_mock()
+    assert atomic_file.write(path, '{"a": 1}', '{"a": 1}') is False
+    mo.assert_not_called()
+
+
+def test_recover_interrupted_write(tmp_path):
+    from krux import atomic_file
+    from krux.atomic_file import TEMP_SUFFIX, JOURNAL_SUFFIX
+
+    path = str(tmp_path / "seeds.json")
+
+    def make(files):
+        for p in tmp_path.iterdir():
+            p.unlink()
+        for suffix, contents in files.items():
+            with open(path + suffix, "w") as f:
+                f.write(contents)
+
+    # Interrupted while writing the temporary file: current file is kept
+    make({"": "old", TEMP_SUFFIX: "ne"})
+    assert atomic_file.read(path) == "old"
+
+    # Interrupted before the new file was renamed: new file is complete
+    make({JOURNAL_SUFFIX: "old", TEMP_SUFFIX: "new"})
+    assert atomic_file.read(path) == "new"
+
+    # Journal is the only complete version left
+    make({JOURNAL_SUFFIX: "old"})
+    assert atomic_file.read(path) == "old"
+
+    # Interrupted before the journal was removed
+    make({"": "new", JOURNAL_SUFFIX: "old"})
+    assert atomic_file.read(path) == "new"
+    assert not (tmp_path / ("seeds.json" + JOURNAL_SUFFIX)).exists()
+
+    # Writes also recover first, a stale temporary file is overwritten
+    make({JOURNAL_SUFFIX: "old", TEMP_SUFFIX: "new"})
+    assert atomic_file.write(path, "newer") is True
+    assert atomic_file.read(path) == "newer"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["seeds.json"]
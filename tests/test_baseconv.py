@@ -292,3 +292,59 @@ def test_hint_encodings_does_not_validate(mocker, m5stickv):
     # no test for ascii, checking max(ord) <= 127 will always be correct
     # no test for latin-1, it doesn't exist in uPython, but range will be correct
     # no test for utf-8, yet; but some byte-combos are not allowed in utf-8
+
+
+def limb_free_base_decode(v, base):
+    """Previous digit by digit decoder, kept as reference"""
+    from krux.baseconv import B58CHARS, B43CHARS
+
+    chars = B58CHARS if base == 58 else B43CHARS
+    long_value = 0
+    power_of_base = 1
+    for char in reversed(v):
+        long_value += chars.find(char) * power_of_base
+        power_of_base *= base
+    result = bytearray()
+    while long_value >= 256:
+        long_value, mod = divmod(long_value, 256)
+        result.append(mod)
+    if long_value > 0:
+        result.append(long_value)
+    n_pad = len(v) - len(v.lstrip(chars[0]))
+    return b"\x00" * n_pad + bytes(reversed(result))
+
+
+def limb_free_base_encode(v, base):
+    """Previous digit by digit encoder, kept as reference"""
+    from krux.baseconv import B58CHARS, B43CHARS
+
+    chars = B58CHARS if base == 58 else B43CHARS
+    long_value = 0
+    power_of_base = 1
+    for char in reversed(v):
+        long_value += power_of_base * char
+        power_of_base <<= 8
+    result = []
+    while long_value >= base:
+        long_value, mod = divmod(long_value, base)
+        result.append(chars[mod])
+    if long_value > 0:
+        result.append(chars[long_value])
+    n_pad = len(v) - len(v.lstrip(b"\x00"))
+    return chars[0] * n_pad + "".join(reversed(result))
+
+
+def test_base_codec_matches_limb_free():
+    import random
+    from krux.baseconv import pure_python_base_decode, pure_python_base_encode
+
+    for size in (1024, 10240, 51200):
+        rng = random.Random(size)
+        data = b"\x00\x00" + rng.getrandbits(8 * (size - 2)).to_bytes(size - 2, "big")
+        for base in (43, 58):
+            encoded = pure_python_base_encode(data, base)
+            assert pure_python_base_decode(encoded, base) == data
+            if size == 1024:
+                # Limb-free conversion is quadratic, only compared on small input
+                assert limb_free_base_encode(data, base) == encoded
+                assert limb_free_base_decode(encoded, base) == data
@@ -295,20 +295,20 @@ def test_deflate_decompress_invalid_data(m5stickv):
 
 def test_decode_bbqr_descriptors(m5stickv):
     from krux.qr import detect_format
-    from krux.bbqr import decode_bbqr, parse_bbqr
+    from krux.bbqr import decode_bbqr_part, join_bbqr, parse_bbqr
 
     for encoded, decoded in zip(BBQR_ENCODED_DESCRIPTORS, BBQR_DECODED_DESCRIPTORS):
         parts = {}
         _, bbqr = detect_format(encoded[0])
         for encoded_part in encoded:
             part, index, total = parse_bbqr(encoded_part)
-            parts[index] = part
-        assert decode_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
+            parts[index] = decode_bbqr_part(part, bbqr.encoding)
+        assert join_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
 
 
 def test_decode_bbqr_json_non_compressed_descriptors(m5stickv):
     from krux.qr import detect_format
-    from krux.bbqr import decode_bbqr, parse_bbqr
+    from krux.bbqr import decode_bbqr_part, join_bbqr, parse_bbqr
 
     for encoded, decoded in zip(
         BBQR_ENCODED_JSON_DESCRIPTOR, BBQR_DECODED_JSON_DESCRIPTOR
@@ -317,46 +317,46 @@ def test_decode_bbqr_json_non_compressed_descriptors(m5stickv):
         _, bbqr = detect_format(encoded[0])
         for encoded_part in encoded:
             part, index, total = parse_bbqr(encoded_part)
-            parts[index] = part
-        assert decode_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
+            parts[index] = decode_bbqr_part(part, bbqr.encoding)
+        assert join_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
 
 
 def test_decode_bbqr_psbts(m5stickv):
     from krux.qr import detect_format
-    from krux.bbqr import decode_bbqr, parse_bbqr
+    from krux.bbqr import decode_bbqr_part, join_bbqr, parse_bbqr
 
     for encoded, decoded in zip(BBQR_ENCODED_PSBTS, BBQR_DECODED_PSBTS):
         parts = {}
         _, bbqr = detect_format(encoded[0])
         for encoded_part in encoded:
             part, index, total = parse_bbqr(encoded_part)
-            parts[index] = part
-        assert decode_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
+            parts[index] = decode_bbqr_part(part, bbqr.encoding)
+        assert join_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
 
 
 def test_decode_hex_encoded_psbt(m5stickv):
     from krux.qr import detect_format
-    from krux.bbqr import decode_bbqr, parse_bbqr
+    from krux.bbqr import decode_bbqr_part, join_bbqr, parse_bbqr
 
     parts = {}
     _, bbqr = detect_format(HEX_ENCODED_SIGNED_PSBT[0])
     for encoded_part in HEX_ENCODED_SIGNED_PSBT:
         part, index, total = parse_bbqr(encoded_part)
-        parts[index] = part
-    assert decode_bbqr(parts, bbqr.encoding, bbqr.file_type) == HEX_DECODED_SIGNED_PSBT
+        parts[index] = decode_bbqr_part(part, bbqr.encoding)
+    assert join_bbqr(parts, bbqr.encoding, bbqr.file_type) == HEX_DECODED_SIGNED_PSBT
 
 
 def test_decode_non_compressed_bbqr_psbts(m5stickv):
     from krux.qr import detect_format
-    from krux.bbqr import decode_bbqr, parse_bbqr
+    from krux.bbqr import decode_bbqr_part, join_bbqr, parse_bbqr
 
     for encoded, decoded in zip(BBQR_NON_COMPRESSED_ENCODED_PSBTS, BBQR_DECODED_PSBTS):
         parts = {}
         _, bbqr = detect_format(encoded[0])
         for encoded_part in encoded:
             part, index, total = parse_bbqr(encoded_part)
-            parts[index] = part
-        assert decode_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
+            parts[index] = decode_bbqr_part(part, bbqr.encoding)
+        assert join_bbqr(parts, bbqr.encoding, bbqr.file_type) == decoded
 
 
 def test_encode_bbqr_descriptors(m5stickv):
@@ -448,3 +448,80 @@ def test_int2base36():
         int2base36(-1)
     with pytest.raises(ValueError):
         int2base36(1296)
+
+
+def test_parser_decodes_bbqr_parts_on_arrival(m5stickv):
+    from krux.qr import QRPartParser
+    from krux.bbqr import decode_bbqr_part, parse_bbqr
+
+    for encoded, decoded in zip(BBQR_ENCODED_PSBTS, BBQR_DECODED_PSBTS):
+        parser = QRPartParser()
+        for encoded_part in encoded:
+            parser.parse(encoded_part)
+            part, index, _ = parse_bbqr(encoded_part)
+            assert parser.parts[index] == decode_bbqr_part(part, "Z")
+        # Redundant parts are not decoded again
+        parser.parse(encoded[0])
+        assert parser.is_complete()
+        assert parser.result() == decoded
+
+    parser = QRPartParser()
+    for encoded_part in HEX_ENCODED_SIGNED_PSBT:
+        parser.parse(encoded_part)
+    assert parser.is_complete()
+    assert parser.result() == HEX_DECODED_SIGNED_PSBT
+
+
+def test_parser_assembles_40_part_bbqr(m5stickv):
+    import os
+    from krux.qr import QRPartParser
+    from krux.bbqr import encode_bbqr, int2base36
+
+    data = os.urandom(40 * 500)
+    payload = encode_bbqr(data, encoding="2", file_type="P").payload
+    part_size = 8 * ((len(payload) // 40 + 7) // 8)
+    chunks = [payload[i : i + part_size] for i in range(0, len(payload), part_size)]
+    assert len(chunks) == 40
+
+    parser = QRPartParser()
+    for i, chunk in enumerate(chunks):
+        parser.parse("B$2P" + int2base36(len(chunks)) + int2base36(i) + chunk)
+    assert parser.is_complete()
+
+    assert parser.result() == data
+
+
+def test_parser_defers_bbqr_decoding_errors_to_result(m5stickv):
+    from krux.qr import QRPartParser
+
+    parser = QRPartParser()
+    # Header is valid, but "1" is not base32
+    assert parser.parse("B$2U0200" + "1" * 8) is None
+    assert parser.parse("B$2U0201" + "A" * 8) == 1
+    assert parser.parsed_count() == 1
+    assert not parser.is_complete()
+    # Capture aborted before the part was scanned again
+    with pytest.raises(ValueError, match="Invalid BBQR part"):
+        parser.result()
+
+
+def test_parser_retries_bbqr_parts_that_failed_to_decode(m5stickv):
+    import os
+    from krux.qr import QRPartParser
+    from krux.bbqr import encode_bbqr
+
+    data = os.urandom(100)
+    payload = encode_bbqr(data, encoding="2", file_type="P").payload
+    chunks = [payload[:80], payload[80:]]
+
+    parser = QRPartParser()
+    # First scan of part 0 is corrupted, "1" is not base32
+    parser.parse("B$2P0200" + "1" * 80)
+    parser.parse("B$2P0201" + chunks[1])
+    assert 0 not in parser.parts
+    assert parser.parsed_count() == 1
+    assert not parser.is_complete()
+    # A good rescan of part 0 completes the capture
+    assert parser.parse("B$2P0200" + chunks[0]) == 0
+    assert parser.is_complete()
+    assert parser.result() == data
@@ -101,3 +101,67 @@ def test_invalid_mnemonic_length():
     for case in cases:
         with pytest.raises(ValueError, match="Invalid recovery phrase"):
             kruxbip39.k_mnemonic_bytes(case)
+
+
+def naive_next_letters(wordlist, prefix):
+    return {
+        word[len(prefix)]
+        for word in wordlist
+        if word.startswith(prefix) and len(word) > len(prefix)
+    }
+
+
+def naive_completion(wordlist, prefix):
+    matches = [word for word in wordlist if word.startswith(prefix)]
+    return matches[0] if prefix and len(matches) == 1 else None
+
+
+def test_prefix_index():
+    prefixes = {""}
+    for word in WORDLIST:
+        for length in range(1, len(word) + 1):
+            prefixes.add(word[:length])
+    prefixes.update(["x", "zz", "abz", "yq"])
+
+    index = kruxbip39.WORDLIST_PREFIXES
+    for prefix in prefixes:
+        assert index.next_letters(prefix) == naive_next_letters(WORDLIST, prefix)
+        assert index.completion(prefix) == naive_completion(WORDLIST, prefix)
+
+    for i, word in enumerate(WORDLIST):
+        assert index.index(word) == i
+    with pytest.raises(ValueError, match="not in the dictionary"):
+        index.index("notaword")
+
+
+def test_prefix_index_custom_wordlist(m5stickv):
+    from krux.key import Key
+
+    words = bip39.mnemonic_from_bytes(secrets.token_bytes(16)).split()
+    candidates = Key.get_final_word_candidates(words[:-1])
+    index = kruxbip39.PrefixIndex(candidates)
+    for word in candidates:
+        assert index.index(word) == candidates.index(word)
+        for length in range(len(word) + 1):
+            prefix = word[:length]
+            assert index.next_letters(prefix) == naive_next_letters(candidates, prefix)
+            assert index.completion(prefix) == naive_completion(candidates, prefix)
+    with pytest.raises(ValueError):
+        index.index("zoo" if "zoo" not in candidates else "abandon")
+
+
+def test_prefix_index_keystrokes():
+    index = kruxbip39.WORDLIST_PREFIXES
+    words = bip39.mnemonic_from_bytes(bytes(range(32))).split()
+    keystrokes = [word[:length] for word in words for length in range(len(word))]
+
+    for prefix in keystrokes:
+        assert index.next_letters(prefix) == naive_next_letters(WORDLIST, prefix)
+        assert index.completion(prefix) == naive_completion(WORDLIST, prefix)
+
+    naive_accumulator = 0
+    accumulator = 0
+    for word in words[:-1]:
+        naive_accumulator = (naive_accumulator << 11) + WORDLIST.index(word)
+        accumulator = (accumulator << 11) + index.index(word)
+    assert accumulator == naive_accumulator
@@ -0,0 +1,92 @@
+import pytest
+
+
+def naive_bit(code, size, x, y):
+    index = y * size + x
+    return (code[index >> 3] >> (index % 8)) & 1
+
+
+@pytest.fixture
+def qr_code():
+    import random
+
+    rng = random.Random(1248)
+    size = 29
+    code = bytearray(rng.getrandbits(8) for _ in range((size * size + 7) >> 3))
+    return code, size
+
+
+def test_get_row(qr_code):
+    from krux.bit_matrix import get_row
+
+    code, size = qr_code
+    for y in range(size):
+        value = get_row(code, size, y)
+        for x in range(size):
+            assert (value >> x) & 1 == naive_bit(code, size, x, y)
+        assert value >> size == 0
+
+
+def test_frame(qr_code):
+    from krux.bit_matrix import frame
+
+    code, size = qr_code
+    framed, new_size = frame(code, size)
+    assert new_size == size + 2
+    assert len(framed) == (new_size * new_size + 7) >> 3
+    for y in range(new_size):
+        for x in range(new_size):
+            expected = 0
+            if 0 < x < new_size - 1 and 0 < y < new_size - 1:
+                expected = naive_bit(code, size, x - 1, y - 1)
+            assert naive_bit(framed, new_size, x, y) == expected
+
+
+def test_scale_row_and_msb_bytes():
+    from krux.bit_matrix import scale_row, scale_table, row_msb_bytes
+
+    # Columns 0, 2 and 3 dark
+    assert scale_row(0b1101, 4, 1) == 0b1101
+    assert scale_row(0b1101, 4, 2) == 0b11110011
+    assert scale_row(0b1101, 4, 3) == 0b111111000111
+    table = scale_table(3)
+    assert scale_row(0b1101, 4, 3, table) == 0b111111000111
+    assert scale_row(0xFF01, 16, 3, table) == 0b111 | ((1 << 24) - 1) << 24
+    assert row_msb_bytes(0b1101, 4) == bytearray([0b10110000])
+    assert row_msb_bytes(0b1 | 1 << 8, 9) == bytearray([0x80, 0x80])
+
+
+def test_row_runs():
+    from krux.bit_matrix import row_runs
+
+    assert list(row_runs(0)) == []
+    assert list(row_runs(0b1110011)) == [(0, 2), (4, 3)]
+    assert list(row_runs(1 << 40 | 1 << 41)) == [(40, 2)]
+
+
+def test_pbm_rows_match_naive(qr_code):
+    from krux.bit_matrix import frame, get_row, row_msb_bytes
+
+    code, size = qr_code
+
+    def naive_pbm(code, size):
+        data = bytearray()
+        for row in range(size):
+            byte = 0
+            for col in range(size):
+                bit_index = row * size + col
+                if code[bit_index >> 3] & (1 << (bit_index % 8)):
+                    byte |= 1 << (7 - (col % 8))
+                if col % 8 == 7 or col == size - 1:
+                    data.append(byte)
+                    byte = 0
+        return data
+
+    code, size = frame(code, size)
+    result = bytearray()
+    # A single row buffer is reused for every row
+    row_bytes = bytearray((size + 7) >> 3)
+    for row in range(size):
+        assert row_msb_bytes(get_row(code, size, row), size, row_bytes) is row_bytes
+        result.extend(row_bytes)
+    assert result == naive_pbm(code, size)
@@ -27,6 +27,42 @@ def test_clear(mocker, m5stickv):
     assert c.wallet is None
 
 
+def test_clear_evicts_key_cache(mocker, m5stickv):
+    mock_modules(mocker)
+    from krux.context import Context
+    from krux.krux_settings import Settings
+    from krux import kef
+
+    Settings().encryption.key_cache = True
+    c = Context()
+    assert kef.key_cache.enabled
+    kef.Cipher(b"key", b"salt", 10000)
+    assert len(kef.key_cache.keys) == 1
+
+    c.clear()
+
+    assert kef.key_cache.keys == {}
+    kef.key_cache.clear(disable=True)
+    Settings().encryption.key_cache = False
+
+
+def test_clear_evicts_lines_cache(mocker, m5stickv):
+    mock_modules(mocker)
+    from krux.context import Context
+    from krux.display import Display
+
+    mocker.patch("krux.display.lcd.width", return_value=135)
+    mocker.patch("krux.display.lcd.height", return_value=240)
+    c = Context()
+    c.display = Display()
+    c.display.to_lines("abandon " * 11 + "about")
+    assert len(c.display._lines_cache) == 1
+
+    c.clear()
+
+    assert len(c.display._lines_cache) == 0
+
+
 def test_is_logged_in(mocker, m5stickv):
     from krux.key import TYPE_SINGLESIG
 
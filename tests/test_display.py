@@ -1066,3 +1066,61 @@ def test_offset(mocker, multiple_devices):
     else:
         assert d.qr_offset() == d.width() + MINIMAL_PADDING
     assert d.qr_offset(10) == 10 + MINIMAL_PADDING
+
+
+def test_to_lines_endpos_cache(mocker, m5stickv):
+    from krux.display import Display, LINES_CACHE_SIZE, LINES_CACHE_MAX_TEXT
+
+    mocker.patch("krux.display.lcd.width", return_value=135)
+    mocker.patch("krux.display.lcd.height", return_value=240)
+    d = Display()
+    d.to_portrait()
+    mocker.spy(d, "_wrap_text")
+
+    text = "More Than Two Words"
+    lines = d.to_lines(text)
+    assert lines == ["More Than Two", "Words"]
+    assert d.to_lines(text) == lines
+    assert d.to_lines_endpos(text) == (lines, len(text))
+    assert d._wrap_text.call_count == 1
+
+    # Editing returned lines leaves cached lines untouched
+    lines[-1] = "Edited"
+    assert d.to_lines(text) == ["More Than Two", "Words"]
+    assert d.to_lines(text) is not d.to_lines(text)
+    assert d._wrap_text.call_count == 1
+
+    # max_lines is part of the key
+    assert d.to_lines_endpos(text, 1)[0] == ["More Than Two…"]
+    assert d._wrap_text.call_count == 2
+
+    # Changing orientation drops cached results
+    d.to_landscape()
+    assert d.to_lines(text) == [text]
+    assert d._wrap_text.call_count == 3
+
+    # Changing locale wraps again
+    mock_settings = mocker.MagicMock()
+    mock_settings.i18n.locale = "ko-KR"
+    mocker.patch("krux.display.Settings", return_value=mock_settings)
+    d.to_lines(text)
+    assert d._wrap_text.call_count == 4
+
+    # Cache is bounded and evicts least recently used texts
+    for i in range(LINES_CACHE_SIZE):
+        d.to_lines("item %d" % i)
+    assert len(d._lines_cache) == LINES_CACHE_SIZE
+    d.to_lines("item 0")
+    d.to_lines("new item")
+    calls = d._wrap_text.call_count
+    d.to_lines("item 0")
+    assert d._wrap_text.call_count == calls
+    d.to_lines("item 1")
+    assert d._wrap_text.call_count == calls + 1
+
+    # Long texts are not cached
+    long_text = "a" * (LINES_CACHE_MAX_TEXT + 1)
+    d.to_lines(long_text)
+    d.to_lines(long_text)
+    assert d._wrap_text.call_count == calls + 3
+    assert len(d._lines_cache) == LINES_CACHE_SIZE
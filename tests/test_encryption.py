@@ -1,4 +1,5 @@
 import pytest
+import json
 from unittest.mock import patch
 from Crypto.Cipher import AES
 import base64
@@ -99,6 +100,14 @@ SEEDS_JSON = (
 I_VECTOR = b"OR\xa1\x93l>2q \x9e\x9dd\x05\x9e\xd7\x8e"
 
 
+def new_log(entry_json):
+    """Returns a new mnemonics log adding the single entry of entry_json"""
+    from krux.encryption import MNEMONICS_LOG_HEADER
+
+    ((mnemonic_id, value),) = json.loads(entry_json).items()
+    return MNEMONICS_LOG_HEADER + json.dumps([mnemonic_id, value["b64_kef"]])
+
+
 @pytest.fixture
 def mock_file_operations(mocker):
     mocker.patch(
@@ -256,10 +265,68 @@ def test_load_decrypt_gcm(m5stickv, mock_file_operations):
     assert storage.decrypt("wrong", "KEFgcmID", sd_card=True) == None
 
 
+def test_decrypt_all_stored(m5stickv, mocker, mock_file_operations):
+    from krux.encryption import MnemonicStorage
+    from krux import kef
+
+    storage = MnemonicStorage()
+    cipher_spy = mocker.spy(kef, "Cipher")
+    matches, stats = storage.decrypt_all(TEST_KEY)
+
+    # 6 entries on flash and the same 6 on SD card
+    assert stats["envelopes"] == 12
+    # KEF envelopes are grouped by (id, iterations) across flash and SD card
+    assert cipher_spy.call_count == 4
+    assert stats["key_derivations"] == 4 + 4
+    assert stats["matches"] == len(matches) == 12
+    assert set(matches) == {
+        (mnemonic_id, sd_card, words)
+        for mnemonic_id, words in (
+            ("KEFecbID", ECB_WORDS),
+            ("KEFcbcID", CBC_WORDS),
+            ("KEFctrID", CTR_WORDS),
+            ("KEFgcmID", GCM_WORDS),
+            ("ecbID", ECB_WORDS),
+            ("cbcID", CBC_WORDS),
+        )
+        for sd_card in (False, True)
+    }
+
+    matches, stats = storage.decrypt_all("wrong")
+    assert matches == []
+    assert stats["matches"] == 0
+
+
+def test_decrypt_all_skips_payloads_that_are_not_mnemonics(m5stickv):
+    from krux.encryption import MnemonicStorage
+    from krux.baseconv import base_encode
+    from krux import kef
+
+    # Decrypts fine under the key, but 5 bytes are no mnemonic entropy
+    version = 20
+    payload = kef.Cipher(TEST_KEY, "notWordsID", 100000).encrypt(
+        b"\x01" * 5, version, iv=b"\x07" * kef.MODE_IVS[kef.MODE_GCM]
+    )
+    envelope = kef.wrap("notWordsID", version, 100000, payload)
+
+    storage = MnemonicStorage()
+    storage._stored = {
+        False: {
+            "notWordsID": {"b64_kef": base_encode(envelope, 64)},
+            "KEFgcmID": {"b64_kef": base_encode(KEF_ENVELOPE_GCM, 64)},
+        },
+        True: {},
+    }
+    matches, stats = storage.decrypt_all(TEST_KEY)
+    assert matches == [("KEFgcmID", False, GCM_WORDS)]
+    assert stats["envelopes"] == 2
+
+
 def test_encrypt_ecb_flash(m5stickv, mocker):
     from krux.krux_settings import Settings
     from krux.encryption import MnemonicStorage
 
+    mocker.patch("krux.atomic_file.open", new=mocker.mock_open(read_data="{}"))
     with patch("krux.encryption.open", new=mocker.mock_open(read_data="{}")) as m:
         storage = MnemonicStorage()
         Settings().encryption.version = "AES-ECB"
@@ -267,13 +334,14 @@ def test_encrypt_ecb_flash(m5stickv, mocker):
             "KEFecbID", KEF_ENVELOPE_ECB, sd_card=False
         )
     assert success is True
-    m().write.assert_called_once_with(KEF_ECBENTROPY_ONLY_JSON)
+    m().write.assert_called_once_with(new_log(KEF_ECBENTROPY_ONLY_JSON))
 
 
 def test_encrypt_cbc_flash(m5stickv, mocker):
     from krux.krux_settings import Settings
     from krux.encryption import MnemonicStorage
 
+    mocker.patch("krux.atomic_file.open", new=mocker.mock_open(read_data="{}"))
     with patch("krux.encryption.open", new=mocker.mock_open(read_data="{}")) as m:
         storage = MnemonicStorage()
         Settings().encryption.version = "AES-CBC"
@@ -281,13 +349,14 @@ def test_encrypt_cbc_flash(m5stickv, mocker):
             "KEFcbcID", KEF_ENVELOPE_CBC, sd_card=False
         )
     assert success is True
-    m().write.assert_called_once_with(KEF_CBCENTROPY_ONLY_JSON)
+    m().write.assert_called_once_with(new_log(KEF_CBCENTROPY_ONLY_JSON))
 
 
 def test_encrypt_ctr_flash(m5stickv, mocker):
     from krux.krux_settings import Settings
     from krux.encryption import MnemonicStorage
 
+    mocker.patch("krux.atomic_file.open", new=mocker.mock_open(read_data="{}"))
     with patch("krux.encryption.open", new=mocker.mock_open(read_data="{}")) as m:
         storage = MnemonicStorage()
         Settings().encryption.version = "AES-CTR"
@@ -295,13 +364,14 @@ def test_encrypt_ctr_flash(m5stickv, mocker):
             "KEFctrID", KEF_ENVELOPE_CTR, sd_card=False
         )
     assert success is True
-    m().write.assert_called_once_with(KEF_CTRENTROPY_ONLY_JSON)
+    m().write.assert_called_once_with(new_log(KEF_CTRENTROPY_ONLY_JSON))
 
 
 def test_encrypt_gcm_flash(m5stickv, mocker):
     from krux.krux_settings import Settings
     from krux.encryption import MnemonicStorage
 
+    mocker.patch("krux.atomic_file.open", new=mocker.mock_open(read_data="{}"))
     with patch("krux.encryption.open", new=mocker.mock_open(read_data="{}")) as m:
         storage = MnemonicStorage()
         Settings().encryption.version = "AES-GCM"
@@ -309,7 +379,7 @@ def test_encrypt_gcm_flash(m5stickv, mocker):
             "KEFgcmID", KEF_ENVELOPE_GCM, sd_card=False
         )
     assert success is True
-    m().write.assert_called_once_with(KEF_GCMENTROPY_ONLY_JSON)
+    m().write.assert_called_once_with(new_log(KEF_GCMENTROPY_ONLY_JSON))
 
 
 def test_encrypt_ecb_sd(m5stickv, mocker, mock_file_operations):
@@ -373,7 +443,11 @@ def test_delete_from_flash(m5stickv, mocker):
 
     # Loads a seeds.json file with many entries
     # Deletes "KEFecbID" and assures the rest remain
-    with patch("krux.encryption.open", new=mocker.mock_open(read_data=SEEDS_JSON)) as m:
+    mocker.patch("os.rename")
+    mocker.patch("krux.encryption.open", new=mocker.mock_open(read_data=""))
+    with patch(
+        "krux.atomic_file.open", new=mocker.mock_open(read_data=SEEDS_JSON)
+    ) as m:
         storage = MnemonicStorage()
         storage.del_mnemonic("KEFecbID")
     expected = SEEDS_JSON.replace(KEF_ECBENTROPY_ONLY_JSON[1:-1] + ", ", "")
@@ -390,7 +464,116 @@ def test_delete_from_sd(m5stickv, mocker, mock_file_operations):
         storage.del_mnemonic("KEFgcmID", sd_card=True)
     padding_size = len(KEF_GCMENTROPY_ONLY_JSON)
     expected = SEEDS_JSON.replace(KEF_GCMENTROPY_ONLY_JSON[1:-1] + ", ", "")
-    m().write.assert_called_once_with(expected + " " * padding_size)
+    assert m().write.call_args_list[0] == mocker.call(expected + " " * padding_size)
+
+
+def test_mnemonics_log(m5stickv, mocker, tmp_path):
+    from krux import encryption
+    from krux.encryption import MnemonicStorage, MNEMONICS_LOG_HEADER
+
+    mocker.patch.object(encryption, "FLASH_PATH_STR", str(tmp_path) + "/%s")
+    seeds_file = tmp_path / "seeds.json"
+    log_file = tmp_path / "seeds.log"
+    seeds_file.write_text(SEEDS_JSON)
+
+    # Nothing is read until mnemonics are needed
+    read = mocker.spy(MnemonicStorage, "_read")
+    storage = MnemonicStorage()
+    read.assert_not_called()
+
+    assert storage.store_encrypted_kef("newID", KEF_ENVELOPE_ECB)
+    # seeds.json is left as is, additions are appended to the log
+    assert seeds_file.read_text() == SEEDS_JSON
+    assert log_file.read_text().startswith(MNEMONICS_LOG_HEADER)
+    assert len(log_file.read_text().splitlines()) == 2
+
+    # A partially written record is ignored, and does not swallow the next one
+    with open(log_file, "a") as f:
+        f.write('\n["otherID", "CEtF')
+    storage = MnemonicStorage()
+    assert storage.store_encrypted_kef("laterID", KEF_ENVELOPE_ECB)
+
+    storage = MnemonicStorage()
+    mnemonic_ids = storage.list_mnemonics()
+    assert "newID" in mnemonic_ids
+    assert "laterID" in mnemonic_ids
+    assert "otherID" not in mnemonic_ids
+    assert storage.decrypt(TEST_KEY, "laterID") == ECB_WORDS
+
+    # Deletions fold the log into seeds.json right away
+    storage.del_mnemonic("ecbID")
+    assert not log_file.exists()
+    mnemonic_ids = storage.list_mnemonics()
+    assert "ecbID" not in mnemonic_ids
+    assert sorted(json.loads(seeds_file.read_text())) == sorted(mnemonic_ids)
+    assert MnemonicStorage().list_mnemonics() == mnemonic_ids
+
+
+def test_mnemonics_log_compacts_when_long(m5stickv, mocker, tmp_path):
+    from krux import encryption
+    from krux.encryption import MnemonicStorage, LOG_COMPACT_RECORDS
+
+    mocker.patch.object(encryption, "FLASH_PATH_STR", str(tmp_path) + "/%s")
+    storage = MnemonicStorage()
+    for i in range(LOG_COMPACT_RECORDS - 1):
+        storage.store_encrypted_kef("ID%d" % i, KEF_ENVELOPE_ECB)
+    assert (tmp_path / "seeds.log").exists()
+    assert not (tmp_path / "seeds.json").exists()
+
+    # The tombstone fills the log, which is compacted only once
+    compact = mocker.spy(storage, "compact")
+    storage.del_mnemonic("ID0")
+    compact.assert_called_once()
+    assert not (tmp_path / "seeds.log").exists()
+    stored = json.loads((tmp_path / "seeds.json").read_text())
+    assert sorted(stored) == sorted(
+        "ID%d" % i for i in range(1, LOG_COMPACT_RECORDS - 1)
+    )
+
+    # Log starts over after compaction
+    storage.store_encrypted_kef("ID0", KEF_ENVELOPE_ECB)
+    assert len((tmp_path / "seeds.log").read_text().splitlines()) == 2
+
+
+def test_mnemonics_sd_store_writes_seeds_file(m5stickv, mocker, tmp_path):
+    from krux.encryption import MnemonicStorage, MNEMONICS_LOG_HEADER
+    from krux.sd_card import SDHandler
+
+    mocker.patch.object(SDHandler, "PATH_STR", str(tmp_path) + "/%s")
+    (tmp_path / "seeds.json").write_text(SEEDS_JSON)
+    storage = MnemonicStorage()
+
+    # Readers of seeds.json on SD cards see new mnemonics right away
+    assert storage.store_encrypted_kef("newID", KEF_ENVELOPE_ECB, sd_card=True)
+    assert "newID" in json.loads((tmp_path / "seeds.json").read_text())
+    assert not (tmp_path / "seeds.log").exists()
+
+    # A log left by earlier writes is folded in
+    (tmp_path / "seeds.log").write_text(
+        MNEMONICS_LOG_HEADER + json.dumps(["loggedID", "CEtF"])
+    )
+    storage = MnemonicStorage()
+    assert storage.store_encrypted_kef("laterID", KEF_ENVELOPE_ECB, sd_card=True)
+    stored = json.loads((tmp_path / "seeds.json").read_text())
+    assert "loggedID" in stored and "laterID" in stored
+    assert not (tmp_path / "seeds.log").exists()
+
+
+def test_mnemonics_log_compact_sd(m5stickv, mocker, tmp_path):
+    from krux.encryption import MnemonicStorage
+    from krux.sd_card import SDHandler
+
+    mocker.patch.object(SDHandler, "PATH_STR", str(tmp_path) + "/%s")
+    (tmp_path / "seeds.json").write_text(SEEDS_JSON)
+    storage = MnemonicStorage()
+    storage.del_mnemonic("KEFgcmID", sd_card=True)
+    storage.compact(sd_card=True)
+
+    # seeds.json is padded to its previous length to over-write abandoned bytes
+    contents = (tmp_path / "seeds.json").read_text()
+    assert len(contents) == len(SEEDS_JSON)
+    assert "KEFgcmID" not in json.loads(contents)
+    assert not (tmp_path / "seeds.log").exists()
 
 
 def test_create_ecb_encrypted_qr_code(m5stickv):
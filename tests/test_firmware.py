@@ -34,6 +34,7 @@ def tdata(mocker):
     print(os.path.dirname(__file__))
     with open(TEST_FIRMWARE_FILENAME, "rb") as f:
         TEST_FIRMWARE = f.read()
+    TEST_FIRMWARE_STAT = os.stat(TEST_FIRMWARE_FILENAME)
     with open(TEST_FIRMWARE_FILENAME + ".sha256.txt", "r") as f:
         TEST_FIRMWARE_SHA256 = f.read()
     with open(TEST_FIRMWARE_FILENAME + ".withheader.sha256.txt", "r") as f:
@@ -12362,6 +12363,7 @@ def tdata(mocker):
             "TEST_FIRMWARE_FILENAME",
             "TEST_FIRMWARE_25_03_0",
             "TEST_FIRMWARE",
+            "TEST_FIRMWARE_STAT",
             "TEST_FIRMWARE_SHA256",
             "TEST_FIRMWARE_WITH_HEADER_SHA256",
             "TEST_FIRMWARE_SIG",
@@ -12379,6 +12381,7 @@ def tdata(mocker):
         TEST_FIRMWARE_FILENAME,
         TEST_FIRMWARE_25_03_0,
         TEST_FIRMWARE,
+        TEST_FIRMWARE_STAT,
         TEST_FIRMWARE_SHA256,
         TEST_FIRMWARE_WITH_HEADER_SHA256,
         TEST_FIRMWARE_SIG,
@@ -12458,6 +12461,36 @@ def test_fsize(mocker, m5stickv, tdata):
     assert fsize(tdata.TEST_FIRMWARE_FILENAME) == expected_size
 
 
+def test_inspect_firmware(mocker, m5stickv, tdata):
+    import binascii
+    import board
+    from krux.firmware import inspect_firmware
+
+    board.config["type"] = "m5stickv"
+    info = inspect_firmware(tdata.TEST_FIRMWARE_FILENAME, len(tdata.TEST_FIRMWARE))
+    assert info.size == len(tdata.TEST_FIRMWARE)
+    assert info.sha256 == binascii.unhexlify(tdata.TEST_FIRMWARE_SHA256)
+    assert info.header_sha256 == binascii.unhexlify(
+        tdata.TEST_FIRMWARE_WITH_HEADER_SHA256
+    )
+
+    # Without a size, header hash isn't computed
+    info = inspect_firmware(tdata.TEST_FIRMWARE_FILENAME)
+    assert info.header_sha256 is None
+
+    # Board type and version are found in the same single read pass
+    mocker.patch(
+        "builtins.open",
+        new=get_mock_open({"firmware.bin": tdata.TEST_FIRMWARE_25_03_0}),
+    )
+    board.config["type"] = "amigo"
+    info = inspect_firmware("firmware.bin")
+    assert info.size == len(tdata.TEST_FIRMWARE_25_03_0)
+    assert info.for_this_device
+    assert info.version == "25.03.0"
+    board.config["type"] = "m5stickv"
+
+
 def test_write_data_with_header_and_sha_suffix(mocker, m5stickv, tdata):
     mocker.patch("krux.firmware.flash", new=mocker.MagicMock())
     import hashlib
@@ -12816,6 +12849,80 @@ def test_write_data_with_5_failed_read(mocker, m5stickv, tdata):
     assert num_callbacks == 6
 
 
+def test_write_data_differential(mocker, m5stickv, tdata):
+    import hashlib
+    import io
+    from krux.firmware import write_data, FIRMWARE_SLOT_1
+
+    memory = bytearray(FIRMWARE_SLOT_1 + 16 * 1024)
+    read_sizes = []
+
+    def read(address, size):
+        read_sizes.append(size)
+        return memory[address : address + size]
+
+    def write(address, data):
+        memory[address : address + len(data)] = data
+
+    flash = mocker.patch(
+        "krux.firmware.flash",
+        new=mocker.MagicMock(read=read, write=mocker.MagicMock(side_effect=write)),
+    )
+    mocker.patch("krux.firmware.DIFFERENTIAL_READ_SIZE", 256)
+
+    data = bytearray(tdata.TEST_FIRMWARE_25_03_0[: 10 * 1024])
+    size = len(data)
+    header = b"\x00" + size.to_bytes(4, "little")
+    hash = hashlib.sha256(header + data).digest()
+
+    def write_firmware(data):
+        return write_data(
+            lambda pct: None,
+            FIRMWARE_SLOT_1,
+            io.BytesIO(data),
+            size,
+            1024,
+            header=True,
+            sha_suffix=hash,
+            differential=True,
+        )
+
+    assert write_firmware(data) == (11, 0)
+    assert flash.erase.call_count == 11
+    assert memory[FIRMWARE_SLOT_1 : FIRMWARE_SLOT_1 + 5] == header
+    assert memory[FIRMWARE_SLOT_1 + 5 : FIRMWARE_SLOT_1 + 5 + size] == data
+
+    # Rewriting the same firmware doesn't touch the flash
+    flash.reset_mock()
+    read_sizes.clear()
+    assert write_firmware(data) == (0, 11)
+    flash.erase.assert_not_called()
+    flash.write.assert_not_called()
+    # Sectors are compared a slice at a time, the header on its own
+    assert max(read_sizes) == 256
+    assert read_sizes[:5] == [5, 256, 256, 256, 251]
+    assert sum(read_sizes) == 11 * 1024
+
+    # Only the sector holding a changed byte is rewritten
+    data[3000] ^= 0xFF
+    assert write_firmware(data) == (1, 10)
+    flash.erase.assert_called_once_with(FIRMWARE_SLOT_1 + 2048, 1024)
+
+    # Differential mode is opt-in, by default every sector is written
+    flash.reset_mock()
+    written, skipped = write_data(
+        lambda pct: None,
+        FIRMWARE_SLOT_1,
+        io.BytesIO(data),
+        size,
+        1024,
+        header=True,
+        sha_suffix=hash,
+    )
+    assert (written, skipped) == (11, 0)
+    assert flash.erase.call_count == 11
+
+
 def test_find_all_occurrences(mocker, m5stickv, tdata):
     from krux.firmware import find_all_occurrences
 
@@ -13041,7 +13148,7 @@ def test_upgrade_succeed(mocker, m5stickv, mock_success_input_cls, tdata):
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13079,7 +13186,7 @@ def test_upgrade_succeed(mocker, m5stickv, mock_success_input_cls, tdata):
         binascii.unhexlify(tdata.TEST_FIRMWARE_SHA256),
     )
 
-    krux.firmware.flash.read.assert_called_with(
+    assert krux.firmware.flash.read.call_args_list[0] == mocker.call(
         firmware.MAIN_BOOT_CONFIG_SECTOR_ADDRESS, 4096
     )
 
@@ -13100,6 +13207,7 @@ def test_upgrade_succeed(mocker, m5stickv, mock_success_input_cls, tdata):
                 65536,
                 True,
                 binascii.unhexlify(tdata.TEST_FIRMWARE_WITH_HEADER_SHA256),
+                differential=True,
             ),
             mocker.call(
                 mocker.ANY,
@@ -13117,6 +13225,13 @@ def test_upgrade_succeed(mocker, m5stickv, mock_success_input_cls, tdata):
             ),
         ]
     )
+    # Firmware with its header and hash suffix, every sector differs on flash
+    sectors = -(-(len(tdata.TEST_FIRMWARE) + 5 + 32) // 65536)
+    display_mocker.draw_centered_text.assert_any_call(
+        "Upgrade complete.\nSectors rewritten: %d/%d\n\n"
+        "Remove firmware files from SD Card?" % (sectors, sectors),
+        highlight_prefix="",
+    )
     display_mocker.flash_text.assert_called_with("Shutting down…")
 
 
@@ -13134,7 +13249,7 @@ def test_upgrade_fails_write_data(mocker, m5stickv, mock_success_input_cls, tdat
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
     mocker.patch(
@@ -13184,18 +13299,22 @@ def test_upgrade_uses_backup_sector_when_main_sector_is_missing_active_firmware(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
     mocker.patch("krux.firmware.SIGNER_PUBKEY", tdata.TEST_SIGNER_PUBKEY)
+    boot_sectors = [
+        bytes(tdata.SECTOR_WITH_NO_ACTIVE_FIRMWARE),
+        bytes(tdata.SECTOR_WITH_ACTIVE_FIRMWARE_AT_INDEX_1_SLOT_1),
+    ]
     mocker.patch(
         "krux.firmware.flash.read",
+        # Later reads compare flash sectors before writing them
         new=mocker.MagicMock(
-            side_effect=[
-                bytes(tdata.SECTOR_WITH_NO_ACTIVE_FIRMWARE),
-                bytes(tdata.SECTOR_WITH_ACTIVE_FIRMWARE_AT_INDEX_1_SLOT_1),
-            ]
+            side_effect=lambda address, size: (
+                boot_sectors.pop(0) if boot_sectors else b""
+            )
         ),
     )
     mocker.patch("krux.firmware.ec", new=mocker.MagicMock(wraps=ec))
@@ -13249,6 +13368,7 @@ def test_upgrade_uses_backup_sector_when_main_sector_is_missing_active_firmware(
                 65536,
                 True,
                 binascii.unhexlify(tdata.TEST_FIRMWARE_WITH_HEADER_SHA256),
+                differential=True,
             ),
             mocker.call(
                 mocker.ANY,
@@ -13290,7 +13410,7 @@ def test_upgrade_uses_slot_1_when_firmware_is_in_slot_2(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13328,7 +13448,7 @@ def test_upgrade_uses_slot_1_when_firmware_is_in_slot_2(
         binascii.unhexlify(tdata.TEST_FIRMWARE_SHA256),
     )
 
-    krux.firmware.flash.read.assert_called_with(
+    assert krux.firmware.flash.read.call_args_list[0] == mocker.call(
         firmware.MAIN_BOOT_CONFIG_SECTOR_ADDRESS, 4096
     )
 
@@ -13349,6 +13469,7 @@ def test_upgrade_uses_slot_1_when_firmware_is_in_slot_2(
                 65536,
                 True,
                 binascii.unhexlify(tdata.TEST_FIRMWARE_WITH_HEADER_SHA256),
+                differential=True,
             ),
             mocker.call(
                 mocker.ANY,
@@ -13394,7 +13515,7 @@ def test_upgrade_fails_when_user_declines(mocker, m5stickv, mock_fail_input_cls,
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_fail_input_cls)
@@ -13425,7 +13546,7 @@ def test_upgrade_fails_when_firmware_too_big(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13457,7 +13578,7 @@ def test_upgrade_fails_when_pubkey_is_invalid(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13489,7 +13610,7 @@ def test_upgrade_fails_when_sig_file_missing(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13521,7 +13642,7 @@ def test_upgrade_fails_when_sig_is_invalid(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13553,7 +13674,7 @@ def test_upgrade_fails_when_sig_is_malformed(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13583,7 +13704,7 @@ def test_upgrade_fails_when_sig_is_bad(mocker, m5stickv, mock_success_input_cls,
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13616,7 +13737,7 @@ def test_upgrade_fails_when_both_sectors_missing_active_firmware(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13761,7 +13882,7 @@ def test_upgrade_fail_version_not_newer(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13835,7 +13956,7 @@ def test_upgrade_fail_version_exception(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
@@ -13908,7 +14029,7 @@ def test_upgrade_fail_not_this_device_exception(
     )
     mocker.patch(
         "os.stat",
-        new=mocker.MagicMock(return_value=True),
+        new=mocker.MagicMock(return_value=tdata.TEST_FIRMWARE_STAT),
     )
     display_mocker = mocker.patch("krux.firmware.display", new=mocker.MagicMock())
     mocker.patch("krux.firmware.Input", new=mock_success_input_cls)
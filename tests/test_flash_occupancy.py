@@ -0,0 +1,63 @@
+def test_scan(m5stickv, mocker):
+    import flash
+    from krux import flash_occupancy
+
+    BLOCK_SIZE = 0x1000
+    used_blocks = {0, 3, 9}
+
+    def read(address, size):
+        index = address // BLOCK_SIZE
+        if index == 9:
+            # A used block may only have data at its end
+            block = b"\xff" * (BLOCK_SIZE - 1) + b"\x00"
+        elif index in used_blocks:
+            block = b"\x00" * BLOCK_SIZE
+        else:
+            block = b"\xff" * BLOCK_SIZE
+        return block[:size]
+
+    mocker.patch.object(flash, "read", side_effect=read)
+
+    occupancy = flash_occupancy.scan(16 * BLOCK_SIZE, BLOCK_SIZE)
+    assert [i for i in range(16) if flash_occupancy.is_used(occupancy, i)] == sorted(
+        used_blocks
+    )
+    # Blocks are read whole only when their first bytes look empty
+    assert flash.read.call_count == 16 + 13 + 1
+
+    # Cached map is returned until flash is written
+    flash.read.reset_mock()
+    assert flash_occupancy.scan(16 * BLOCK_SIZE, BLOCK_SIZE) is occupancy
+    flash.read.assert_not_called()
+
+    flash_occupancy.invalidate()
+    flash_occupancy.scan(16 * BLOCK_SIZE, BLOCK_SIZE)
+    assert flash.read.call_count == 16 + 13 + 1
+
+
+def test_settings_save_invalidates_occupancy(m5stickv, mocker):
+    from unittest.mock import mock_open
+    from krux import flash_occupancy
+    from krux.settings import Store
+
+    mocker.patch("builtins.open", mock_open(read_data="{}"))
+    mocker.patch("os.rename")
+    invalidate = mocker.patch.object(flash_occupancy, "invalidate")
+    s = Store()
+    s.file_location = "/flash/"
+    s.settings["foo"] = "bar"
+    s.dirty = True
+    assert s.save_settings()
+    invalidate.assert_called_once()
+
+
+def test_settings_location_to_sd_invalidates_occupancy(m5stickv, mocker):
+    from krux import flash_occupancy
+    from krux.settings import Store, SD_PATH
+
+    remove = mocker.patch("os.remove")
+    invalidate = mocker.patch.object(flash_occupancy, "invalidate")
+    s = Store()
+    s.update_file_location(SD_PATH)
+    remove.assert_called_once_with("/flash/settings.json")
+    invalidate.assert_called_once()
@@ -28,3 +28,42 @@ def test_translations(mocker, m5stickv):
         lang_trans_array = getattr(lang_trans_module, "translation_array")
         locale_control.load_locale(lang)
         assert t("Load Mnemonic") == lang_trans_array[reference_index]
+
+
+def test_translation_lookup(mocker, m5stickv):
+    import binascii
+    from krux.krux_settings import t, locale_control
+    from krux.translations import ref_array
+    from krux.translations.pt import translation_array
+
+    locale_control.load_locale("pt_BR")
+    slugs = ["Load Mnemonic", "Settings", "Back", "Yes", "No", "New Text"]
+
+    def linear_t(slug):
+        # Lookup used before the CRC table
+        slug_id = binascii.crc32(slug.encode("utf-8"))
+        try:
+            return translation_array[ref_array.index(slug_id)]
+        except ValueError:
+            return slug
+
+    expected = [linear_t(slug) for slug in slugs]
+    # Translations are found through the CRC table, without scanning ref_array
+    reference = mocker.patch.object(locale_control, "reference")
+    assert [t(slug) for slug in slugs] == expected
+    reference.index.assert_not_called()
+
+
+def test_translation_lookup_shared_by_locales(mocker, m5stickv):
+    from krux.krux_settings import t, locale_control
+
+    locale_control.load_locale("pt_BR")
+    lookup = locale_control.lookup
+    assert t("Load Mnemonic") == "Carregar Mnemônico"
+
+    locale_control.load_locale("es_MX")
+    assert locale_control.lookup is lookup
+    assert t("Load Mnemonic") != "Carregar Mnemônico"
+
+    locale_control.load_locale("en-US")
+    assert t("Load Mnemonic") == "Load Mnemonic"
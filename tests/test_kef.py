@@ -157,6 +157,46 @@ def test_Cipher_initialization(m5stickv):
                 kef.Cipher(valid_key, valid_salt, invalid)
 
 
+def test_Cipher_key_cache(m5stickv, mocker):
+    from krux import kef
+
+    pbkdf2 = mocker.patch.object(
+        kef.uhashlib_hw,
+        "pbkdf2_hmac_sha256",
+        wraps=kef.uhashlib_hw.pbkdf2_hmac_sha256,
+    )
+    plain = b"cache me if you can"
+
+    # disabled by default: every Cipher stretches its key
+    kef.Cipher(b"key", b"salt", 10000)
+    kef.Cipher(b"key", b"salt", 10000)
+    assert pbkdf2.call_count == 2
+
+    kef.key_cache.enable()
+    try:
+        encrypted = kef.Cipher(b"key", b"salt", 10000).encrypt(plain, 20, b"\x01" * 12)
+        assert kef.Cipher("key", "salt", 10000).decrypt(encrypted, 20) == plain
+        assert pbkdf2.call_count == 3
+
+        # any other key, salt or iterations is stretched again
+        kef.Cipher(b"key", b"salt", 20000)
+        kef.Cipher(b"key", b"pepper", 10000)
+        kef.Cipher(b"yek", b"salt", 10000)
+        assert pbkdf2.call_count == 6
+
+        # the cache is indexed without the key, and cleared by zeroizing
+        cached = list(kef.key_cache.keys.values())
+        assert b"key" not in b"".join(kef.key_cache.keys.keys())
+        kef.key_cache.clear()
+        assert all(not any(stretched) for stretched in cached)
+        assert kef.key_cache.keys == {}
+        kef.Cipher(b"key", b"salt", 10000)
+        assert pbkdf2.call_count == 7
+    finally:
+        kef.key_cache.clear(disable=True)
+    assert not kef.key_cache.enabled
+
+
 def test_Cipher_calling_method_encrypt(m5stickv):
     from krux import kef
 
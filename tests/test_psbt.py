@@ -1031,6 +1031,194 @@ def test_sign_singlesig_from_sdcard(mocker, m5stickv, tdata):
         num += 1
 
 
+def test_sign_to_file_streams_singlesig_from_sdcard(mocker, m5stickv, tdata):
+    import io
+    from embit.networks import NETWORKS
+    from embit.psbt import PSBT
+    from krux.psbt import PSBTSigner
+    from krux.key import Key, TYPE_SINGLESIG
+    from krux.wallet import Wallet
+    from krux.qr import FORMAT_NONE
+
+    wallet = Wallet(Key(tdata.TEST_MNEMONIC, TYPE_SINGLESIG, NETWORKS["test"]))
+    cases = [
+        (tdata.P2PKH_PSBT, tdata.SIGNED_P2PKH_PSBT_SD),
+        (tdata.P2WPKH_PSBT, tdata.SIGNED_P2WPKH_PSBT_SD),
+        (tdata.P2SH_P2WPKH_PSBT, tdata.SIGNED_P2SH_P2WPKH_PSBT_SD),
+        (tdata.P2TR_PSBT, tdata.SIGNED_P2TR_PSBT_SD),
+    ]
+    mocker.patch("krux.psbt.STREAM_SIGN_MIN_SIZE", 1)
+    mocker.patch("krux.psbt.os").stat.return_value = (0,) * 6 + (1,)
+    read_from = mocker.spy(PSBT, "read_from")
+
+    for psbt, signed_psbt in cases:
+        written = io.BytesIO()
+        written.close = lambda: None
+
+        def _open(path, mode="r"):
+            if "w" in mode:
+                return written
+            return io.BytesIO(psbt)
+
+        loaded_signer = PSBTSigner(wallet, psbt, FORMAT_NONE)
+        read_from.reset_mock()
+        mocker.patch("builtins.open", _open)
+        signer = PSBTSigner(wallet, None, FORMAT_NONE, "dummy.psbt")
+        assert signer.can_stream_sign()
+
+        # Review matches the in-memory PSBT without loading it
+        assert signer.policy == loaded_signer.policy
+        assert signer.outputs() == loaded_signer.outputs()
+        assert signer.path_mismatch() == loaded_signer.path_mismatch()
+        assert signer.fill_zero_fingerprint() == 0
+
+        # Output is byte-identical to signing the loaded PSBT
+        signer.sign_to_file("/sd/dummy-signed.psbt")
+        assert written.getvalue() == signed_psbt
+        assert signer.psbt is None
+        read_from.assert_not_called()
+
+
+def _assert_sign_to_file_streams(mocker, wallet, cases):
+    import io
+    from embit.psbt import PSBT
+    from krux.psbt import PSBTSigner
+    from krux.qr import FORMAT_NONE
+
+    mocker.patch("krux.psbt.STREAM_SIGN_MIN_SIZE", 1)
+    mocker.patch("krux.psbt.os").stat.return_value = (0,) * 6 + (1,)
+    read_from = mocker.spy(PSBT, "read_from")
+
+    for psbt, signed_psbt in cases:
+        written = io.BytesIO()
+        written.close = lambda: None
+
+        def _open(path, mode="r"):
+            if "w" in mode:
+                return written
+            return io.BytesIO(psbt)
+
+        read_from.reset_mock()
+        mocker.patch("builtins.open", _open)
+        signer = PSBTSigner(wallet, None, FORMAT_NONE, "dummy.psbt")
+        assert signer.can_stream_sign()
+        signer.sign_to_file("/sd/dummy-signed.psbt")
+        assert written.getvalue() == signed_psbt
+        read_from.assert_not_called()
+
+
+def test_sign_to_file_streams_multisig_from_sdcard(mocker, m5stickv, tdata):
+    from embit.networks import NETWORKS
+    from krux.key import Key, TYPE_MULTISIG
+    from krux.wallet import Wallet
+
+    wallet = Wallet(Key(tdata.TEST_MNEMONIC, TYPE_MULTISIG, NETWORKS["test"]))
+    _assert_sign_to_file_streams(
+        mocker,
+        wallet,
+        [
+            (tdata.P2WSH_PSBT, tdata.SIGNED_P2WSH_PSBT_SD),
+            (tdata.P2SH_P2WSH_PSBT, tdata.SIGNED_P2SH_P2WSH_PSBT_SD),
+        ],
+    )
+
+
+def test_sign_to_file_streams_taproot_key_path_from_sdcard(mocker, m5stickv, tdata):
+    from embit.networks import NETWORKS
+    from krux.psbt import StreamSigningView
+    from krux.key import Key, TYPE_SINGLESIG, TYPE_MINISCRIPT, P2TR
+    from krux.wallet import Wallet
+
+    sign_with_tapkey = mocker.spy(StreamSigningView, "sign_input_with_tapkey")
+    cases = [
+        (
+            Wallet(Key(tdata.TEST_MNEMONIC, TYPE_SINGLESIG, NETWORKS["test"])),
+            tdata.P2TR_PSBT,
+            tdata.SIGNED_P2TR_PSBT_SD,
+        ),
+        (
+            # Internal key of a miniscript taproot wallet
+            Wallet(
+                Key(
+                    tdata.TEST_MNEMONIC,
+                    TYPE_MINISCRIPT,
+                    NETWORKS["test"],
+                    script_type=P2TR,
+                )
+            ),
+            tdata.MINIS_TR_PSBT,
+            tdata.IN_KEY_SIGNED_MINIS_TR_PSBT_SD,
+        ),
+    ]
+
+    for wallet, psbt, signed_psbt in cases:
+        sign_with_tapkey.reset_mock()
+        _assert_sign_to_file_streams(mocker, wallet, [(psbt, signed_psbt)])
+        sign_with_tapkey.assert_called()
+
+
+def test_sign_to_file_fails_without_signatures(mocker, m5stickv, tdata):
+    import io
+    from embit.networks import NETWORKS
+    from krux.psbt import PSBTSigner
+    from krux.key import Key, TYPE_SINGLESIG
+    from krux.wallet import Wallet
+    from krux.qr import FORMAT_NONE
+
+    wallet = Wallet(Key(tdata.TEST_MNEMONIC_BIP85_I0, TYPE_SINGLESIG, NETWORKS["test"]))
+    mocker.patch("krux.psbt.STREAM_SIGN_MIN_SIZE", 1)
+    psbt_os = mocker.patch("krux.psbt.os")
+    psbt_os.stat.return_value = (0,) * 6 + (1,)
+    written = io.BytesIO()
+    written.close = lambda: None
+    mocker.patch(
+        "builtins.open",
+        lambda path, mode="r": (
+            written if "w" in mode else io.BytesIO(tdata.P2WPKH_PSBT)
+        ),
+    )
+    signer = PSBTSigner(wallet, None, FORMAT_NONE, "dummy.psbt")
+
+    with pytest.raises(ValueError, match="cannot sign"):
+        signer.sign_to_file("/sd/dummy-signed.psbt")
+    psbt_os.remove.assert_called_once_with("/sd/dummy-signed.psbt")
+
+
+def test_sign_streamed_psbt_retries_compressed_on_memory_error(mocker, m5stickv, tdata):
+    import io
+    from embit.networks import NETWORKS
+    from embit.psbt import PSBT, CompressMode
+    from krux.psbt import PSBTSigner
+    from krux.key import Key, TYPE_SINGLESIG
+    from krux.wallet import Wallet
+    from krux.qr import FORMAT_NONE
+
+    wallet = Wallet(Key(tdata.TEST_MNEMONIC, TYPE_SINGLESIG, NETWORKS["test"]))
+    mocker.patch("builtins.open", lambda path, mode="r": io.BytesIO(tdata.P2WPKH_PSBT))
+    loaded_signer = PSBTSigner(wallet, None, FORMAT_NONE, "dummy.psbt")
+    loaded_signer.sign()
+
+    mocker.patch("krux.psbt.STREAM_SIGN_MIN_SIZE", 1)
+    mocker.patch("krux.psbt.os").stat.return_value = (0,) * 6 + (1,)
+    signer = PSBTSigner(wallet, None, FORMAT_NONE, "dummy.psbt")
+    assert signer.can_stream_sign()
+
+    # Signing to a QR code loads the whole PSBT, compressed if it does not fit
+    read_from = PSBT.read_from
+    calls = []
+
+    def _read_from(stream, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise MemoryError
+        return read_from(stream, **kwargs)
+
+    mocker.patch.object(PSBT, "read_from", _read_from)
+    signer.sign()
+    assert calls == [{}, {"compress": CompressMode.CLEAR_ALL}]
+    assert signer.psbt_qr() == loaded_signer.psbt_qr()
+
+
 def test_sign_multisig(mocker, m5stickv, tdata):
     from embit.networks import NETWORKS
     from krux.psbt import PSBTSigner
@@ -1982,6 +2170,42 @@ def test_xpubs_fails_with_no_xpubs(mocker, m5stickv, tdata):
         signer.xpubs()
 
 
+def test_psbt_analysis_is_memoized(mocker, m5stickv, tdata):
+    from embit.networks import NETWORKS
+    from krux.psbt import PSBTSigner
+    from krux.key import Key, TYPE_MULTISIG, P2TR
+    from krux.wallet import Wallet
+    from krux.qr import FORMAT_NONE
+    from embit.psbt import PSBT
+
+    wallet = Wallet(Key(tdata.TEST_MNEMONIC, TYPE_MULTISIG, NETWORKS["test"]))
+    xpubs_spy = mocker.spy(PSBTSigner, "xpubs")
+    get_policy_spy = mocker.spy(PSBTSigner, "get_policy_from_psbt_input")
+    signer = PSBTSigner(wallet, tdata.P2WSH_PSBT, FORMAT_NONE)
+
+    signer.path_mismatch()
+    signer.psbt_policy_string()
+    first_outputs = signer.outputs()
+    signer.validate()
+    assert signer.outputs() == first_outputs
+    assert xpubs_spy.call_count == 1
+    assert get_policy_spy.call_count == len(signer.psbt.inputs)
+
+    # Derivations are cached per policy type
+    policy = signer.policy
+    derivations = signer.input_derivations()
+    assert all(derivations)
+    signer.policy = {"type": P2TR}
+    assert signer.input_derivations() == [[] for _ in signer.psbt.inputs]
+    signer.policy = policy
+    assert signer.input_derivations() is derivations
+
+    # Replacing the PSBT drops the cached analysis
+    signer.psbt = PSBT.parse(tdata.P2WSH_PSBT)
+    signer.validate()
+    assert xpubs_spy.call_count == 2
+
+
 def test_sign_single_1_input_1_output_no_change(m5stickv):
     from embit.networks import NETWORKS
     from krux.psbt import PSBTSigner
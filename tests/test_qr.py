@@ -156,6 +156,48 @@ def test_parser(mocker, m5stickv, tdata):
             assert res == tdata.TEST_DATA_B58
 
 
+def test_parser_accepts(mocker, m5stickv, tdata):
+    from krux.qr import QRPartParser
+
+    parser = QRPartParser()
+    assert parser.accepts("anything")
+    assert parser.accepts(tdata.TEST_PARTS_FORMAT_PMOFN[0])
+
+    parser.parse(tdata.TEST_PARTS_FORMAT_PMOFN[0])
+    assert parser.accepts(tdata.TEST_PARTS_FORMAT_PMOFN[1])
+    assert not parser.accepts("anything")
+    assert not parser.accepts(tdata.TEST_PARTS_FORMAT_MULTIPART_BBQR[0])
+
+    parser = QRPartParser()
+    parser.parse(tdata.TEST_PARTS_FORMAT_MULTIPART_BBQR[0])
+    assert parser.accepts(tdata.TEST_PARTS_FORMAT_MULTIPART_BBQR[1])
+    # Same format, other encoding or file type
+    assert not parser.accepts(
+        tdata.TEST_PARTS_FORMAT_SINGLEPART_BBQR[0][:2]
+        + "2"
+        + tdata.TEST_PARTS_FORMAT_SINGLEPART_BBQR[0][3:]
+    )
+    assert not parser.accepts("B$ZT0100" + "A" * 16)
+    assert not parser.accepts(tdata.TEST_PARTS_FORMAT_PMOFN[0])
+
+
+def test_parser_is_duplicate(mocker, m5stickv):
+    from krux.qr import QRPartParser, RECENT_PAYLOADS_SIZE
+
+    parser = QRPartParser()
+    assert not parser.is_duplicate("p1of2 a")
+    assert parser.is_duplicate("p1of2 a")
+    assert not parser.is_duplicate("p2of2 b")
+    assert (parser.unique_count, parser.duplicate_count) == (2, 1)
+
+    # Only recent payloads are remembered
+    for i in range(RECENT_PAYLOADS_SIZE - 1):
+        assert not parser.is_duplicate(str(i))
+    assert len(parser.recent_payloads) == RECENT_PAYLOADS_SIZE
+    assert not parser.is_duplicate("p1of2 a")
+    assert parser.is_duplicate("p1of2 a")
+
+
 def test_to_qr_codes(mocker, m5stickv, tdata):
     from krux.qr import to_qr_codes, FORMAT_NONE, FORMAT_PMOFN, FORMAT_UR, FORMAT_BBQR
     from krux.display import Display
@@ -204,6 +246,52 @@ def test_to_qr_codes(mocker, m5stickv, tdata):
         assert len(codes) == expected_parts
 
 
+def test_qr_frames_cache(mocker, m5stickv, tdata):
+    from krux import qr
+    from krux.qr import QRFrames, to_qr_codes, FORMAT_NONE, FORMAT_PMOFN, FORMAT_UR
+
+    # PMofN of TEST_DATA_B58 for a 135 pixels wide display has 9 parts
+    qr_data_width = 33
+    encode_spy = mocker.patch.object(qr.qrcode, "encode", wraps=qr.qrcode.encode)
+    code_generator = to_qr_codes(tdata.TEST_DATA_B58, qr_data_width, FORMAT_PMOFN)
+    expected = [next(code_generator) for _ in range(9)]
+    assert expected[0][1] == 9
+    encode_spy.reset_mock()
+
+    # Each part is encoded once, following cycles are served from cache
+    frames = QRFrames(tdata.TEST_DATA_B58, qr_data_width, FORMAT_PMOFN)
+    assert [next(frames) for _ in range(27)] == expected * 3
+    assert frames.encoded == encode_spy.call_count == 9
+
+    # Over budget, parts are encoded on every cycle
+    encode_spy.reset_mock()
+    frames = QRFrames(tdata.TEST_DATA_B58, qr_data_width, FORMAT_PMOFN, budget=100)
+    assert [next(frames) for _ in range(27)] == expected * 3
+    assert frames.frames is None
+    assert frames.encoded == encode_spy.call_count == 27
+
+    # Single QR codes are encoded once too
+    encode_spy.reset_mock()
+    frames = QRFrames(tdata.TEST_DATA_B58, qr_data_width, FORMAT_NONE)
+    for _ in range(3):
+        assert next(frames)[1] == 1
+    assert encode_spy.call_count == 1
+
+    # Fountain encoded UR parts are never cached
+    frames = QRFrames(tdata.TEST_DATA_UR, qr_data_width, FORMAT_UR)
+    for _ in range(30):
+        next(frames)
+    assert frames.frames is None
+    assert frames.encoded == 30
+
+    # After the first cycle, cached frames are served without encoding
+    for budget, encoded in ((0, 9 * 6), (qr.QR_FRAMES_CACHE_BUDGET, 9)):
+        encode_spy.reset_mock()
+        frames = QRFrames(tdata.TEST_DATA_B58, qr_data_width, FORMAT_PMOFN, budget)
+        assert [next(frames) for _ in range(9 * 6)] == expected * 6
+        assert frames.encoded == encode_spy.call_count == encoded
+
+
 def test_detect_plaintext_qr(mocker, m5stickv):
     from krux.qr import detect_format
 
@@ -9,6 +9,7 @@ def mocker_sd_card_ok(mocker):
     )
     mocker.patch("builtins.open", mocker.mock_open(read_data=""))
     mocker.patch("os.remove", mocker.mock_open(read_data=""))
+    mocker.patch("os.rename")
 
 
 @pytest.fixture
@@ -71,3 +72,37 @@ def test_sd_card_dir_not_exists(m5stickv, mocker_sd_card_dir_not_exist):
     from krux.sd_card import SDHandler
 
     assert not SDHandler.dir_exists("adir")
+
+
+def test_sd_card_list_dir(m5stickv, mocker):
+    import os
+    from krux.sd_card import SDHandler
+
+    # name, type, inode as yielded by MicroPython's ilistdir
+    entries = [
+        ("b.psbt", 0x8000, 0),
+        ("Zdir", 0x4000, 0),
+        ("A.psbt", 0x8000, 0),
+        ("adir", 0x4000, 0),
+    ]
+    ilistdir = mocker.patch.object(
+        os, "ilistdir", create=True, side_effect=lambda path: iter(entries)
+    )
+    stat = mocker.patch("os.stat")
+    assert SDHandler.list_dir("/sd") == (["adir", "Zdir"], ["A.psbt", "b.psbt"])
+    ilistdir.assert_called_once_with("/sd")
+    stat.assert_not_called()
+
+
+def test_sd_card_writes_counter(m5stickv, mocker_sd_card_ok):
+    from krux.sd_card import SDHandler
+
+    writes = SDHandler.writes
+    with SDHandler() as sd:
+        sd.read("afile")
+        assert SDHandler.writes == writes
+        sd.write("afile", "")
+        sd.write_binary("afile", b"")
+        sd.append("afile", "")
+        sd.delete("afile")
+    assert SDHandler.writes == writes + 4
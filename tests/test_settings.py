@@ -223,6 +223,63 @@ def test_store_get():
         assert s.get(case[0], case[1], case[3]) == case[2]
 
 
+def test_store_get_cached_namespaces():
+    from krux.settings import Store
+
+    s = Store()
+
+    # Missing namespaces are remembered without being built out
+    assert s.get("ns1.ns2", "setting", "default") == "default"
+    assert s.namespaces == {"ns1.ns2": None}
+    assert s.settings == {}
+
+    # Adding a namespace drops the cached lookups
+    s.set("ns1.ns2", "setting", "value")
+    assert s.get("ns1.ns2", "setting", "default") == "value"
+    s.set("ns1.ns2", "setting", "new_value")
+    assert s.get("ns1.ns2", "setting", "default") == "new_value"
+
+    # As does removing it
+    s.delete("ns1.ns2", "setting")
+    assert s.get("ns1.ns2", "setting", "default") == "default"
+
+    # Replacing the whole settings tree, as when loading from file
+    s.settings = {"ns1": {"ns2": {"setting": "loaded_value"}}}
+    assert s.get("ns1.ns2", "setting", "default") == "loaded_value"
+
+
+def test_store_get_matches_copied_read():
+    import json
+    from krux.settings import Store
+
+    s = Store()
+    s.set("settings.i18n", "locale", "pt-BR")
+    s.set("settings.printer.thermal.adafruit", "baudrate", 19200)
+    s.set("settings.printer.thermal.adafruit", "line_delay", 20)
+    s.set("settings.appearance", "theme", "Dark")
+    reads = [
+        ("settings.i18n", "locale"),
+        ("settings.printer.thermal.adafruit", "line_delay"),
+        ("settings.appearance", "theme"),
+        ("settings.hardware.buttons", "debounce"),
+    ]
+
+    def copy_get(namespace, setting_name, default_value):
+        # Read used before the namespace cache
+        d = json.loads(json.dumps(s.settings))
+        for level in namespace.split("."):
+            d[level] = d.get(level, {})
+            d = d[level]
+        if setting_name not in d:
+            return default_value
+        return d[setting_name]
+
+    before = [copy_get(ns, name, None) for ns, name in reads]
+    assert [s.get(ns, name, None) for ns, name in reads] == before
+    # Repeated reads are served from the cache and stay the same
+    assert [s.get(ns, name, None) for ns, name in reads] == before
+
+
 def test_store_set():
     from krux.settings import Store
 
@@ -315,16 +372,20 @@ def test_store_update_file_location(mocker):
 def test_store_save_settings(mocker):
     mo = mocker.mock_open()
     mocker.patch("builtins.open", mo)
+    mr = mocker.patch("os.rename")
     from krux.settings import Store, SETTINGS_FILENAME
+    from krux.atomic_file import TEMP_SUFFIX
 
     s = Store()
     filename = s.file_location + SETTINGS_FILENAME
 
     # new setting change: is dirty, save_settings() persists, file written
+    # to a temporary file then renamed over the settings file
     s.set("name.space", "setting", "custom_value")
     assert s.dirty == True
     assert s.save_settings() == True
-    mo.assert_called_with(filename, "w")
+    mo.assert_called_with(filename + TEMP_SUFFIX, "w")
+    mr.assert_called_once_with(filename + TEMP_SUFFIX, filename)
 
     # no setting change: not dirty, save_settings() doesn't persist, file not even read
     mo.reset_mock()
@@ -988,6 +988,81 @@ def test_receive_addresses(mocker, m5stickv, tdata):
         n += 1
 
 
+def test_obtain_addresses_cached_derivation(mocker, m5stickv, tdata):
+    from krux.wallet import Wallet, ADDRESS_CACHE_SIZE
+    from krux.qr import FORMAT_NONE
+    from embit.networks import NETWORKS
+
+    descriptors = [
+        tdata.KRUX_TAPROOT1_DESCRIPTOR,
+        tdata.SPECTER_SINGLESIG_WALLET_DATA,
+        tdata.SPECTER_MULTISIG_WALLET_DATA,
+        tdata.LIANA_MINISCRIPT_DESCRIPTOR,
+        tdata.LIANA_TAPROOT_MINISCRIPT_DESCRIPTOR,
+        tdata.LIANA_TAP_EXPANDING_MINISCRIPT_DESCRIPTOR,
+        tdata.BLUEWALLET_SINGLESIG_WALLET_DATA,
+    ]
+    for descriptor in descriptors:
+        wallet = Wallet(None)
+        wallet.load(descriptor, FORMAT_NONE)
+        for branch_index in range(wallet.descriptor.num_branches):
+            expected = [
+                wallet.descriptor.derive(i, branch_index=branch_index).address(
+                    network=NETWORKS["main"]
+                )
+                for i in range(ADDRESS_CACHE_SIZE + 5)
+            ]
+            assert (
+                list(
+                    wallet.obtain_addresses(
+                        0, limit=len(expected), branch_index=branch_index
+                    )
+                )
+                == expected
+            )
+            # second pass is served from the branch node and LRU caches
+            assert list(
+                wallet.obtain_addresses(3, limit=4, branch_index=branch_index)
+            ) == (expected[3:7])
+
+    # Loading another descriptor invalidates cached nodes
+    wallet = Wallet(None)
+    wallet.load(tdata.SPECTER_SINGLESIG_WALLET_DATA, FORMAT_NONE)
+    first = list(wallet.obtain_addresses(0, limit=2))
+    wallet.load(tdata.KRUX_TAPROOT1_DESCRIPTOR, FORMAT_NONE)
+    assert list(wallet.obtain_addresses(0, limit=2)) != first
+    assert list(wallet.obtain_addresses(0, limit=2)) == [
+        wallet.descriptor.derive(i).address(network=NETWORKS["main"]) for i in range(2)
+    ]
+
+
+def test_find_script_pubkey(mocker, m5stickv, tdata):
+    from krux.wallet import Wallet
+    from krux.qr import FORMAT_NONE
+
+    wallet = Wallet(None)
+    with pytest.raises(ValueError):
+        wallet.find_script_pubkey(b"")
+
+    wallet.load(tdata.LIANA_MINISCRIPT_DESCRIPTOR, FORMAT_NONE)
+    receive = wallet.descriptor.derive(7, branch_index=0).script_pubkey().data
+    change = wallet.descriptor.derive(4, branch_index=1).script_pubkey().data
+
+    assert wallet.find_script_pubkey(receive, 0, limit=5) is None
+    assert wallet.find_script_pubkey(receive, 5, limit=5) == (0, 7)
+    assert wallet.find_script_pubkey(change, 0, limit=10, branch_index=1) == (1, 4)
+
+    # Already derived scriptPubKeys are answered from the session index
+    spy = mocker.spy(wallet, "_branch_descriptor")
+    assert wallet.find_script_pubkey(receive, 0, limit=1) == (0, 7)
+    assert wallet.find_script_pubkey(change, 0, limit=1) == (1, 4)
+    spy.assert_not_called()
+
+    # Loading a descriptor resets the index
+    wallet.load(tdata.LIANA_TAPROOT_MINISCRIPT_DESCRIPTOR, FORMAT_NONE)
+    assert wallet.find_script_pubkey(receive, 0, limit=10) is None
+
+
 def test_load_multisig(mocker, m5stickv, tdata):
     from krux.wallet import Wallet
     from krux.qr import FORMAT_NONE, FORMAT_PMOFN, FORMAT_UR